@@ -0,0 +1,120 @@
+#! /bin/env python3
+"""
+Microbenchmark of the tracker list decoder.
+
+Compares the table driven decoder used by parse_psn_packet with the previous
+decoder, which scanned the chunk enums and re-parsed the struct format string
+for every chunk, and with the fixed-layout fast path taken for trackers in the
+canonical 104 bytes encoding.
+
+Usage: python parse_trackers.py <number of trackers>
+"""
+
+import sys
+import timeit
+from struct import unpack
+
+import pypsn
+
+
+def enum_scan_tracker_list(buffer, offset, end):
+    """
+        Previous tracker list decoder, kept here as the reference.
+
+    Args:
+        buffer (memoryview): PSN data
+        offset (int): start of the tracker list data
+        end (int): end of the tracker list data
+
+    Returns:
+        trackers data
+    """
+    trackers = []
+    while offset + 4 <= end:
+        tracker_id, chunk_offset, offset = pypsn.parse_chunk_from(buffer, offset, end)
+        tracker = pypsn.PsnTracker(tracker_id)
+        while chunk_offset + 4 <= offset:
+            chunk_id, start, chunk_offset = pypsn.parse_chunk_from(
+                buffer, chunk_offset, offset
+            )
+            if chunk_id in iter(pypsn.PsnTrackerChunk):
+                vector = pypsn.PsnVector3(*unpack("<fff", buffer[start:chunk_offset]))
+                if chunk_id == pypsn.PsnTrackerChunk.PSN_DATA_TRACKER_POS:
+                    tracker.pos = vector
+                elif chunk_id == pypsn.PsnTrackerChunk.PSN_DATA_TRACKER_ORI:
+                    tracker.ori = vector
+                elif chunk_id == pypsn.PsnTrackerChunk.PSN_DATA_TRACKER_ACCEL:
+                    tracker.accel = vector
+                elif chunk_id == pypsn.PsnTrackerChunk.PSN_DATA_TRACKER_SPEED:
+                    tracker.speed = vector
+                elif chunk_id == pypsn.PsnTrackerChunk.PSN_DATA_TRACKER_TRGTPOS:
+                    tracker.trgtpos = vector
+            elif chunk_id == pypsn.PsnTrackerChunkInfo.PSN_DATA_TRACKER_STATUS:
+                tracker.status = unpack("<f", buffer[start:chunk_offset])[0]
+            elif chunk_id == pypsn.PsnTrackerChunkInfo.PSN_DATA_TRACKER_TIMESTAMP:
+                tracker.timestamp = unpack("<Q", buffer[start : start + 8])[0]
+        trackers.append(tracker)
+    return trackers
+
+
+def make_packet(tracker_num):
+    """
+        Build a data packet with all tracker fields set.
+
+    Args:
+        tracker_num (int): number of trackers
+
+    Returns:
+        psn data packet: as bytes
+    """
+    info = pypsn.PsnInfo(1312, 2, 0, 1, 1)
+    trackers = [
+        pypsn.PsnTracker(
+            tracker_id=i,
+            pos=pypsn.PsnVector3(1.0, 2.0, 3.0),
+            speed=pypsn.PsnVector3(1.0, 2.0, 3.0),
+            ori=pypsn.PsnVector3(1.0, 2.0, 3.0),
+            accel=pypsn.PsnVector3(1.0, 2.0, 3.0),
+            trgtpos=pypsn.PsnVector3(1.0, 2.0, 3.0),
+            status=0.5,
+            timestamp=1312,
+        )
+        for i in range(tracker_num)
+    ]
+    return pypsn.prepare_psn_data_packet_bytes(pypsn.PsnDataPacket(info, trackers))
+
+
+def main():
+    """
+    Run the benchmark.
+    """
+    tracker_num = int(sys.argv[1]) if len(sys.argv) > 1 else 30
+    canonical = make_packet(tracker_num)
+    # clearing the has-subchunks bit of the pos length keeps the data valid
+    # but no longer matches the canonical layout, forcing the chunk walker
+    generic = bytearray(canonical)
+    for tracker in range(tracker_num):
+        generic[24 + 104 * tracker + 7] &= 0x7F
+    # data packet header (4) + packet header chunk (16) + tracker list header (4)
+    start, end = 24, len(canonical)
+    number = 2000
+
+    def measure(function, buffer):
+        view = memoryview(buffer)
+        return min(
+            timeit.repeat(lambda: function(view, start, end), number=number, repeat=5)
+        )
+
+    reference = measure(enum_scan_tracker_list, canonical)
+    table = measure(pypsn.parse_data_tracker_list_from, generic)
+    fixed = measure(pypsn.parse_data_tracker_list_from, canonical)
+    per_tracker = 1e9 / (number * tracker_num)
+    print(f"trackers per packet: {tracker_num}")
+    print(f"enum scan decoder:   {reference * per_tracker:8.1f} ns/tracker")
+    print(f"table decoder:       {table * per_tracker:8.1f} ns/tracker")
+    print(f"fixed layout:        {fixed * per_tracker:8.1f} ns/tracker")
+    print(f"speedup:             {reference / table:8.2f}x / {reference / fixed:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -31,7 +31,8 @@ def start_psn():
     """
     Start PSN receiver thread.
     """
-    pypsn.Receiver(fill_dmx, "192.168.20.177").start()
+    # only the first tracker is used, let the others stay undecoded
+    pypsn.Receiver(fill_dmx, "192.168.20.177", lazy=True).start()
 
 
 def fill_dmx(psn_data):
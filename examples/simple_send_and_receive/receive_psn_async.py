@@ -0,0 +1,32 @@
+#! /bin/env python3
+"""
+Usage: python receive_psn_async.py 192.168.1.11 <--- change IP address
+"""
+
+import asyncio
+import sys
+import pypsn
+
+
+async def main(ip_addr):
+    """
+        Print received PSN packets, in the event loop.
+
+    Args:
+        ip_addr (str): iface ip
+    """
+    async with pypsn.AsyncReceiver(ip_addr) as receiver:
+        async for psn_data in receiver:
+            if isinstance(psn_data, pypsn.PsnInfoPacket):
+                print("--- Recieved PSN infos ---")
+                print("system name: " + str(psn_data.name))
+                for tracker in psn_data.trackers:
+                    print(str(tracker.tracker_id) + ": " + str(tracker.tracker_name))
+            else:
+                print("--- Recieved PSN data ---")
+                print("frame_id: " + str(psn_data.info.frame_id))
+                for tracker in psn_data.trackers:
+                    print(str(tracker.tracker_id) + ": " + str(tracker.pos))
+
+
+asyncio.run(main(sys.argv[1]))
@@ -146,6 +146,10 @@ for tracker in psn_data.trackers:
 
 print("\n--- Sendin PSN data in loop ---")
 counter = 0.0
+# only re-packs the header and the trackers which changed since the last frame
+data_encoder = pypsn.PsnDataEncoder()
+# the socket is opened once for the whole loop
+sender = pypsn.PsnSender(mcast_ip=mcast_ip, ip_addr=ip_addr, port=56565)
 
 while True:
     time.sleep(1 / 60)
@@ -159,12 +163,7 @@ while True:
         psn_info.info.timestamp = elapsed_time_us
         psn_info_packet_bytes = pypsn.prepare_psn_info_packet_bytes(psn_info)
 
-        pypsn.send_psn_packet(
-            psn_packet=psn_info_packet_bytes,
-            mcast_ip=mcast_ip,
-            ip_addr=ip_addr,
-            port=56565,
-        )
+        sender.send(psn_info_packet_bytes)
 
     psn_data.info.timestamp = elapsed_time_us
 
@@ -181,11 +180,6 @@ while True:
         tracker.accel.x = counter
         tracker.trgtpos.x = counter
 
-    psn_data_packet_bytes = pypsn.prepare_psn_data_packet_bytes(psn_data)
+    psn_data_packet_bytes = data_encoder.encode(psn_data)
 
-    pypsn.send_psn_packet(
-        psn_packet=psn_data_packet_bytes,
-        mcast_ip=mcast_ip,
-        ip_addr=ip_addr,
-        port=56565,
-    )
+    sender.send(psn_data_packet_bytes)
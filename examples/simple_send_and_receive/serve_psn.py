@@ -0,0 +1,89 @@
+#! /bin/env python3
+"""
+Usage:
+
+multicast: python serve_psn.py 1 192.168.1.4 236.10.10.10
+unicast: python serve_psn.py 1 192.168.1.4
+
+Args:
+- number of trackers to generate
+- local IP adress
+- multricast adress (opt)
+
+Sends the data at 60Hz and the info at 1Hz with a PsnServer, which keeps
+the cadence independent of the time taken to build and encode the frames.
+"""
+
+import math
+import sys
+import time
+import pypsn
+
+try:
+    tracker_num = int(sys.argv[1])
+    ip_addr = sys.argv[2]
+    mcast_ip = None
+
+    if len(sys.argv) > 3:
+        mcast_ip = sys.argv[3]
+
+except Exception as e:
+    print("Args: tracker_num ip_addr mcast_ip (opt).")
+    print(e)
+    sys.exit(1)
+
+trackers = [
+    pypsn.PsnTracker(
+        tracker_id=i,
+        pos=pypsn.PsnVector3(0.0, 0.0, 0.0),
+        speed=pypsn.PsnVector3(0.0, 0.0, 0.0),
+        ori=pypsn.PsnVector3(0.0, 0.0, 0.0),
+        status=0.5,
+        accel=pypsn.PsnVector3(0.0, 0.0, 0.0),
+        trgtpos=pypsn.PsnVector3(0.0, 0.0, 0.0),
+        timestamp=0,
+    )
+    for i in range(tracker_num)
+]
+start_time = time.monotonic()
+
+
+def get_trackers():
+    """
+        Called by the server for each data frame
+
+    Returns:
+        list of trackers to send
+    """
+    elapsed_time = time.monotonic() - start_time
+    for tracker in trackers:
+        tracker.pos.x = math.sin(elapsed_time + tracker.tracker_id)
+        tracker.timestamp = int(elapsed_time * 1000000)
+    return trackers
+
+
+sender = pypsn.PsnSender(mcast_ip=mcast_ip, ip_addr=ip_addr, port=56565)
+server = pypsn.PsnServer(
+    get_trackers,
+    sender,
+    name="system_name_001",
+    tracker_names={i: "tracker_" + str(i) for i in range(tracker_num)},
+    data_rate=60,
+    info_rate=1,
+)
+server.start()
+
+try:
+    while True:
+        time.sleep(1)
+        print(
+            "data frames:",
+            server.data_frames,
+            "missed deadlines:",
+            server.missed_deadlines,
+            "max lateness (ms):",
+            round(server.max_lateness * 1000, 3),
+        )
+except KeyboardInterrupt:
+    server.stop()
+    sender.close()
@@ -86,7 +86,8 @@ def start_psn():
     Returns:
         Receiver: psn receiver class
     """
-    pypsn.Receiver(check_zones, settings["ip_addr"]).start()
+    # check_zones runs on its own thread, only on the latest positions
+    pypsn.PipelinedReceiver(check_zones, settings["ip_addr"]).start()
 
 
 def check_zones(psn_data):
@@ -3,12 +3,24 @@
 Pure python PSN interface.
 """
 
+import asyncio
+import ctypes
+import errno
 import socket
-from struct import pack, unpack
+import sys
+import time
+from array import array
+from multiprocessing import shared_memory
+from collections import OrderedDict, deque
+from contextlib import ExitStack
+from operator import itemgetter
+from struct import Struct, calcsize
 from enum import IntEnum
-from typing import List
+from typing import Callable, Dict, List, NamedTuple, Sequence
+import multiprocessing
 import os
-from threading import Thread
+import selectors
+from threading import Condition, Event, Lock, Thread
 import multicast_expert
 
 __version__ = "0.2.4"
@@ -19,6 +31,8 @@ class PsnVector3:
     PSN vector variable structure
     """
 
+    __slots__ = ("x", "y", "z")
+
     def __init__(self, x: float, y: float, z: float):
         self.x = x
         self.y = y
@@ -28,17 +42,53 @@ class PsnVector3:
         return f"{self.x}, {self.y}, {self.z}"
 
     def __eq__(self, other) -> bool:
-        return self.x == other.x and self.y == other.y and self.z == other.z
+        try:
+            return self.x == other.x and self.y == other.y and self.z == other.z
+        except AttributeError:
+            return NotImplemented
 
     def __iter__(self):
         return iter((self.x, self.y, self.z))
 
+    def copy(self) -> "PsnVector3":
+        """
+            Get copy
+
+        Returns:
+            vector
+        """
+        return PsnVector3(self.x, self.y, self.z)
+
+    def freeze(self) -> "PsnFrozenVector3":
+        """
+            Get immutable, hashable copy
+
+        Returns:
+            frozen vector
+        """
+        return PsnFrozenVector3(self.x, self.y, self.z)
+
+
+class PsnFrozenVector3(NamedTuple):
+    """
+    Immutable, hashable PSN vector variable structure
+    """
+
+    x: float
+    y: float
+    z: float
+
+    def __str__(self):
+        return f"{self.x}, {self.y}, {self.z}"
+
 
 class PsnInfo:
     """
     PSN info packet variable structure
     """
 
+    __slots__ = ("timestamp", "version_high", "version_low", "frame_id", "packet_count")
+
     def __init__(
         self,
         timestamp: int,
@@ -59,6 +109,8 @@ class PsnTrackerInfo:
     PSN tracker info variable structure
     """
 
+    __slots__ = ("tracker_id", "tracker_name")
+
     def __init__(self, tracker_id: int, tracker_name: str):
         self.tracker_id = tracker_id
         self.tracker_name = tracker_name
@@ -69,6 +121,18 @@ class PsnTracker:
     PSN tracker data variable structure
     """
 
+    __slots__ = (
+        "tracker_id",
+        "info",
+        "pos",
+        "speed",
+        "ori",
+        "accel",
+        "trgtpos",
+        "status",
+        "timestamp",
+    )
+
     def __init__(
         self,
         tracker_id: int,
@@ -91,15 +155,38 @@ class PsnTracker:
         self.status = status
         self.timestamp = timestamp
 
+    def copy(self) -> "PsnTracker":
+        """
+            Get copy, with copies of the vectors
+
+        Returns:
+            tracker
+        """
+        return PsnTracker(
+            self.tracker_id,
+            self.info,
+            self.pos and self.pos.copy(),
+            self.speed and self.speed.copy(),
+            self.ori and self.ori.copy(),
+            self.accel and self.accel.copy(),
+            self.trgtpos and self.trgtpos.copy(),
+            self.status,
+            self.timestamp,
+        )
+
 
 class PsnDataPacket:
     """
     PSN data packet variable structure
     """
 
-    def __init__(self, info: "PsnInfo", trackers: List["PsnTracker"]):
+    __slots__ = ("info", "trackers", "source")
+
+    def __init__(self, info: "PsnInfo", trackers: Sequence["PsnTracker"], source=None):
         self.info = info
         self.trackers = trackers
+        # sender of the packet, e.g. its (ip, port)
+        self.source = source
 
 
 class PsnInfoPacket:
@@ -107,15 +194,134 @@ class PsnInfoPacket:
     PSN info packet variable structure
     """
 
+    __slots__ = ("info", "name", "trackers", "tracker_names", "source")
+
     def __init__(
         self,
         info: "PsnInfo",
         name: str,
-        trackers: List["PsnTrackerInfo"],
+        trackers: Sequence["PsnTrackerInfo"],
+        tracker_names: Dict[int, str] = None,
+        source=None,
     ):
         self.info = info
         self.name = name
         self.trackers = trackers
+        self.tracker_names = tracker_names
+        # sender of the packet, e.g. its (ip, port)
+        self.source = source
+
+    def get_tracker_names(self) -> Dict[int, str]:
+        """
+            Get decoded tracker names
+
+        Returns:
+            tracker id -> tracker name
+        """
+        if self.tracker_names is None:
+            tracker_names = {}
+            for tracker in self.trackers:
+                name = tracker.tracker_name
+                if isinstance(name, bytes):
+                    name = name.decode("utf-8", "replace")
+                tracker_names[tracker.tracker_id] = sys.intern(name)
+            self.tracker_names = tracker_names
+        return self.tracker_names
+
+
+class PsnLazyTrackerList(Sequence):
+    """
+    Sequence of PSN trackers decoded on first access
+    """
+
+    __slots__ = ("buffer", "offsets", "decoded")
+
+    def __init__(self, buffer: memoryview, offsets: List[tuple]):
+        self.buffer = buffer
+        self.offsets = offsets
+        self.decoded: List["PsnTracker"] = [None] * len(offsets)
+
+    @property
+    def tracker_ids(self) -> List[int]:
+        """
+        Ids of all trackers, without decoding them
+        """
+        return [tracker_id for tracker_id, _, _ in self.offsets]
+
+    def get(self, tracker_id: int) -> "PsnTracker":
+        """
+            Get tracker by its id
+
+        Args:
+            tracker_id (int): tracker id
+
+        Returns:
+            tracker or None
+        """
+        for index, (offset_id, _, _) in enumerate(self.offsets):
+            if offset_id == tracker_id:
+                return self[index]
+        return None
+
+    def __len__(self):
+        return len(self.offsets)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self.offsets)))]
+        tracker = self.decoded[index]
+        if tracker is None:
+            tracker = parse_data_tracker_from(self.buffer, *self.offsets[index])
+            self.decoded[index] = tracker
+        return tracker
+
+
+class PsnLazyDataPacket(PsnDataPacket):
+    """
+    PSN data packet with trackers decoded on first access
+    """
+
+    __slots__ = ()
+
+    def __init__(self, info: "PsnInfo", trackers: "PsnLazyTrackerList"):
+        super().__init__(info, trackers)
+
+
+class PsnTrackerBatch:
+    """
+    Columnar PSN tracker data of many data packets, as numpy arrays
+    """
+
+    def __init__(
+        self,
+        packet_frame_id,
+        packet_timestamp,
+        packet_index,
+        tracker_id,
+        fields,
+        masks,
+    ):
+        self.packet_frame_id = packet_frame_id
+        self.packet_timestamp = packet_timestamp
+        self.packet_index = packet_index
+        self.tracker_id = tracker_id
+        self.pos = fields["pos"]
+        self.speed = fields["speed"]
+        self.ori = fields["ori"]
+        self.accel = fields["accel"]
+        self.trgtpos = fields["trgtpos"]
+        self.status = fields["status"]
+        self.timestamp = fields["timestamp"]
+        self.has_pos = masks["pos"]
+        self.has_speed = masks["speed"]
+        self.has_ori = masks["ori"]
+        self.has_accel = masks["accel"]
+        self.has_trgtpos = masks["trgtpos"]
+        self.has_status = masks["status"]
+        self.has_timestamp = masks["timestamp"]
+
+    def __len__(self):
+        return len(self.tracker_id)
 
 
 class PsnV1Chunk(IntEnum):
@@ -184,6 +390,120 @@ class PsnTrackerChunkInfo(IntEnum):
     PSN_DATA_TRACKER_TIMESTAMP = 0x0006
 
 
+class PsnSchedulePolicy(IntEnum):
+    """
+    What PsnServer does with data frames whose deadline passed
+    """
+
+    SKIP = 0  # missed frames are dropped, the cadence is kept
+    CATCH_UP = 1  # missed frames are sent back to back
+
+
+class PsnOverflowPolicy(IntEnum):
+    """
+    What a receiver does with a packet when its queue is full
+    """
+
+    DROP_OLDEST = 0  # the oldest queued packet is dropped
+    DROP_NEWEST = 1  # the new packet is dropped
+    BLOCK = 2  # the receiving thread waits, not supported by AsyncReceiver
+    LATEST = 3  # queued data of a source only keeps the latest of each tracker
+
+
+CHUNK_HEADER_STRUCT = Struct("<HH")
+PSN_DATA_PACKET_ID = PsnV2Chunck.PSN_DATA_PACKET.to_bytes(2, "little")
+PACKET_HEADER_STRUCT = Struct("<QBBBB")
+VECTOR3_STRUCT = Struct("<fff")
+STATUS_STRUCT = Struct("<f")
+TIMESTAMP_STRUCT = Struct("<Q")
+
+# canonical tracker encoding written by prepare_psn_data_packet_bytes: pos,
+# speed, ori, status, accel, trgtpos and timestamp sub-chunks, 100 bytes
+TRACKER_STRUCT = Struct("<HHfffHHfffHHfffHHfHHfffHHfffHHQ")
+TRACKER_STRUCT_HEADERS = itemgetter(0, 1, 5, 6, 10, 11, 15, 16, 18, 19, 23, 24, 28, 29)
+TRACKER_STRUCT_LAYOUT = (0, 12, 1, 12, 2, 12, 3, 4, 4, 12, 5, 12, 6, 8)
+# the same layout with the has-subchunks bit set on every length
+TRACKER_STRUCT_LAYOUT_FLAGGED = tuple(
+    value | (1 << 15) if index % 2 else value
+    for index, value in enumerate(TRACKER_STRUCT_LAYOUT)
+)
+
+# tracker chunk id -> (PsnTracker attribute, unpack_from, value factory, size)
+TRACKER_CHUNK_DECODERS = {
+    PsnTrackerChunk.PSN_DATA_TRACKER_POS: (
+        "pos",
+        VECTOR3_STRUCT.unpack_from,
+        PsnVector3,
+        VECTOR3_STRUCT.size,
+    ),
+    PsnTrackerChunk.PSN_DATA_TRACKER_SPEED: (
+        "speed",
+        VECTOR3_STRUCT.unpack_from,
+        PsnVector3,
+        VECTOR3_STRUCT.size,
+    ),
+    PsnTrackerChunk.PSN_DATA_TRACKER_ORI: (
+        "ori",
+        VECTOR3_STRUCT.unpack_from,
+        PsnVector3,
+        VECTOR3_STRUCT.size,
+    ),
+    PsnTrackerChunkInfo.PSN_DATA_TRACKER_STATUS: (
+        "status",
+        STATUS_STRUCT.unpack_from,
+        None,
+        STATUS_STRUCT.size,
+    ),
+    PsnTrackerChunk.PSN_DATA_TRACKER_ACCEL: (
+        "accel",
+        VECTOR3_STRUCT.unpack_from,
+        PsnVector3,
+        VECTOR3_STRUCT.size,
+    ),
+    PsnTrackerChunk.PSN_DATA_TRACKER_TRGTPOS: (
+        "trgtpos",
+        VECTOR3_STRUCT.unpack_from,
+        PsnVector3,
+        VECTOR3_STRUCT.size,
+    ),
+    PsnTrackerChunkInfo.PSN_DATA_TRACKER_TIMESTAMP: (
+        "timestamp",
+        TIMESTAMP_STRUCT.unpack_from,
+        None,
+        TIMESTAMP_STRUCT.size,
+    ),
+}
+
+
+# TrackerTable column -> (array typecode, values per tracker)
+TRACKER_TABLE_FIELDS = {
+    "pos": ("f", 3),
+    "speed": ("f", 3),
+    "ori": ("f", 3),
+    "status": ("f", 1),
+    "accel": ("f", 3),
+    "trgtpos": ("f", 3),
+    "timestamp": ("Q", 1),
+}
+TRACKER_TABLE_VECTORS = ("pos", "speed", "ori", "accel", "trgtpos")
+TRACKER_TABLE_BITS = {field: 1 << bit for bit, field in enumerate(TRACKER_TABLE_FIELDS)}
+TRACKER_TABLE_ALL_FIELDS = (1 << len(TRACKER_TABLE_FIELDS)) - 1
+# magic, max_trackers, sequence, frame_id, packet_timestamp, row_count
+SHARED_TABLE_HEADER_STRUCT = Struct("<4sIIIQI4x")
+SHARED_TABLE_MAGIC = b"PSN1"
+SHARED_TABLE_ATTACH_STRUCT = Struct("<4sI")
+SHARED_TABLE_SEQUENCE_STRUCT = Struct("<I")
+SHARED_TABLE_SEQUENCE_OFFSET = 8
+# frame_id, packet_timestamp
+SHARED_TABLE_FRAME_STRUCT = Struct("<IQ")
+SHARED_TABLE_FRAME_OFFSET = 12
+# rows up to the highest tracker id written so far
+SHARED_TABLE_ROW_COUNT_STRUCT = Struct("<I")
+SHARED_TABLE_ROW_COUNT_OFFSET = 24
+# pos, speed, ori, status, accel, trgtpos, timestamp, present, updated
+SHARED_TABLE_ROW_STRUCT = Struct("<16fQB3xd")
+
+
 def join_multicast_windows(mcast_grp, mcast_port, if_ip):
     """
         Join multicast on Windows
@@ -254,412 +574,3740 @@ def determine_os():
         return "Operating system not supported"
 
 
-class Receiver(Thread):
-    """
-    PSN receiver class
-    """
-
-    def __init__(self, callback, ip_addr="0.0.0.0", mcast_port=56565, timeout=2):
-        Thread.__init__(self)
-        self.callback = callback
-        self.running = True
-        self.socket = get_socket(ip_addr, mcast_port)
-        if timeout is not None and self.socket is not None:
-            self.socket.settimeout(timeout)
-
-    def stop(self):
-        """
-        Stop listening.
-        """
-        self.running = False
-        if self.socket is not None:
-            self.socket.close()
-        self.join()
-
-    def run(self):
-        """
-        Start listnening.
-        """
-        data = ""
-        if self.socket is None:
-            return
-        while self.running:
-            try:
-                data, _ = self.socket.recvfrom(1500)
-            except Exception as e:
-                print("Network data error:", e)
-            else:
-                psn_data = parse_psn_packet(data)
-                self.callback(psn_data)
+# struct mmsghdr {struct msghdr {msg_name, msg_namelen, msg_iov, msg_iovlen,
+# msg_control, msg_controllen, msg_flags}, msg_len} and struct iovec
+# {iov_base, iov_len} of the sendmmsg / recvmmsg system calls
+MMSGHDR_STRUCT = Struct("@PIPNPNi0PI0P")
+MMSGHDR_MSG_LEN_OFFSET = calcsize("@PIPNPNi0P")
+UINT_STRUCT = Struct("@I")
+IOVEC_STRUCT = Struct("@PN")
+SOCKADDR_IN_SIZE = 16
+# sin_family in host order and sin_port in network order of struct sockaddr_in
+SOCKADDR_FAMILY_STRUCT = Struct("=H")
+SOCKADDR_PORT_STRUCT = Struct(">H")
 
 
-def get_socket(ip_addr, mcast_port):
+def get_libc_function(name):
     """
-        Listening for incomming psn packets
+        Get a function of the C library, only used on Linux.
 
     Args:
-        ip_addr (str): iface ip
-        mcast_port (str): multicast port
+        name (str): function name, e.g. "sendmmsg"
 
     Returns:
-        socket
+        ctypes function or None if not available
     """
-    mcast_grp = "236.10.10.10"
-    sock = None
-    if determine_os() == "nt":
-        sock = join_multicast_windows(mcast_grp, mcast_port, ip_addr)
-    elif determine_os() == "posix":
-        sock = join_multicast_posix(mcast_grp, mcast_port, ip_addr)
-
-    if sock is None:
-        print("error getting network interface")
-        return
-    return sock
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        function = getattr(ctypes.CDLL(None, use_errno=True), name)
+    except (OSError, AttributeError):
+        return None
+    function.restype = ctypes.c_int
+    return function
 
 
-def parse_psn_packet(buffer):
+def get_sockaddrs_in(addresses):
     """
-        Parse received data buffer
+        Encode IPv4 addresses as consecutive struct sockaddr_in.
 
     Args:
-        buffer (bytes): Received PSN data
+        addresses (list): list of (ip, port)
 
     Returns:
-        psn packet
+        bytearray of 16 bytes per address
     """
-    psn_id = unpack("<H", buffer[0:2])[0]
-    if psn_id in iter(PsnV1Chunk):
-        pass  # PSN V1 not supported by this parser
-    elif psn_id in iter(PsnV2Chunck):
-        chunk_id, chunk_buffer, _ = parse_chunk(buffer)
-        if chunk_id == PsnV2Chunck.PSN_INFO_PACKET:
-            return parse_info(chunk_buffer)
-        elif chunk_id == PsnV2Chunck.PSN_DATA_PACKET:
-            return parse_data(chunk_buffer)
+    sockaddrs = bytearray()
+    for ip, port in addresses:
+        sockaddrs += SOCKADDR_FAMILY_STRUCT.pack(socket.AF_INET)
+        sockaddrs += SOCKADDR_PORT_STRUCT.pack(port)
+        sockaddrs += socket.inet_aton(socket.gethostbyname(ip))
+        sockaddrs += bytes(8)
+    return sockaddrs
 
 
-def parse_chunk(buffer):
+SENDMMSG = get_libc_function("sendmmsg")
+
+
+def sendmmsg(sock, psn_packets, addresses, sockaddrs=None):
     """
-        Parse received psn chunk
+        Send each packet to each address, with as few sendmmsg system calls
+        as possible. Falls back to sendto per datagram if sendmmsg is not
+        available.
 
     Args:
-        buffer (bytes): Received PSN data
+        sock (socket): udp socket or multicast_expert.McastTxSocket
+        psn_packets (list): list of packets as bytes
+        addresses (list): list of (ip, port), packets are sent in order to
+            the first address, then to the next one
+        sockaddrs (bytearray, optional): addresses encoded by
+            get_sockaddrs_in, to not encode them again
 
     Returns:
-        chunk_id, data, and rest
+        number of datagrams sent
     """
-    chunk_id, data_field = unpack("<HH", buffer[0:4])
-    data_len = data_field & 0x7FFF
-    data = buffer[4 : 4 + data_len]
-    rest = None
+    count = len(psn_packets) * len(addresses)
+    if SENDMMSG is None or count < 2:
+        for address in addresses:
+            for psn_packet in psn_packets:
+                sock.sendto(psn_packet, address)
+        return count
+
+    if sockaddrs is None:
+        sockaddrs = get_sockaddrs_in(addresses)
+    data = bytearray(b"".join(psn_packets))
+    iovecs = bytearray(IOVEC_STRUCT.size * len(psn_packets))
+    headers = bytearray(MMSGHDR_STRUCT.size * count)
+    data_address = ctypes.addressof(ctypes.c_char.from_buffer(data))
+    iovecs_address = ctypes.addressof(ctypes.c_char.from_buffer(iovecs))
+    sockaddrs_address = ctypes.addressof(ctypes.c_char.from_buffer(sockaddrs))
+    headers_address = ctypes.addressof(ctypes.c_char.from_buffer(headers))
+
+    iovec_addresses = []
+    offset = 0
+    for index, psn_packet in enumerate(psn_packets):
+        IOVEC_STRUCT.pack_into(
+            iovecs, index * IOVEC_STRUCT.size, data_address + offset, len(psn_packet)
+        )
+        iovec_addresses.append(iovecs_address + index * IOVEC_STRUCT.size)
+        offset += len(psn_packet)
+    offset = 0
+    for index in range(len(addresses)):
+        sockaddr_address = sockaddrs_address + index * SOCKADDR_IN_SIZE
+        for iovec_address in iovec_addresses:
+            MMSGHDR_STRUCT.pack_into(
+                headers,
+                offset,
+                sockaddr_address,
+                SOCKADDR_IN_SIZE,
+                iovec_address,
+                1,
+                0,
+                0,
+                0,
+                0,
+            )
+            offset += MMSGHDR_STRUCT.size
+
+    sent = 0
+    fileno = sock.fileno()
+    while sent < count:
+        result = SENDMMSG(
+            fileno,
+            ctypes.c_void_p(headers_address + sent * MMSGHDR_STRUCT.size),
+            count - sent,
+            0,
+        )
+        if result < 0:
+            error = ctypes.get_errno()
+            raise OSError(error, os.strerror(error))
+        sent += result
+    return sent
 
-    if data_len + 8 < len(buffer):
-        rest = buffer[data_len + 4 :]
-    return chunk_id, data, rest
 
+RECVMMSG = get_libc_function("recvmmsg")
 
-def parse_info(buffer):
+
+class PsnReceiveRing:
     """
-        Parse received info buffer
+        Preallocated buffers, reused for each burst of received datagrams.
+        The first datagram is received with recvfrom_into, on Linux the ones
+        already queued behind it are drained with one recvmmsg call.
+        The received memoryviews are only valid until the next receive.
 
     Args:
-        buffer (bytes): Received PSN data
-
-    Returns:
-        psn packet
+        size (int, optional): max number of datagrams received at once.
+            Default: 32
+        datagram_size (int, optional): size of one buffer. Default: 1500
+        batch (bool, optional): use recvmmsg where available. Default: True
     """
-    info = None
-    system_name = None
-    trackers = None
-
-    while buffer:
-        chunk_id, chunk_buffer, buffer = parse_chunk(buffer)
-        if chunk_id == PsnInfoChunk.PSN_INFO_PACKET_HEADER:
-            info = parse_header(chunk_buffer[:12])
-        elif chunk_id == PsnInfoChunk.PSN_INFO_SYSTEM_NAME:
-            system_name = parse_system_name(chunk_buffer)
-        elif chunk_id == PsnInfoChunk.PSN_INFO_TRACKER_LIST:
-            trackers = parse_info_tracker_list(chunk_buffer)
 
-    if info and system_name and trackers:
-        packet = PsnInfoPacket(info, system_name, trackers)
-        return packet
-    else:
-        return None
+    def __init__(self, size=32, datagram_size=1500, batch=True):
+        self.size = size
+        self.buffer = bytearray(size * datagram_size)
+        buffer_view = memoryview(self.buffer)
+        self.views = [
+            buffer_view[index * datagram_size : (index + 1) * datagram_size]
+            for index in range(size)
+        ]
+        # source (ip, port) of each raw struct sockaddr_in
+        self.addresses: Dict[bytes, tuple] = {}
+        self.headers = None
+        if batch and RECVMMSG is not None and size > 1:
+            self.sockaddrs = bytearray(size * SOCKADDR_IN_SIZE)
+            self.iovecs = bytearray(size * IOVEC_STRUCT.size)
+            self.headers = bytearray(size * MMSGHDR_STRUCT.size)
+            buffer_address = ctypes.addressof(ctypes.c_char.from_buffer(self.buffer))
+            sockaddrs_address = ctypes.addressof(
+                ctypes.c_char.from_buffer(self.sockaddrs)
+            )
+            iovecs_address = ctypes.addressof(ctypes.c_char.from_buffer(self.iovecs))
+            self.headers_address = ctypes.addressof(
+                ctypes.c_char.from_buffer(self.headers)
+            )
+            for index in range(size):
+                IOVEC_STRUCT.pack_into(
+                    self.iovecs,
+                    index * IOVEC_STRUCT.size,
+                    buffer_address + index * datagram_size,
+                    datagram_size,
+                )
+                MMSGHDR_STRUCT.pack_into(
+                    self.headers,
+                    index * MMSGHDR_STRUCT.size,
+                    sockaddrs_address + index * SOCKADDR_IN_SIZE,
+                    SOCKADDR_IN_SIZE,
+                    iovecs_address + index * IOVEC_STRUCT.size,
+                    1,
+                    0,
+                    0,
+                    0,
+                    0,
+                )
+
+    def get_address(self, index):
+        """
+            Get source address of a datagram received by recvmmsg.
 
+        Args:
+            index (int): index in the ring
 
-def parse_data(buffer):
-    """
-        Parse received data buffer
+        Returns:
+            (ip, port)
+        """
+        offset = index * SOCKADDR_IN_SIZE
+        sockaddr = bytes(self.sockaddrs[offset + 2 : offset + 8])
+        address = self.addresses.get(sockaddr)
+        if address is None:
+            address = self.addresses[sockaddr] = (
+                socket.inet_ntoa(sockaddr[2:]),
+                SOCKADDR_PORT_STRUCT.unpack_from(sockaddr)[0],
+            )
+        return address
+
+    def receive(self, sock):
+        """
+            Receive a burst of datagrams, waiting for the first one with the
+            timeout of the socket.
 
-    Args:
-        buffer (bytes): Received PSN data
+        Args:
+            sock (socket): udp socket
 
-    Returns:
-        psn packet
+        Returns:
+            list of (datagram as memoryview, source address)
+        """
+        length, address = sock.recvfrom_into(self.views[0])
+        received = [(self.views[0][:length], address)]
+        if self.headers is None:
+            return received
+        count = RECVMMSG(
+            sock.fileno(),
+            ctypes.c_void_p(self.headers_address + MMSGHDR_STRUCT.size),
+            self.size - 1,
+            socket.MSG_DONTWAIT,
+            None,
+        )
+        if count < 0:
+            error = ctypes.get_errno()
+            if error in (errno.EAGAIN, errno.EWOULDBLOCK):
+                return received
+            raise OSError(error, os.strerror(error))
+        for index in range(1, count + 1):
+            (length,) = UINT_STRUCT.unpack_from(
+                self.headers, index * MMSGHDR_STRUCT.size + MMSGHDR_MSG_LEN_OFFSET
+            )
+            received.append((self.views[index][:length], self.get_address(index)))
+        return received
+
+
+class PsnFrameAssembler:
+    """
+    Merges PSN packets split over several datagrams back into one frame
     """
-    info = None
-    trackers = None
 
-    while buffer:
-        chunk_id, chunk_buffer, buffer = parse_chunk(buffer)
-        if chunk_id == PsnDataChunk.PSN_DATA_PACKET_HEADER:
-            info = parse_header(chunk_buffer[:12])
-        elif chunk_id == PsnDataChunk.PSN_DATA_TRACKER_LIST:
-            trackers = parse_data_tracker_list(chunk_buffer)
+    def __init__(self, timeout=0.05, max_frames=64):
+        """
+        Args:
+            timeout (float, optional): seconds to wait for the missing parts of
+                a frame before emitting what arrived. Default: 0.05
+            max_frames (int, optional): frames buffered at once, the oldest is
+                dropped when exceeded. Default: 64
+        """
+        self.timeout = timeout
+        self.max_frames = max_frames
+        self.dropped_frames = 0
+        self.duplicate_parts = 0
+        # (source, packet class, frame_id) -> (deadline, packets, part keys)
+        self.frames: OrderedDict = OrderedDict()
+
+    def add(self, packet, source=None):
+        """
+            Add received packet
 
-    if info and trackers:
-        packet = PsnDataPacket(info, trackers)
-        return packet
-    else:
+        Args:
+            packet (PsnDataPacket or PsnInfoPacket): parsed packet
+            source (optional): sender of the packet, e.g. its address
+
+        Returns:
+            complete frame, or None while parts are still missing
+        """
+        if packet is None or packet.info.packet_count <= 1:
+            return packet
+
+        key = (source, type(packet), packet.info.frame_id)
+        frame = self.frames.get(key)
+        if frame is None:
+            frame = (time.monotonic() + self.timeout, [], set())
+            self.frames[key] = frame
+            while len(self.frames) > self.max_frames:
+                self.frames.popitem(last=False)
+                self.dropped_frames += 1
+
+        # parts are told apart by their tracker ids, a resent part is dropped
+        # instead of completing the frame early. Parts without trackers, e.g.
+        # filtered out ones, can not be told apart and always count.
+        trackers = packet.trackers
+        tracker_ids = getattr(trackers, "tracker_ids", None)
+        if tracker_ids is None:
+            tracker_ids = [tracker.tracker_id for tracker in trackers]
+        part = tuple(tracker_ids)
+        if part:
+            if part in frame[2]:
+                self.duplicate_parts += 1
+                return None
+            frame[2].add(part)
+        frame[1].append(packet)
+
+        if len(frame[1]) >= packet.info.packet_count:
+            del self.frames[key]
+            return merge_psn_packets(frame[1])
         return None
 
+    def expire(self, now=None):
+        """
+            Take out frames whose parts did not all arrive in time
 
-def parse_header(buffer):
+        Args:
+            now (float, optional): time.monotonic() value to compare against
+
+        Returns:
+            list of incomplete frames, merged
+        """
+        if now is None:
+            now = time.monotonic()
+        expired = []
+        while self.frames:
+            key, (deadline, packets, _) = next(iter(self.frames.items()))
+            if deadline > now:
+                break
+            del self.frames[key]
+            expired.append(merge_psn_packets(packets))
+        return expired
+
+
+def merge_psn_packets(packets):
     """
-        Parse received header buffer
+        Merge the parts of one PSN frame
 
     Args:
-        buffer (bytes): Received PSN data
+        packets (list): PsnDataPacket or PsnInfoPacket parts of the frame
 
     Returns:
-        infos header
+        psn packet with the trackers of all parts
     """
-    (timestamp, version_high, version_low, frame_id, packet_count) = unpack(
-        "<QBBBB", buffer
-    )
-
-    info = PsnInfo(timestamp, version_high, version_low, frame_id, packet_count)
-
-    return info
+    first = packets[0]
+    if len(packets) == 1:
+        return first
+    trackers = [tracker for packet in packets for tracker in packet.trackers]
+    if isinstance(first, PsnInfoPacket):
+        return PsnInfoPacket(first.info, first.name, trackers, source=first.source)
+    return PsnDataPacket(first.info, trackers, first.source)
 
 
-def parse_system_name(buffer):
+class PsnInfoCache:
+    """
+    LRU cache of parsed info packets, keyed on their raw chunks except the
+    packet header. Cached packets share the immutable name, tracker tuple
+    and tracker name map, only the header is parsed for every packet.
     """
-        Parse received system name buffer
 
-    Args:
-        buffer (bytes): Received PSN data
+    def __init__(self, maxsize=64):
+        """
+        Args:
+            maxsize (int, optional): number of distinct info packets kept.
+                Default: 64
+        """
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        # raw info chunks -> (system name, trackers, tracker names)
+        self.entries: OrderedDict = OrderedDict()
 
-    Returns:
-        system name
-    """
-    # TODO: may cause unicode issues?
-    system_name = buffer
-    return system_name
+    def parse_from(self, buffer, offset, end):
+        """
+            Parse received info chunk in place, reusing a cached packet
 
+        Args:
+            buffer (memoryview): Received PSN data
+            offset (int): start of the info chunk data
+            end (int): end of the info chunk data
 
-def parse_info_tracker_list(buffer):
+        Returns:
+            psn packet
+        """
+        info = None
+        header_start = header_end = chunk_offset = offset
+        while chunk_offset + 4 <= end:
+            chunk_id, start, chunk_end = parse_chunk_from(buffer, chunk_offset, end)
+            if chunk_id == PsnInfoChunk.PSN_INFO_PACKET_HEADER and (
+                chunk_end - start >= PACKET_HEADER_STRUCT.size
+            ):
+                info = parse_header_from(buffer, start)
+                header_start, header_end = chunk_offset, chunk_end
+            chunk_offset = chunk_end
+        if info is None:
+            return None
+
+        key = bytes(buffer[offset:header_start]) + bytes(buffer[header_end:end])
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+            packet = parse_info_from(buffer, offset, end)
+            if packet is None:
+                return None
+            entry = (packet.name, tuple(packet.trackers), packet.get_tracker_names())
+            self.entries[key] = entry
+            if len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+        else:
+            self.hits += 1
+            self.entries.move_to_end(key)
+        return PsnInfoPacket(info, *entry)
+
+
+class PsnTrackerPool:
+    """
+    PsnTracker and PsnVector3 instances reused per source and tracker id.
+    Parsing a data packet overwrites the trackers returned for the previous
+    packet of the same source: their values are valid until the next packet
+    is parsed, callbacks which keep them longer must use PsnTracker.copy().
     """
-        Parse received tracker infos buffer
 
-    Args:
-        buffer (bytes): Received PSN data
+    def __init__(self):
+        # (source, tracker_id) -> (tracker, {vector field: vector})
+        self.entries: Dict[tuple, tuple] = {}
 
-    Returns:
-        trackers infos
-    """
-    trackers: List["PsnTrackerInfo"] = []
-    while buffer:
-        tracker_id, chunk_buffer, buffer = parse_chunk(buffer)
+    def get_parse_tracker(self, source=None, fields=None):
+        """
+            Get tracker parser for parse_data_from
 
-        if len(chunk_buffer) > 0:
-            while chunk_buffer:
-                chunk_id, info_buffer, chunk_buffer = parse_chunk(chunk_buffer)
-                if chunk_id == PasnTrackerListChunk.PSN_INFO_TRACKER_NAME:
-                    # TODO: encoding issues?
-                    tracker_name = info_buffer
-                    tracker = PsnTrackerInfo(tracker_id, tracker_name)
-                    trackers.append(tracker)
-    return trackers
+        Args:
+            source (optional): sender of the packet, e.g. its address
+            fields (set, optional): only decode these PsnTracker fields
 
+        Returns:
+            callable(buffer, tracker_id, offset, end)
+        """
+        decoders = None if fields is None else get_tracker_decoders(fields)
 
-def parse_data_tracker_list(buffer):
-    """
-        Parse received trackers data buffer
+        def parse_tracker(buffer, tracker_id, offset, end):
+            return self.parse_tracker_from(
+                buffer, tracker_id, offset, end, source, decoders
+            )
 
-    Args:
-        buffer (bytes): Received PSN data
+        return parse_tracker
 
-    Returns:
-        trackers data
+    def parse_tracker_from(
+        self, buffer, tracker_id, offset, end, source=None, decoders=None
+    ):
+        """
+            Parse received tracker data into the pooled tracker
+
+        Args:
+            buffer (memoryview): Received PSN data
+            tracker_id (int): tracker id
+            offset (int): start of the tracker data
+            end (int): end of the tracker data
+            source (optional): sender of the packet, e.g. its address
+            decoders (dict, optional): only decode the chunks of these
+                decoders, see get_tracker_decoders. Default: all fields
+
+        Returns:
+            tracker data
+        """
+        key = (source, tracker_id)
+        entry = self.entries.get(key)
+        if entry is None:
+            entry = (
+                PsnTracker(tracker_id),
+                {field: PsnVector3(0.0, 0.0, 0.0) for field in TRACKER_TABLE_VECTORS},
+            )
+            self.entries[key] = entry
+        tracker, vectors = entry
+
+        if decoders is None and end - offset == TRACKER_STRUCT.size:
+            values = TRACKER_STRUCT.unpack_from(buffer, offset)
+            headers = TRACKER_STRUCT_HEADERS(values)
+            if (
+                headers == TRACKER_STRUCT_LAYOUT_FLAGGED
+                or headers == TRACKER_STRUCT_LAYOUT
+            ):
+                vector = tracker.pos = vectors["pos"]
+                vector.x, vector.y, vector.z = values[2:5]
+                vector = tracker.speed = vectors["speed"]
+                vector.x, vector.y, vector.z = values[7:10]
+                vector = tracker.ori = vectors["ori"]
+                vector.x, vector.y, vector.z = values[12:15]
+                tracker.status = values[17]
+                vector = tracker.accel = vectors["accel"]
+                vector.x, vector.y, vector.z = values[20:23]
+                vector = tracker.trgtpos = vectors["trgtpos"]
+                vector.x, vector.y, vector.z = values[25:28]
+                tracker.timestamp = values[30]
+                return tracker
+
+        tracker.pos = tracker.speed = tracker.ori = None
+        tracker.accel = tracker.trgtpos = None
+        tracker.status = tracker.timestamp = 0
+        unpack_chunk_header = CHUNK_HEADER_STRUCT.unpack_from
+        get_decoder = (TRACKER_CHUNK_DECODERS if decoders is None else decoders).get
+        while offset + 4 <= end:
+            chunk_id, data_field = unpack_chunk_header(buffer, offset)
+            start = offset + 4
+            offset = start + (data_field & 0x7FFF)
+            decoder = get_decoder(chunk_id)
+            if decoder is not None and start + decoder[3] <= min(offset, end):
+                field, unpack_field, factory, _ = decoder
+                values = unpack_field(buffer, start)
+                if factory is None:
+                    setattr(tracker, field, values[0])
+                else:
+                    vector = vectors[field]
+                    vector.x, vector.y, vector.z = values
+                    setattr(tracker, field, vector)
+        return tracker
+
+
+class TrackerTable:
+    """
+    Latest state of all trackers, as array columns indexed by tracker id.
+    Vector columns hold three floats per tracker. The present column is a
+    bit mask of the fields (TRACKER_TABLE_FIELDS order) received in the last
+    update of the tracker, updated holds its time.monotonic() time, 0 when
+    the tracker was never updated.
     """
-    trackers: List["PsnTracker"] = []
-    while buffer:
-        tracker_id, chunk_buffer, buffer = parse_chunk(buffer)
 
-        tracker = PsnTracker(tracker_id)
+    def __init__(self, max_trackers=1024):
+        """
+        Args:
+            max_trackers (int, optional): size of the columns, trackers with
+                higher ids are skipped and counted in overflow_count.
+                Default: 1024
+        """
+        self.max_trackers = max_trackers
+        self.overflow_count = 0
+        self.lock = Lock()
+        self.columns = {
+            field: array(typecode, bytes(array(typecode).itemsize * width))
+            * max_trackers
+            for field, (typecode, width) in TRACKER_TABLE_FIELDS.items()
+        }
+        self.present = array("B", bytes(max_trackers))
+        self.updated = array("d", bytes(8 * max_trackers))
+        self.frame_id = 0
+        self.packet_timestamp = 0
+
+    def update(self, data_packet: "PsnDataPacket", now=None) -> int:
+        """
+            Write trackers of a parsed data packet
+
+        Args:
+            data_packet (PsnDataPacket): parsed data packet
+            now (float, optional): time.monotonic() time of the update
+
+        Returns:
+            number of trackers written
+        """
+        if now is None:
+            now = time.monotonic()
+        count = 0
+        with self.lock:
+            self.frame_id = data_packet.info.frame_id
+            self.packet_timestamp = data_packet.info.timestamp
+            for tracker in data_packet.trackers:
+                tracker_id = tracker.tracker_id
+                if tracker_id >= self.max_trackers:
+                    self.overflow_count += 1
+                    continue
+                present = 0
+                for bit, field in enumerate(TRACKER_TABLE_FIELDS):
+                    value = getattr(tracker, field)
+                    if value is None:
+                        continue
+                    present |= 1 << bit
+                    column = self.columns[field]
+                    if field in TRACKER_TABLE_VECTORS:
+                        index = tracker_id * 3
+                        column[index] = value.x
+                        column[index + 1] = value.y
+                        column[index + 2] = value.z
+                    else:
+                        column[tracker_id] = value
+                self.present[tracker_id] = present
+                self.updated[tracker_id] = now
+                count += 1
+        return count
+
+    def update_from_buffer(
+        self, buffer, now=None, tracker_ids=None, fields=None
+    ) -> int:
+        """
+            Write trackers of a received data packet, without creating
+            PsnTracker objects
+
+        Args:
+            buffer (bytes): Received PSN data
+            now (float, optional): time.monotonic() time of the update
+            tracker_ids (set, optional): only write the trackers with these
+                ids, the others are skipped without decoding them
+            fields (set, optional): only write these fields, the present bits
+                of the other fields are cleared
+
+        Returns:
+            number of trackers written, 0 when it is not a data packet
+        """
+        if now is None:
+            now = time.monotonic()
+        view = memoryview(buffer)
+        chunk_id, offset, end = parse_chunk_from(view, 0, len(view))
+        if chunk_id != PsnV2Chunck.PSN_DATA_PACKET:
+            return 0
+
+        header = None
+        tracker_list = None
+        while offset + 4 <= end:
+            chunk_id, start, offset = parse_chunk_from(view, offset, end)
+            if (
+                chunk_id == PsnDataChunk.PSN_DATA_PACKET_HEADER
+                and offset - start >= PACKET_HEADER_STRUCT.size
+            ):
+                header = PACKET_HEADER_STRUCT.unpack_from(view, start)
+            elif chunk_id == PsnDataChunk.PSN_DATA_TRACKER_LIST:
+                tracker_list = (start, offset)
+        if header is None or tracker_list is None:
+            return 0
+
+        count = 0
+        unpack_chunk_header = CHUNK_HEADER_STRUCT.unpack_from
+        if fields is None:
+            get_decoder = TRACKER_CHUNK_DECODERS.get
+        else:
+            get_decoder = get_tracker_decoders(fields).get
+        columns = self.columns
+        bits = TRACKER_TABLE_BITS
+        with self.lock:
+            self.packet_timestamp = header[0]
+            self.frame_id = header[3]
+            offset, end = tracker_list
+            while offset + 4 <= end:
+                tracker_id, data_field = unpack_chunk_header(view, offset)
+                chunk_offset = offset + 4
+                offset = min(chunk_offset + (data_field & 0x7FFF), end)
+                if tracker_ids is not None and tracker_id not in tracker_ids:
+                    continue
+                if tracker_id >= self.max_trackers:
+                    self.overflow_count += 1
+                    continue
+
+                present = 0
+                if fields is None and offset - chunk_offset == TRACKER_STRUCT.size:
+                    values = TRACKER_STRUCT.unpack_from(view, chunk_offset)
+                    headers = TRACKER_STRUCT_HEADERS(values)
+                    if (
+                        headers == TRACKER_STRUCT_LAYOUT_FLAGGED
+                        or headers == TRACKER_STRUCT_LAYOUT
+                    ):
+                        index = tracker_id * 3
+                        columns["pos"][index : index + 3] = array("f", values[2:5])
+                        columns["speed"][index : index + 3] = array("f", values[7:10])
+                        columns["ori"][index : index + 3] = array("f", values[12:15])
+                        columns["status"][tracker_id] = values[17]
+                        columns["accel"][index : index + 3] = array("f", values[20:23])
+                        columns["trgtpos"][index : index + 3] = array(
+                            "f", values[25:28]
+                        )
+                        columns["timestamp"][tracker_id] = values[30]
+                        present = TRACKER_TABLE_ALL_FIELDS
+                        chunk_offset = offset
+
+                while chunk_offset + 4 <= offset:
+                    chunk_id, data_field = unpack_chunk_header(view, chunk_offset)
+                    start = chunk_offset + 4
+                    chunk_offset = start + (data_field & 0x7FFF)
+                    decoder = get_decoder(chunk_id)
+                    if decoder is not None and start + decoder[3] <= min(
+                        chunk_offset, offset
+                    ):
+                        field, unpack_field, factory, _ = decoder
+                        values = unpack_field(view, start)
+                        if factory is None:
+                            columns[field][tracker_id] = values[0]
+                        else:
+                            index = tracker_id * 3
+                            columns[field][index : index + 3] = array("f", values)
+                        present |= bits[field]
+
+                self.present[tracker_id] = present
+                self.updated[tracker_id] = now
+                count += 1
+        return count
+
+    def tracker_ids(self) -> List[int]:
+        """
+            Get ids of trackers updated at least once
+
+        Returns:
+            tracker ids
+        """
+        return [
+            tracker_id for tracker_id, updated in enumerate(self.updated) if updated
+        ]
+
+    def get(self, tracker_id: int) -> "PsnTracker":
+        """
+            Get copy of tracker state
+
+        Args:
+            tracker_id (int): tracker id
+
+        Returns:
+            tracker or None when it was never updated
+        """
+        if tracker_id >= self.max_trackers or not self.updated[tracker_id]:
+            return None
+        tracker = PsnTracker(tracker_id)
+        with self.lock:
+            present = self.present[tracker_id]
+            for field, bit in TRACKER_TABLE_BITS.items():
+                if not present & bit:
+                    continue
+                column = self.columns[field]
+                if field in TRACKER_TABLE_VECTORS:
+                    index = tracker_id * 3
+                    value = PsnVector3(*column[index : index + 3])
+                else:
+                    value = column[tracker_id]
+                setattr(tracker, field, value)
+        return tracker
+
+    def view(self, field: str) -> memoryview:
+        """
+            Get live, read-only view of a column, without copying it
+
+        Args:
+            field (str): column name, one of TRACKER_TABLE_FIELDS, present or
+                updated
+
+        Returns:
+            memoryview of the column
+        """
+        if field == "present":
+            return memoryview(self.present).toreadonly()
+        if field == "updated":
+            return memoryview(self.updated).toreadonly()
+        return memoryview(self.columns[field]).toreadonly()
+
+    def snapshot(self) -> Dict[str, array]:
+        """
+            Get consistent copy of all columns
+
+        Returns:
+            column name -> array copy
+        """
+        with self.lock:
+            snapshot = {field: column[:] for field, column in self.columns.items()}
+            snapshot["present"] = self.present[:]
+            snapshot["updated"] = self.updated[:]
+        return snapshot
+
+    def as_numpy(self, field: str):
+        """
+            Get live numpy view of a column, without copying it. Vector
+            columns have (max_trackers, 3) shape.
+
+        Args:
+            field (str): column name, one of TRACKER_TABLE_FIELDS, present or
+                updated
+
+        Returns:
+            numpy array
+        """
+        try:
+            import numpy as np  # type: ignore
+        except ImportError as e:
+            raise ImportError("TrackerTable.as_numpy requires numpy") from e
+        column = np.frombuffer(self.view(field), dtype=self.view(field).format)
+        if field in TRACKER_TABLE_VECTORS:
+            return column.reshape(self.max_trackers, 3)
+        return column
+
+
+SHARED_MEMORY_ATTACH_LOCK = Lock()
+
+
+def attach_shared_memory(name):
+    """
+        Attach to an existing shared memory block without letting the
+        resource tracker of this process unlink it on exit.
+
+    Args:
+        name (str): shared memory name
+
+    Returns:
+        SharedMemory
+    """
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name, track=False)
+    if os.name != "posix":
+        return shared_memory.SharedMemory(name)
+    from multiprocessing import resource_tracker
+
+    # before Python 3.13 attaching registers the block, which is then
+    # unlinked when this process exits (bpo-39959). Unregistering it
+    # afterwards would drop the registration of the creator instead when
+    # both share the resource tracker, so the registration is skipped.
+    with SHARED_MEMORY_ATTACH_LOCK:
+        register = resource_tracker.register
+        resource_tracker.register = lambda name, rtype: None
+        try:
+            return shared_memory.SharedMemory(name)
+        finally:
+            resource_tracker.register = register
+
+
+class SharedTrackerTable:
+    """
+    Latest state of all trackers in a shared memory block, one fixed-layout
+    row (SHARED_TABLE_ROW_STRUCT) per tracker id, readable from any process.
+    One process writes, with a sequence lock: the sequence is odd while a
+    packet is being written, readers copy the rows and retry when the
+    sequence was odd or changed meanwhile. Consistent reads need no lock and
+    no message between the processes.
+    """
+
+    def __init__(self, name=None, max_trackers=1024, create=False, read_timeout=1.0):
+        """
+        Args:
+            name (str, optional): shared memory name, a new one is chosen
+                when creating without a name
+            max_trackers (int, optional): number of rows when creating,
+                trackers with higher ids are skipped and counted in
+                overflow_count. Default: 1024
+            create (bool, optional): create the block instead of attaching
+                to an existing one. The creator unlinks it. Default: False
+            read_timeout (float, optional): seconds a read retries while the
+                writer is in the middle of a packet, e.g. because the writer
+                process died, before raising TimeoutError. Default: 1.0
+        """
+        self.created = create
+        self.read_timeout = read_timeout
+        if create:
+            size = (
+                SHARED_TABLE_HEADER_STRUCT.size
+                + SHARED_TABLE_ROW_STRUCT.size * max_trackers
+            )
+            self.memory = shared_memory.SharedMemory(name, create=True, size=size)
+            SHARED_TABLE_HEADER_STRUCT.pack_into(
+                self.memory.buf, 0, SHARED_TABLE_MAGIC, max_trackers, 0, 0, 0, 0
+            )
+        else:
+            self.memory = attach_shared_memory(name)
+            magic, max_trackers = SHARED_TABLE_ATTACH_STRUCT.unpack_from(
+                self.memory.buf
+            )
+            if magic != SHARED_TABLE_MAGIC:
+                self.memory.close()
+                raise ValueError(f"{name} is not a shared tracker table")
+        self.name = self.memory.name
+        self.max_trackers = max_trackers
+        self.buffer = self.memory.buf
+        self.overflow_count = 0
+        self.sequence = SHARED_TABLE_SEQUENCE_STRUCT.unpack_from(
+            self.buffer, SHARED_TABLE_SEQUENCE_OFFSET
+        )[0]
+        self.row_count = SHARED_TABLE_ROW_COUNT_STRUCT.unpack_from(
+            self.buffer, SHARED_TABLE_ROW_COUNT_OFFSET
+        )[0]
+        # rows are packed here first, a failing tracker leaves its row intact
+        self.row = bytearray(SHARED_TABLE_ROW_STRUCT.size)
+
+    def update(self, data_packet: "PsnDataPacket", now=None) -> int:
+        """
+            Write trackers of a parsed data packet, only from one process
+
+        Args:
+            data_packet (PsnDataPacket): parsed data packet
+            now (float, optional): time.monotonic() time of the update
+
+        Returns:
+            number of trackers written
+
+        Raises:
+            struct.error: a tracker value does not fit its row, the trackers
+                before it are written and the sequence is even again
+        """
+        if now is None:
+            now = time.monotonic()
+        buffer = self.buffer
+        pack_sequence = SHARED_TABLE_SEQUENCE_STRUCT.pack_into
+        pack_row = SHARED_TABLE_ROW_STRUCT.pack_into
+        row = self.row
+        row_size = SHARED_TABLE_ROW_STRUCT.size
+        rows_offset = SHARED_TABLE_HEADER_STRUCT.size
+        count = 0
+
+        self.sequence = (self.sequence + 1) & 0xFFFFFFFF
+        pack_sequence(buffer, SHARED_TABLE_SEQUENCE_OFFSET, self.sequence)
+        try:
+            SHARED_TABLE_FRAME_STRUCT.pack_into(
+                buffer,
+                SHARED_TABLE_FRAME_OFFSET,
+                data_packet.info.frame_id,
+                data_packet.info.timestamp,
+            )
+            for tracker in data_packet.trackers:
+                tracker_id = tracker.tracker_id
+                if tracker_id >= self.max_trackers:
+                    self.overflow_count += 1
+                    continue
+                values: List = []
+                present = 0
+                for field, bit in TRACKER_TABLE_BITS.items():
+                    if field == "timestamp":
+                        continue
+                    value = getattr(tracker, field)
+                    if value is not None:
+                        present |= bit
+                    if field in TRACKER_TABLE_VECTORS:
+                        if value is None:
+                            values += (0.0, 0.0, 0.0)
+                        else:
+                            values += (value.x, value.y, value.z)
+                    else:
+                        values.append(0.0 if value is None else value)
+                timestamp = tracker.timestamp
+                if timestamp is not None:
+                    present |= TRACKER_TABLE_BITS["timestamp"]
+                pack_row(row, 0, *values, timestamp or 0, present, now)
+                offset = rows_offset + tracker_id * row_size
+                buffer[offset : offset + row_size] = row
+                count += 1
+                if tracker_id >= self.row_count:
+                    self.row_count = tracker_id + 1
+                    SHARED_TABLE_ROW_COUNT_STRUCT.pack_into(
+                        buffer, SHARED_TABLE_ROW_COUNT_OFFSET, self.row_count
+                    )
+        finally:
+            # an odd sequence left behind would block the readers
+            self.sequence = (self.sequence + 1) & 0xFFFFFFFF
+            pack_sequence(buffer, SHARED_TABLE_SEQUENCE_OFFSET, self.sequence)
+        return count
+
+    def read(self, start=0, end=None) -> bytes:
+        """
+            Copy part of the block, consistent with one written packet
+
+        Args:
+            start (int, optional): start offset. Default: 0
+            end (int, optional): end offset. Default: end of the block
+
+        Returns:
+            bytes copy
+
+        Raises:
+            TimeoutError: no consistent copy within read_timeout seconds
+        """
+        buffer = self.buffer
+        unpack_sequence = SHARED_TABLE_SEQUENCE_STRUCT.unpack_from
+        deadline = None
+        while True:
+            (sequence,) = unpack_sequence(buffer, SHARED_TABLE_SEQUENCE_OFFSET)
+            if not sequence & 1:
+                header = bytes(buffer[: SHARED_TABLE_HEADER_STRUCT.size])
+                data = bytes(buffer[start:end])
+                if unpack_sequence(buffer, SHARED_TABLE_SEQUENCE_OFFSET)[0] == sequence:
+                    return header + data if start else data
+            # the writer is in the middle of a packet
+            now = time.monotonic()
+            if deadline is None:
+                deadline = now + self.read_timeout
+            elif now > deadline:
+                raise TimeoutError(
+                    f"Writer of {self.name} did not finish a packet "
+                    f"in {self.read_timeout} s"
+                )
+            time.sleep(0)
+
+    def get_row_tracker(self, tracker_id, rows, offset) -> "PsnTracker":
+        """
+            Convert a copied row to a tracker
+
+        Args:
+            tracker_id (int): tracker id
+            rows (bytes): copied rows
+            offset (int): start of the row in rows
+
+        Returns:
+            tracker or None when it was never updated
+        """
+        values = SHARED_TABLE_ROW_STRUCT.unpack_from(rows, offset)
+        if not values[18]:
+            return None
+        tracker = PsnTracker(tracker_id)
+        present = values[17]
+        index = 0
+        for field, bit in TRACKER_TABLE_BITS.items():
+            if field == "timestamp":
+                value = values[16]
+            elif field in TRACKER_TABLE_VECTORS:
+                value = PsnVector3(*values[index : index + 3])
+                index += 3
+            else:
+                value = values[index]
+                index += 1
+            if present & bit:
+                setattr(tracker, field, value)
+        return tracker
+
+    def get(self, tracker_id: int) -> "PsnTracker":
+        """
+            Get copy of tracker state
+
+        Args:
+            tracker_id (int): tracker id
+
+        Returns:
+            tracker or None when it was never updated
+        """
+        if tracker_id >= self.max_trackers:
+            return None
+        start = SHARED_TABLE_HEADER_STRUCT.size + tracker_id * (
+            SHARED_TABLE_ROW_STRUCT.size
+        )
+        data = self.read(start, start + SHARED_TABLE_ROW_STRUCT.size)
+        return self.get_row_tracker(tracker_id, data, SHARED_TABLE_HEADER_STRUCT.size)
+
+    def snapshot(self) -> "PsnDataPacket":
+        """
+            Get consistent copy of all trackers updated at least once
+
+        Returns:
+            data packet with the frame id and timestamp of the last packet
+        """
+        # only the rows up to the highest tracker id written are copied
+        row_count = SHARED_TABLE_ROW_COUNT_STRUCT.unpack_from(
+            self.buffer, SHARED_TABLE_ROW_COUNT_OFFSET
+        )[0]
+        while True:
+            data = self.read(
+                0,
+                SHARED_TABLE_HEADER_STRUCT.size
+                + row_count * SHARED_TABLE_ROW_STRUCT.size,
+            )
+            header = SHARED_TABLE_HEADER_STRUCT.unpack_from(data)
+            if header[5] <= row_count:
+                break
+            row_count = header[5]
+        frame_id, packet_timestamp = header[3:5]
+        trackers = []
+        offset = SHARED_TABLE_HEADER_STRUCT.size
+        for tracker_id in range(row_count):
+            tracker = self.get_row_tracker(tracker_id, data, offset)
+            if tracker is not None:
+                trackers.append(tracker)
+            offset += SHARED_TABLE_ROW_STRUCT.size
+        return PsnDataPacket(PsnInfo(packet_timestamp, 2, 0, frame_id, 1), trackers)
+
+    def close(self):
+        """
+        Detach from the block, the creator also unlinks it.
+        """
+        self.buffer = None
+        self.memory.close()
+        if self.created:
+            self.memory.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+class PsnIngestProcess(multiprocessing.Process):
+    """
+    Process receiving PSN and writing the data packets into a
+    SharedTrackerTable, leaving the GIL of the consumer processes free.
+    """
+
+    def __init__(self, table_name, ip_addr="0.0.0.0", mcast_port=56565, timeout=0.5):
+        """
+        Args:
+            table_name (str): name of the SharedTrackerTable to write
+            ip_addr (str, optional): iface ip. Default: "0.0.0.0"
+            mcast_port (int, optional): multicast port. Default: 56565
+            timeout (float, optional): socket timeout, delay of stop.
+                Default: 0.5
+        """
+        multiprocessing.Process.__init__(self, daemon=True)
+        self.table_name = table_name
+        self.ip_addr = ip_addr
+        self.mcast_port = mcast_port
+        self.timeout = timeout
+        self.stopped = multiprocessing.Event()
+
+    def stop(self):
+        """
+        Stop receiving.
+        """
+        self.stopped.set()
+        self.join()
+
+    def run(self):
+        table = SharedTrackerTable(self.table_name)
+
+        def callback(psn_data):
+            if isinstance(psn_data, PsnDataPacket):
+                table.update(psn_data)
+
+        receiver = Receiver(callback, self.ip_addr, self.mcast_port, self.timeout)
+        receiver.start()
+        self.stopped.wait()
+        receiver.stop()
+        table.close()
+
+
+class PsnSource:
+    """
+    State of one PSN server, as seen by a PsnSourceRegistry
+    """
+
+    __slots__ = (
+        "address",
+        "name",
+        "info_packet",
+        "tracker_names",
+        "frame_id",
+        "data_packets",
+        "info_packets",
+        "lost_frames",
+        "missing_frames",
+        "last_time",
+    )
+
+    def __init__(self, address):
+        self.address = address
+        # system name, learned from the info packets
+        self.name: str = None
+        self.info_packet: PsnInfoPacket = None
+        self.tracker_names: Dict[int, str] = {}
+        # frame id of the last data packet
+        self.frame_id: int = None
+        self.data_packets = 0
+        self.info_packets = 0
+        # data frames skipped in the frame id sequence
+        self.lost_frames = 0
+        # skipped frame ids which may still arrive late, out of order
+        self.missing_frames: set = set()
+        # time.monotonic() of the last packet
+        self.last_time: float = None
+
+
+class PsnSourceRegistry:
+    """
+    State of each PSN server sending to a receiver, keyed on the source of
+    the packets: the latest info packet, the system and tracker names and
+    the sequence of the data frames. Subscribers only get the packets of
+    the source they subscribed to.
+    """
+
+    def __init__(self):
+        # source address -> PsnSource
+        self.sources: Dict[object, PsnSource] = {}
+        # (callback, address, name)
+        self.subscriptions: List[tuple] = []
+        self.lock = Lock()
+
+    def update(self, psn_data, now=None):
+        """
+            Update the state of the source of a packet, then pass the packet
+            to the subscribers of the source.
+
+        Args:
+            psn_data (PsnDataPacket or PsnInfoPacket): packet with its source
+            now (float, optional): time.monotonic() of reception
+
+        Returns:
+            PsnSource
+        """
+        with self.lock:
+            source = self.sources.get(psn_data.source)
+            if source is None:
+                source = self.sources[psn_data.source] = PsnSource(psn_data.source)
+            source.last_time = time.monotonic() if now is None else now
+            if isinstance(psn_data, PsnInfoPacket):
+                source.info_packets += 1
+                source.info_packet = psn_data
+                name = psn_data.name
+                if isinstance(name, bytes):
+                    name = name.decode("utf-8", "replace")
+                source.name = name
+                source.tracker_names = psn_data.get_tracker_names()
+            else:
+                source.data_packets += 1
+                frame_id = psn_data.info.frame_id
+                if source.frame_id is None:
+                    source.frame_id = frame_id
+                elif frame_id != source.frame_id:
+                    gap = (frame_id - source.frame_id) & 0xFF
+                    missing = source.missing_frames
+                    if gap < 0x80:
+                        for skipped in range(1, gap):
+                            missing.add((source.frame_id + skipped) & 0xFF)
+                        source.lost_frames += gap - 1
+                        source.frame_id = frame_id
+                        if missing:
+                            # too old to be told apart from the next frames
+                            source.missing_frames = {
+                                skipped
+                                for skipped in missing
+                                if (frame_id - skipped) & 0xFF < 0x80
+                            }
+                    elif frame_id in missing:
+                        # a small step back is a reordered packet, not a loss
+                        missing.discard(frame_id)
+                        source.lost_frames -= 1
+            subscriptions = self.subscriptions
+        for callback, address, name in subscriptions:
+            if (address is None or address == source.address) and (
+                name is None or name == source.name
+            ):
+                callback(psn_data)
+        return source
+
+    def subscribe(self, callback, address=None, name=None):
+        """
+            Pass the packets of one source to callback. Data packets of a
+            source subscribed by name are only passed once its info packet
+            was received.
+
+        Args:
+            callback (callable): called with each packet of the source
+            address (optional): source address, e.g. (ip, port)
+            name (str, optional): system name of the source
+        """
+        with self.lock:
+            self.subscriptions = self.subscriptions + [(callback, address, name)]
+
+    def unsubscribe(self, callback):
+        """
+            Stop passing packets to callback.
+
+        Args:
+            callback (callable): subscribed callback
+        """
+        with self.lock:
+            self.subscriptions = [
+                subscription
+                for subscription in self.subscriptions
+                if subscription[0] != callback
+            ]
+
+    def get(self, address):
+        """
+            Get the state of a source.
+
+        Args:
+            address: source address, e.g. (ip, port)
+
+        Returns:
+            PsnSource or None
+        """
+        return self.sources.get(address)
+
+    def find(self, name):
+        """
+            Get the sources with a system name.
+
+        Args:
+            name (str): system name
+
+        Returns:
+            list of PsnSource
+        """
+        with self.lock:
+            return [source for source in self.sources.values() if source.name == name]
+
+
+class Receiver(Thread):
+    """
+    PSN receiver class
+    """
+
+    def __init__(
+        self,
+        callback,
+        ip_addr="0.0.0.0",
+        mcast_port=56565,
+        timeout=2,
+        lazy=False,
+        assemble_frames=False,
+        frame_timeout=0.05,
+        cache_info=False,
+        tracker_table=None,
+        reuse_trackers=False,
+        ring_size=0,
+        registry=None,
+        tracker_ids=None,
+        fields=None,
+    ):
+        Thread.__init__(self)
+        self.callback = callback
+        # only these trackers and tracker fields are decoded
+        self.tracker_ids = tracker_ids
+        self.fields = fields
+        # packets update the state of their source before the callback
+        self.registry = registry
+        # datagrams are received into reused buffers, bursts with recvmmsg
+        self.ring = PsnReceiveRing(ring_size) if ring_size else None
+        # trackers passed to the callback are only valid until the next
+        # packet from the same source, see PsnTrackerPool
+        self.tracker_pool = PsnTrackerPool() if reuse_trackers else None
+        # data packets are written into the table, which is then passed to
+        # the callback instead of a parsed packet
+        self.tracker_table = tracker_table
+        self.lazy = lazy
+        self.info_cache = PsnInfoCache() if cache_info else None
+        self.assembler = None
+        if assemble_frames:
+            self.assembler = PsnFrameAssembler(frame_timeout)
+            # wake up in time to emit incomplete frames
+            if timeout is None or frame_timeout < timeout:
+                timeout = frame_timeout
+        self.running = True
+        self.timeout = timeout
+        self.socket = self.open_socket(ip_addr, mcast_port)
+        if timeout is not None and self.socket is not None:
+            self.socket.settimeout(timeout)
+
+    def open_socket(self, ip_addr, mcast_port):
+        """
+            Open the listening socket
+
+        Args:
+            ip_addr (str): iface ip
+            mcast_port (int): multicast port
+
+        Returns:
+            socket
+        """
+        return get_socket(ip_addr, mcast_port)
+
+    def stop(self):
+        """
+        Stop listening.
+        """
+        self.running = False
+        if self.socket is not None:
+            self.socket.close()
+        self.join()
+
+    def handle(self, data, address):
+        """
+            Parse received datagram and pass it to the callback
+
+        Args:
+            data (bytes): Received PSN data
+            address (tuple): sender address
+        """
+        if self.tracker_table is not None:
+            if self.tracker_table.update_from_buffer(
+                data, tracker_ids=self.tracker_ids, fields=self.fields
+            ):
+                self.callback(self.tracker_table)
+                return
+            # a data packet without any tracker of interest
+            if data[:2] == PSN_DATA_PACKET_ID:
+                return
+        psn_data = parse_psn_packet(
+            data,
+            lazy=self.lazy,
+            info_cache=self.info_cache,
+            tracker_pool=self.tracker_pool,
+            source=address,
+            tracker_ids=self.tracker_ids,
+            fields=self.fields,
+        )
+        if self.assembler is None:
+            self.dispatch(psn_data)
+        else:
+            frame = self.assembler.add(psn_data, address)
+            if frame is not None:
+                self.dispatch(frame)
+
+    def dispatch(self, psn_data):
+        """
+            Update the registry and pass a parsed packet to the callback
+
+        Args:
+            psn_data: parsed packet
+        """
+        if self.registry is not None and psn_data is not None:
+            self.registry.update(psn_data)
+        self.callback(psn_data)
+
+    def run(self):
+        """
+        Start listnening.
+        """
+        if self.socket is None:
+            return
+        while self.running:
+            try:
+                if self.ring is None:
+                    received = [self.socket.recvfrom(1500)]
+                else:
+                    received = self.ring.receive(self.socket)
+            except socket.timeout:
+                pass
+            except Exception as e:
+                print("Network data error:", e)
+            else:
+                for data, address in received:
+                    self.handle(data, address)
+            if self.assembler is not None:
+                for frame in self.assembler.expire():
+                    self.dispatch(frame)
+
+
+class PsnPacketQueue:
+    """
+        Bounded queue between the threads of the PipelinedReceiver.
+        With PsnOverflowPolicy.LATEST, data packets of a source still queued
+        are merged, keeping the latest state of each tracker, and other
+        items are dropped oldest first.
+
+    Args:
+        maxsize (int, optional): max number of queued items. Default: 64
+        overflow (PsnOverflowPolicy, optional): what to do with an item when
+            the queue is full. Default: PsnOverflowPolicy.DROP_OLDEST
+    """
+
+    def __init__(self, maxsize=64, overflow=PsnOverflowPolicy.DROP_OLDEST):
+        self.maxsize = maxsize
+        self.overflow = overflow
+        # (item, source), item None for the merged data of source in latest
+        self.items: deque = deque()
+        # source: [packet header, {tracker id: tracker}]
+        self.latest: Dict[object, list] = {}
+        self.condition = Condition()
+        self.closed = False
+        self.dropped = 0
+        self.coalesced = 0
+
+    def put(self, item, source=None):
+        """
+            Queue an item.
+
+        Args:
+            item: raw datagram or parsed packet
+            source (optional): sender address, merging key of data packets
+        """
+        with self.condition:
+            if self.overflow == PsnOverflowPolicy.LATEST and isinstance(
+                item, PsnDataPacket
+            ):
+                latest = self.latest.get(source)
+                if latest is not None:
+                    latest[0] = item.info
+                    trackers = latest[1]
+                    for tracker in item.trackers:
+                        if tracker.tracker_id in trackers:
+                            self.coalesced += 1
+                        trackers[tracker.tracker_id] = tracker
+                    return
+                self.latest[source] = [
+                    item.info,
+                    {tracker.tracker_id: tracker for tracker in item.trackers},
+                ]
+                item = None
+            if self.overflow == PsnOverflowPolicy.BLOCK:
+                while len(self.items) >= self.maxsize and not self.closed:
+                    self.condition.wait()
+            elif len(self.items) >= self.maxsize:
+                self.dropped += 1
+                if self.overflow == PsnOverflowPolicy.DROP_NEWEST:
+                    return
+                self._pop()
+            self.items.append((item, source))
+            self.condition.notify_all()
+
+    def _pop(self):
+        """
+            Remove the oldest item, the condition must be held.
+
+        Returns:
+            item, merged data packet for a source in latest
+        """
+        item, source = self.items.popleft()
+        if item is None:
+            info, trackers = self.latest.pop(source)
+            item = PsnDataPacket(info, list(trackers.values()), source)
+        return item
+
+    def get(self):
+        """
+            Wait for the next item.
+
+        Returns:
+            item, None once the queue is closed and empty
+        """
+        with self.condition:
+            while not self.items and not self.closed:
+                self.condition.wait()
+            if not self.items:
+                return None
+            item = self._pop()
+            self.condition.notify_all()
+            return item
+
+    def close(self):
+        """
+        Wake up the waiting threads, get returns None once empty.
+        """
+        with self.condition:
+            self.closed = True
+            self.condition.notify_all()
+
+    def __len__(self):
+        return len(self.items)
+
+
+class PipelinedReceiver(Receiver):
+    """
+        PSN receiver draining the socket, parsing and calling the callback
+        on three threads, linked by bounded queues. A slow callback does not
+        stall the socket: by default, only the latest state of each tracker
+        of a source is kept while the callback is busy.
+
+    Args:
+        callback (callable): called with each parsed packet
+        ip_addr (str, optional): iface ip. Default: "0.0.0.0"
+        mcast_port (int, optional): multicast port. Default: 56565
+        timeout (float, optional): socket timeout. Default: 2
+        maxsize (int, optional): max number of items in each queue.
+            Default: 64
+        overflow (PsnOverflowPolicy, optional): policy of the queue of
+            parsed packets. Default: PsnOverflowPolicy.LATEST
+        raw_overflow (PsnOverflowPolicy, optional): policy of the queue of
+            received datagrams, LATEST is not possible before parsing.
+            Default: PsnOverflowPolicy.DROP_OLDEST
+        cache_info (bool, optional): do not decode unchanged info packets
+            again. Default: False
+        ring_size (int, optional): receive bursts into reused buffers,
+            see PsnReceiveRing. Default: 0
+        registry (PsnSourceRegistry, optional): state of each source,
+            updated before the callback. Default: None
+        tracker_ids (set, optional): only parse these trackers. Default: None
+        fields (set, optional): only decode these tracker fields.
+            Default: None
+    """
+
+    def __init__(
+        self,
+        callback,
+        ip_addr="0.0.0.0",
+        mcast_port=56565,
+        timeout=2,
+        maxsize=64,
+        overflow=PsnOverflowPolicy.LATEST,
+        raw_overflow=PsnOverflowPolicy.DROP_OLDEST,
+        cache_info=False,
+        ring_size=0,
+        registry=None,
+        tracker_ids=None,
+        fields=None,
+    ):
+        if raw_overflow == PsnOverflowPolicy.LATEST:
+            raise ValueError("Received datagrams can not be merged before parsing")
+        Receiver.__init__(
+            self,
+            callback,
+            ip_addr,
+            mcast_port,
+            timeout,
+            cache_info=cache_info,
+            ring_size=ring_size,
+            registry=registry,
+            tracker_ids=tracker_ids,
+            fields=fields,
+        )
+        self.raw_queue = PsnPacketQueue(maxsize, raw_overflow)
+        self.packet_queue = PsnPacketQueue(maxsize, overflow)
+        self.parse_thread = Thread(target=self.parse_datagrams)
+        self.dispatch_thread = Thread(target=self.dispatch_packets)
+
+    def start(self):
+        """
+        Start the receiving, parsing and dispatching threads.
+        """
+        self.parse_thread.start()
+        self.dispatch_thread.start()
+        Receiver.start(self)
+
+    def stop(self):
+        """
+        Stop listening, the queued packets are still dispatched.
+        """
+        Receiver.stop(self)
+        self.raw_queue.close()
+        self.parse_thread.join()
+        self.packet_queue.close()
+        self.dispatch_thread.join()
+
+    def handle(self, data, address):
+        """
+            Queue received datagram for the parsing thread
+
+        Args:
+            data (bytes): Received PSN data
+            address (tuple): sender address
+        """
+        if type(data) is not bytes:
+            # the buffers of the ring are reused for the next burst
+            data = bytes(data)
+        self.raw_queue.put((data, address))
+
+    def parse_datagrams(self):
+        while True:
+            item = self.raw_queue.get()
+            if item is None:
+                return
+            data, address = item
+            try:
+                psn_data = parse_psn_packet(
+                    data,
+                    info_cache=self.info_cache,
+                    source=address,
+                    tracker_ids=self.tracker_ids,
+                    fields=self.fields,
+                )
+            except Exception as e:
+                print("PSN parsing error:", e)
+                continue
+            if psn_data is not None:
+                self.packet_queue.put(psn_data, address)
+
+    def dispatch_packets(self):
+        while True:
+            psn_data = self.packet_queue.get()
+            if psn_data is None:
+                return
+            self.dispatch(psn_data)
+
+
+class PsnSocketStats:
+    """
+    Counters of one socket of a MultiReceiver
+    """
+
+    __slots__ = ("ip_addr", "mcast_port", "packets", "bytes", "errors", "last_time")
+
+    def __init__(self, ip_addr: str, mcast_port: int):
+        self.ip_addr = ip_addr
+        self.mcast_port = mcast_port
+        self.packets = 0
+        self.bytes = 0
+        self.errors = 0
+        # time.monotonic() of the last received packet
+        self.last_time = None
+
+
+class MultiReceiver(Receiver):
+    """
+        PSN receiver listening on several interfaces and ports, serving all
+        the sockets from one thread with a selectors loop. Packets are passed
+        to the callback in the order they are read, counted per socket in
+        stats.
+
+    Args:
+        callback (callable): called with each parsed packet
+        interfaces (list, optional): iface ips, or (iface ip, port), the
+            same interface given twice is only opened once.
+            Default: ["0.0.0.0"]
+        mcast_port (int, optional): port of the ifaces given without one.
+            Default: 56565
+        timeout (float, optional): select timeout. Default: 2
+
+        The other arguments are the ones of Receiver.
+    """
+
+    def __init__(
+        self,
+        callback,
+        interfaces=("0.0.0.0",),
+        mcast_port=56565,
+        timeout=2,
+        lazy=False,
+        assemble_frames=False,
+        frame_timeout=0.05,
+        cache_info=False,
+        tracker_table=None,
+        reuse_trackers=False,
+        ring_size=0,
+        registry=None,
+        tracker_ids=None,
+        fields=None,
+    ):
+        self.interfaces = list(
+            dict.fromkeys(
+                (interface, mcast_port) if isinstance(interface, str) else interface
+                for interface in interfaces
+            )
+        )
+        self.selector = selectors.DefaultSelector()
+        self.stats: Dict[tuple, PsnSocketStats] = {}
+        Receiver.__init__(
+            self,
+            callback,
+            None,
+            mcast_port,
+            timeout,
+            lazy=lazy,
+            assemble_frames=assemble_frames,
+            frame_timeout=frame_timeout,
+            cache_info=cache_info,
+            tracker_table=tracker_table,
+            reuse_trackers=reuse_trackers,
+            ring_size=ring_size,
+            registry=registry,
+            tracker_ids=tracker_ids,
+            fields=fields,
+        )
+
+    def open_socket(self, ip_addr, mcast_port):
+        """
+            Open and register the sockets of all interfaces.
+
+        Returns:
+            None, the sockets are in the selector
+
+        Raises:
+            OSError: an interface can not be opened, the sockets opened
+                before are closed again
+        """
+        try:
+            for interface in self.interfaces:
+                sock = get_socket(*interface)
+                if sock is None:
+                    raise OSError(f"Can not listen for PSN on {interface}")
+                stats = self.stats[interface] = PsnSocketStats(*interface)
+                self.selector.register(sock, selectors.EVENT_READ, stats)
+                if sys.platform.startswith("linux"):
+                    # only receive the groups joined by this socket, not the
+                    # ones joined on the other interfaces (IP_MULTICAST_ALL)
+                    sock.setsockopt(
+                        socket.IPPROTO_IP, getattr(socket, "IP_MULTICAST_ALL", 49), 0
+                    )
+                sock.setblocking(False)
+        except BaseException:
+            self.close_sockets()
+            raise
+        return None
+
+    def close_sockets(self):
+        """
+        Unregister and close all sockets, then the selector.
+        """
+        for key in list(self.selector.get_map().values()):
+            self.selector.unregister(key.fileobj)
+            key.fileobj.close()
+        self.selector.close()
+
+    def stop(self):
+        """
+        Stop listening.
+        """
+        self.running = False
+        self.join()
+        self.close_sockets()
+
+    def run(self):
+        """
+        Start listnening.
+        """
+        while self.running:
+            for key, _ in self.selector.select(self.timeout):
+                stats = key.data
+                try:
+                    if self.ring is None:
+                        received = [key.fileobj.recvfrom(1500)]
+                    else:
+                        received = self.ring.receive(key.fileobj)
+                except BlockingIOError:
+                    continue
+                except Exception as e:
+                    stats.errors += 1
+                    print("Network data error:", e)
+                    continue
+                stats.last_time = time.monotonic()
+                for data, address in received:
+                    stats.packets += 1
+                    stats.bytes += len(data)
+                    self.handle(data, address)
+            if self.assembler is not None:
+                for frame in self.assembler.expire():
+                    self.dispatch(frame)
+
+
+class AsyncReceiver(asyncio.DatagramProtocol):
+    """
+        PSN receiver for asyncio, parsed packets are iterated with
+        async for packet in receiver. At most maxsize packets are queued,
+        further packets are dropped according to the overflow policy.
+
+    Args:
+        ip_addr (str, optional): iface ip. Default: "0.0.0.0"
+        mcast_port (int, optional): multicast port. Default: 56565
+        lazy (bool, optional): decode trackers on first access.
+            Default: False
+        cache_info (bool, optional): do not decode unchanged info packets
+            again. Default: False
+        maxsize (int, optional): max number of queued packets. Default: 64
+        overflow (PsnOverflowPolicy, optional): which packet is dropped
+            when the queue is full. Default: PsnOverflowPolicy.DROP_OLDEST
+        tracker_ids (set, optional): only parse these trackers. Default: None
+        fields (set, optional): only decode these tracker fields.
+            Default: None
+    """
+
+    def __init__(
+        self,
+        ip_addr="0.0.0.0",
+        mcast_port=56565,
+        lazy=False,
+        cache_info=False,
+        maxsize=64,
+        overflow=PsnOverflowPolicy.DROP_OLDEST,
+        tracker_ids=None,
+        fields=None,
+    ):
+        if overflow not in (
+            PsnOverflowPolicy.DROP_OLDEST,
+            PsnOverflowPolicy.DROP_NEWEST,
+        ):
+            raise ValueError(f"Overflow policy {overflow!r} is not supported")
+        self.ip_addr = ip_addr
+        self.mcast_port = mcast_port
+        self.lazy = lazy
+        self.info_cache = PsnInfoCache() if cache_info else None
+        self.tracker_ids = tracker_ids
+        self.fields = fields
+        self.maxsize = maxsize
+        self.overflow = overflow
+        self.transport = None
+        self.queue: asyncio.Queue = None
+        self.dropped_packets = 0
+
+    async def start(self, sock=None):
+        """
+            Start listening in the running event loop.
+
+        Args:
+            sock (socket, optional): bound udp socket, used instead of
+                joining multicast with get_socket
+        """
+        if sock is None:
+            sock = get_socket(self.ip_addr, self.mcast_port)
+            if sock is None:
+                raise OSError(f"Can not listen for PSN on {self.ip_addr}")
+        sock.setblocking(False)
+        self.queue = asyncio.Queue(self.maxsize + 1)
+        loop = asyncio.get_running_loop()
+        await loop.create_datagram_endpoint(lambda: self, sock=sock)
+
+    def stop(self):
+        """
+        Stop listening, ends the iteration.
+        """
+        if self.transport is not None:
+            self.transport.close()
+
+    def put(self, item):
+        """
+            Queue a parsed packet, or None to end the iteration.
+
+        Args:
+            item: parsed packet
+        """
+        # one slot is kept free to always be able to queue the end
+        if self.queue.qsize() >= self.maxsize and item is not None:
+            self.dropped_packets += 1
+            if self.overflow == PsnOverflowPolicy.DROP_NEWEST:
+                return
+            self.queue.get_nowait()
+        self.queue.put_nowait(item)
+
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def datagram_received(self, data, addr):
+        psn_data = parse_psn_packet(
+            data,
+            lazy=self.lazy,
+            info_cache=self.info_cache,
+            source=addr,
+            tracker_ids=self.tracker_ids,
+            fields=self.fields,
+        )
+        if psn_data is not None:
+            self.put(psn_data)
+
+    def error_received(self, exc):
+        print("Network data error:", exc)
+
+    def connection_lost(self, exc):
+        self.transport = None
+        self.put(None)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        psn_data = await self.queue.get()
+        if psn_data is None:
+            raise StopAsyncIteration
+        return psn_data
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+
+def get_socket(ip_addr, mcast_port):
+    """
+        Listening for incomming psn packets
+
+    Args:
+        ip_addr (str): iface ip
+        mcast_port (str): multicast port
+
+    Returns:
+        socket
+    """
+    mcast_grp = "236.10.10.10"
+    sock = None
+    if determine_os() == "nt":
+        sock = join_multicast_windows(mcast_grp, mcast_port, ip_addr)
+    elif determine_os() == "posix":
+        sock = join_multicast_posix(mcast_grp, mcast_port, ip_addr)
+
+    if sock is None:
+        print("error getting network interface")
+        return
+    return sock
+
+
+def parse_psn_packet(
+    buffer,
+    zero_copy=True,
+    lazy=False,
+    info_cache=None,
+    tracker_pool=None,
+    source=None,
+    tracker_ids=None,
+    fields=None,
+):
+    """
+        Parse received data buffer
+
+    Args:
+        buffer (bytes): Received PSN data
+        zero_copy (bool, optional): walk the buffer by offset through a single
+            memoryview instead of slicing out every chunk. Default: True
+        lazy (bool, optional): return data packets as PsnLazyDataPacket, which
+            only indexes the trackers and decodes each one on first access.
+            Mutable buffers are copied, as the packet keeps referencing
+            them. Default: False
+        info_cache (PsnInfoCache, optional): reuse info packets whose content
+            did not change. Default: None
+        tracker_pool (PsnTrackerPool, optional): overwrite the trackers of the
+            previous data packet from the same source instead of creating new
+            ones. Not used for lazy packets. Default: None
+        source (optional): sender of the packet, e.g. its address, set as
+            the source of the packet and used by tracker_pool. Default: None
+        tracker_ids (set, optional): only parse the trackers with these ids,
+            the others are skipped without decoding them. Default: None
+        fields (set, optional): only decode these PsnTracker fields, e.g.
+            {"pos"}. Not used by lazy packets. Default: None
+
+    Returns:
+        psn packet
+    """
+    psn_data = None
+    if lazy:
+        if not isinstance(buffer, bytes):
+            buffer = bytes(buffer)
+        view = memoryview(buffer)
+        chunk_id, start, end = parse_chunk_from(view, 0, len(view))
+        if chunk_id == PsnV2Chunck.PSN_DATA_PACKET:
+            psn_data = parse_lazy_data_from(view, start, end, tracker_ids)
+        zero_copy = True
+    elif tracker_ids is not None or fields is not None:
+        zero_copy = True
+
+    if psn_data is not None:
+        pass
+    elif zero_copy:
+        view = memoryview(buffer)
+        chunk_id, start, end = parse_chunk_from(view, 0, len(view))
+        if info_cache is not None and chunk_id == PsnV2Chunck.PSN_INFO_PACKET:
+            psn_data = info_cache.parse_from(view, start, end)
+        elif chunk_id == PsnV2Chunck.PSN_DATA_PACKET and (
+            tracker_pool is not None or tracker_ids is not None or fields is not None
+        ):
+            parse_tracker = None
+            if tracker_pool is not None:
+                parse_tracker = tracker_pool.get_parse_tracker(source, fields)
+            elif fields is not None:
+                parse_tracker = get_parse_tracker_fields(fields)
+            psn_data = parse_data_from(view, start, end, parse_tracker, tracker_ids)
+        else:
+            parse_from = PSN_PACKET_PARSERS_FROM.get(chunk_id)
+            if parse_from is not None:
+                psn_data = parse_from(view, start, end)
+    else:
+        chunk_id, chunk_buffer, _ = parse_chunk(buffer)
+        # PSN V1 not supported by this parser
+        parse = PSN_PACKET_PARSERS.get(chunk_id)
+        if parse is not None:
+            psn_data = parse(chunk_buffer)
+
+    if psn_data is not None:
+        psn_data.source = source
+    return psn_data
+
+
+def parse_chunk(buffer):
+    """
+        Parse received psn chunk
+
+    Args:
+        buffer (bytes): Received PSN data
+
+    Returns:
+        chunk_id, data, and rest
+    """
+    chunk_id, data_field = CHUNK_HEADER_STRUCT.unpack_from(buffer)
+    data_len = data_field & 0x7FFF
+    data = buffer[4 : 4 + data_len]
+    rest = None
+
+    if data_len + 8 < len(buffer):
+        rest = buffer[data_len + 4 :]
+    return chunk_id, data, rest
+
+
+def parse_info(buffer):
+    """
+        Parse received info buffer
+
+    Args:
+        buffer (bytes): Received PSN data
+
+    Returns:
+        psn packet
+    """
+    info = None
+    system_name = None
+    trackers = None
+
+    while buffer:
+        chunk_id, chunk_buffer, buffer = parse_chunk(buffer)
+        if (
+            chunk_id == PsnInfoChunk.PSN_INFO_PACKET_HEADER
+            and len(chunk_buffer) >= PACKET_HEADER_STRUCT.size
+        ):
+            info = parse_header(chunk_buffer[:12])
+        elif chunk_id == PsnInfoChunk.PSN_INFO_SYSTEM_NAME:
+            system_name = parse_system_name(chunk_buffer)
+        elif chunk_id == PsnInfoChunk.PSN_INFO_TRACKER_LIST:
+            trackers = parse_info_tracker_list(chunk_buffer)
+
+    if info and system_name and trackers:
+        packet = PsnInfoPacket(info, system_name, trackers)
+        return packet
+    else:
+        return None
+
+
+def parse_data(buffer):
+    """
+        Parse received data buffer
+
+    Args:
+        buffer (bytes): Received PSN data
+
+    Returns:
+        psn packet
+    """
+    info = None
+    trackers = None
+
+    while buffer:
+        chunk_id, chunk_buffer, buffer = parse_chunk(buffer)
+        if (
+            chunk_id == PsnDataChunk.PSN_DATA_PACKET_HEADER
+            and len(chunk_buffer) >= PACKET_HEADER_STRUCT.size
+        ):
+            info = parse_header(chunk_buffer[:12])
+        elif chunk_id == PsnDataChunk.PSN_DATA_TRACKER_LIST:
+            trackers = parse_data_tracker_list(chunk_buffer)
+
+    if info and trackers:
+        packet = PsnDataPacket(info, trackers)
+        return packet
+    else:
+        return None
+
+
+def parse_header(buffer):
+    """
+        Parse received header buffer
+
+    Args:
+        buffer (bytes): Received PSN data
+
+    Returns:
+        infos header
+    """
+    (timestamp, version_high, version_low, frame_id, packet_count) = (
+        PACKET_HEADER_STRUCT.unpack_from(buffer)
+    )
+
+    info = PsnInfo(timestamp, version_high, version_low, frame_id, packet_count)
+
+    return info
+
+
+def parse_system_name(buffer):
+    """
+        Parse received system name buffer
+
+    Args:
+        buffer (bytes): Received PSN data
+
+    Returns:
+        system name
+    """
+    # TODO: may cause unicode issues?
+    system_name = buffer
+    return system_name
+
+
+def parse_info_tracker_list(buffer):
+    """
+        Parse received tracker infos buffer
+
+    Args:
+        buffer (bytes): Received PSN data
+
+    Returns:
+        trackers infos
+    """
+    trackers: List["PsnTrackerInfo"] = []
+    while buffer:
+        tracker_id, chunk_buffer, buffer = parse_chunk(buffer)
+
+        if len(chunk_buffer) > 0:
+            while chunk_buffer:
+                chunk_id, info_buffer, chunk_buffer = parse_chunk(chunk_buffer)
+                if chunk_id == PasnTrackerListChunk.PSN_INFO_TRACKER_NAME:
+                    # TODO: encoding issues?
+                    tracker_name = info_buffer
+                    tracker = PsnTrackerInfo(tracker_id, tracker_name)
+                    trackers.append(tracker)
+    return trackers
+
+
+def parse_data_tracker_list(buffer):
+    """
+        Parse received trackers data buffer
+
+    Args:
+        buffer (bytes): Received PSN data
+
+    Returns:
+        trackers data
+    """
+    trackers: List["PsnTracker"] = []
+    while buffer:
+        tracker_id, chunk_buffer, buffer = parse_chunk(buffer)
+
+        tracker = PsnTracker(tracker_id)
+
+        if len(chunk_buffer) > 0:
+            while chunk_buffer:
+                chunk_id, data_buffer, chunk_buffer = parse_chunk(chunk_buffer)
+                decoder = TRACKER_CHUNK_DECODERS.get(chunk_id)
+                if decoder is not None and len(data_buffer) >= decoder[3]:
+                    field, unpack_field, factory, _ = decoder
+                    values = unpack_field(data_buffer)
+                    setattr(tracker, field, factory(*values) if factory else values[0])
+        trackers.append(tracker)
+    return trackers
+
+
+def parse_chunk_from(buffer, offset, end):
+    """
+        Parse psn chunk header in place
+
+    Args:
+        buffer (memoryview): Received PSN data
+        offset (int): position of the chunk header
+        end (int): end of the enclosing chunk
+
+    Returns:
+        chunk_id, data start and data end offsets
+    """
+    chunk_id, data_field = CHUNK_HEADER_STRUCT.unpack_from(buffer, offset)
+    start = offset + 4
+    return chunk_id, start, min(start + (data_field & 0x7FFF), end)
+
+
+def parse_info_from(buffer, offset, end):
+    """
+        Parse received info chunk in place
+
+    Args:
+        buffer (memoryview): Received PSN data
+        offset (int): start of the info chunk data
+        end (int): end of the info chunk data
+
+    Returns:
+        psn packet
+    """
+    info = None
+    system_name = None
+    trackers = None
+
+    while offset + 4 <= end:
+        chunk_id, start, offset = parse_chunk_from(buffer, offset, end)
+        if (
+            chunk_id == PsnInfoChunk.PSN_INFO_PACKET_HEADER
+            and offset - start >= PACKET_HEADER_STRUCT.size
+        ):
+            info = parse_header_from(buffer, start)
+        elif chunk_id == PsnInfoChunk.PSN_INFO_SYSTEM_NAME:
+            system_name = bytes(buffer[start:offset])
+        elif chunk_id == PsnInfoChunk.PSN_INFO_TRACKER_LIST:
+            trackers = parse_info_tracker_list_from(buffer, start, offset)
+
+    if info and system_name and trackers:
+        packet = PsnInfoPacket(info, system_name, trackers)
+        return packet
+    else:
+        return None
+
+
+def parse_data_from(buffer, offset, end, parse_tracker=None, tracker_ids=None):
+    """
+        Parse received data chunk in place
+
+    Args:
+        buffer (memoryview): Received PSN data
+        offset (int): start of the data chunk data
+        end (int): end of the data chunk data
+        parse_tracker (callable, optional): replaces parse_data_tracker_from
+        tracker_ids (set, optional): only parse these trackers
+
+    Returns:
+        psn packet
+    """
+    info = None
+    trackers = None
+
+    while offset + 4 <= end:
+        chunk_id, start, offset = parse_chunk_from(buffer, offset, end)
+        if (
+            chunk_id == PsnDataChunk.PSN_DATA_PACKET_HEADER
+            and offset - start >= PACKET_HEADER_STRUCT.size
+        ):
+            info = parse_header_from(buffer, start)
+        elif chunk_id == PsnDataChunk.PSN_DATA_TRACKER_LIST:
+            trackers = parse_data_tracker_list_from(
+                buffer, start, offset, parse_tracker, tracker_ids
+            )
+
+    # a filtered packet may have no tracker of interest
+    if info and trackers is not None and (trackers or tracker_ids is not None):
+        packet = PsnDataPacket(info, trackers)
+        return packet
+    else:
+        return None
+
+
+def parse_header_from(buffer, offset):
+    """
+        Parse received header in place
+
+    Args:
+        buffer (memoryview): Received PSN data
+        offset (int): start of the header data
+
+    Returns:
+        infos header
+    """
+    (timestamp, version_high, version_low, frame_id, packet_count) = (
+        PACKET_HEADER_STRUCT.unpack_from(buffer, offset)
+    )
+
+    return PsnInfo(timestamp, version_high, version_low, frame_id, packet_count)
+
+
+def parse_info_tracker_list_from(buffer, offset, end):
+    """
+        Parse received tracker infos in place
+
+    Args:
+        buffer (memoryview): Received PSN data
+        offset (int): start of the tracker list data
+        end (int): end of the tracker list data
+
+    Returns:
+        trackers infos
+    """
+    trackers: List["PsnTrackerInfo"] = []
+    while offset + 4 <= end:
+        tracker_id, chunk_offset, offset = parse_chunk_from(buffer, offset, end)
+
+        while chunk_offset + 4 <= offset:
+            chunk_id, start, chunk_offset = parse_chunk_from(
+                buffer, chunk_offset, offset
+            )
+            if chunk_id == PasnTrackerListChunk.PSN_INFO_TRACKER_NAME:
+                tracker_name = bytes(buffer[start:chunk_offset])
+                trackers.append(PsnTrackerInfo(tracker_id, tracker_name))
+    return trackers
+
+
+def parse_lazy_data_from(buffer, offset, end, tracker_ids=None):
+    """
+        Index received data chunk in place, without decoding the trackers
+
+    Args:
+        buffer (memoryview): Received PSN data
+        offset (int): start of the data chunk data
+        end (int): end of the data chunk data
+        tracker_ids (set, optional): only index these trackers
+
+    Returns:
+        lazy psn packet
+    """
+    info = None
+    trackers = None
+
+    while offset + 4 <= end:
+        chunk_id, start, offset = parse_chunk_from(buffer, offset, end)
+        if (
+            chunk_id == PsnDataChunk.PSN_DATA_PACKET_HEADER
+            and offset - start >= PACKET_HEADER_STRUCT.size
+        ):
+            info = parse_header_from(buffer, start)
+        elif chunk_id == PsnDataChunk.PSN_DATA_TRACKER_LIST:
+            trackers = index_data_tracker_list_from(buffer, start, offset, tracker_ids)
+
+    if info and trackers is not None and (trackers or tracker_ids is not None):
+        packet = PsnLazyDataPacket(info, PsnLazyTrackerList(buffer, trackers))
+        return packet
+    else:
+        return None
+
+
+def index_data_tracker_list_from(buffer, offset, end, tracker_ids=None):
+    """
+        Index received trackers data in place
+
+    Args:
+        buffer (memoryview): Received PSN data
+        offset (int): start of the tracker list data
+        end (int): end of the tracker list data
+        tracker_ids (set, optional): only index these trackers
+
+    Returns:
+        tracker id, data start and data end offsets of each tracker
+    """
+    offsets = []
+    unpack_chunk_header = CHUNK_HEADER_STRUCT.unpack_from
+    while offset + 4 <= end:
+        tracker_id, data_field = unpack_chunk_header(buffer, offset)
+        start = offset + 4
+        offset = min(start + (data_field & 0x7FFF), end)
+        if tracker_ids is None or tracker_id in tracker_ids:
+            offsets.append((tracker_id, start, offset))
+    return offsets
+
+
+def parse_data_tracker_from(buffer, tracker_id, offset, end):
+    """
+        Parse received tracker data in place
+
+    Args:
+        buffer (memoryview): Received PSN data
+        tracker_id (int): tracker id
+        offset (int): start of the tracker data
+        end (int): end of the tracker data
+
+    Returns:
+        tracker data
+    """
+    if end - offset == TRACKER_STRUCT.size:
+        values = TRACKER_STRUCT.unpack_from(buffer, offset)
+        headers = TRACKER_STRUCT_HEADERS(values)
+        if headers == TRACKER_STRUCT_LAYOUT_FLAGGED or headers == TRACKER_STRUCT_LAYOUT:
+            return PsnTracker(
+                tracker_id,
+                pos=PsnVector3(values[2], values[3], values[4]),
+                speed=PsnVector3(values[7], values[8], values[9]),
+                ori=PsnVector3(values[12], values[13], values[14]),
+                status=values[17],
+                accel=PsnVector3(values[20], values[21], values[22]),
+                trgtpos=PsnVector3(values[25], values[26], values[27]),
+                timestamp=values[30],
+            )
+
+    tracker = PsnTracker(tracker_id)
+    unpack_chunk_header = CHUNK_HEADER_STRUCT.unpack_from
+    get_decoder = TRACKER_CHUNK_DECODERS.get
+    while offset + 4 <= end:
+        chunk_id, data_field = unpack_chunk_header(buffer, offset)
+        start = offset + 4
+        offset = start + (data_field & 0x7FFF)
+        decoder = get_decoder(chunk_id)
+        # field chunks too short for their struct are skipped
+        if decoder is not None and start + decoder[3] <= min(offset, end):
+            field, unpack_field, factory, _ = decoder
+            values = unpack_field(buffer, start)
+            setattr(tracker, field, factory(*values) if factory else values[0])
+    return tracker
+
+
+def parse_data_tracker_list_from(
+    buffer, offset, end, parse_tracker=None, tracker_ids=None
+):
+    """
+        Parse received trackers data in place. Trackers not in tracker_ids
+        are skipped by their length, without decoding them.
+
+    Args:
+        buffer (memoryview): Received PSN data
+        offset (int): start of the tracker list data
+        end (int): end of the tracker list data
+        parse_tracker (callable, optional): replaces parse_data_tracker_from
+        tracker_ids (set, optional): only parse these trackers
+
+    Returns:
+        trackers data
+    """
+    if parse_tracker is None:
+        parse_tracker = parse_data_tracker_from
+    trackers: List["PsnTracker"] = []
+    unpack_chunk_header = CHUNK_HEADER_STRUCT.unpack_from
+    while offset + 4 <= end:
+        tracker_id, data_field = unpack_chunk_header(buffer, offset)
+        start = offset + 4
+        offset = min(start + (data_field & 0x7FFF), end)
+        if tracker_ids is None or tracker_id in tracker_ids:
+            trackers.append(parse_tracker(buffer, tracker_id, start, offset))
+    return trackers
+
+
+# frozenset of PsnTracker fields -> tracker parser only decoding them
+TRACKER_FIELD_PARSERS: Dict[frozenset, Callable] = {}
+# frozenset of PsnTracker fields -> TRACKER_CHUNK_DECODERS of these fields
+TRACKER_FIELD_DECODERS: Dict[frozenset, dict] = {}
+
+
+def get_tracker_decoders(fields):
+    """
+        Get the tracker chunk decoders of some fields
+
+    Args:
+        fields (set): PsnTracker fields, e.g. {"pos", "timestamp"}
+
+    Returns:
+        dict like TRACKER_CHUNK_DECODERS
+    """
+    key = frozenset(fields)
+    decoders = TRACKER_FIELD_DECODERS.get(key)
+    if decoders is None:
+        decoders = TRACKER_FIELD_DECODERS[key] = {
+            chunk_id: decoder
+            for chunk_id, decoder in TRACKER_CHUNK_DECODERS.items()
+            if decoder[0] in key
+        }
+    return decoders
+
+
+def get_parse_tracker_fields(fields):
+    """
+        Get tracker parser only decoding some fields, the other field chunks
+        are skipped by their length.
+
+    Args:
+        fields (set): PsnTracker fields, e.g. {"pos", "timestamp"}
+
+    Returns:
+        callable(buffer, tracker_id, offset, end)
+    """
+    key = frozenset(fields)
+    parse_tracker = TRACKER_FIELD_PARSERS.get(key)
+    if parse_tracker is not None:
+        return parse_tracker
+    get_decoder = get_tracker_decoders(key).get
+    unpack_chunk_header = CHUNK_HEADER_STRUCT.unpack_from
+
+    def parse_tracker(buffer, tracker_id, offset, end):
+        tracker = PsnTracker(tracker_id)
+        while offset + 4 <= end:
+            chunk_id, data_field = unpack_chunk_header(buffer, offset)
+            start = offset + 4
+            offset = start + (data_field & 0x7FFF)
+            decoder = get_decoder(chunk_id)
+            if decoder is not None and start + decoder[3] <= min(offset, end):
+                field, unpack_field, factory, _ = decoder
+                values = unpack_field(buffer, start)
+                setattr(tracker, field, factory(*values) if factory else values[0])
+        return tracker
+
+    TRACKER_FIELD_PARSERS[key] = parse_tracker
+    return parse_tracker
+
+
+PSN_PACKET_PARSERS = {
+    PsnV2Chunck.PSN_INFO_PACKET: parse_info,
+    PsnV2Chunck.PSN_DATA_PACKET: parse_data,
+}
+
+PSN_PACKET_PARSERS_FROM = {
+    PsnV2Chunck.PSN_INFO_PACKET: parse_info_from,
+    PsnV2Chunck.PSN_DATA_PACKET: parse_data_from,
+}
+
+
+# PsnTracker attribute -> (wire dtype, values per tracker)
+BATCH_FIELD_LAYOUTS = {
+    "pos": ("<f4", 3),
+    "speed": ("<f4", 3),
+    "ori": ("<f4", 3),
+    "status": ("<f4", 1),
+    "accel": ("<f4", 3),
+    "trgtpos": ("<f4", 3),
+    "timestamp": ("<u8", 1),
+}
+
+
+def parse_psn_packets_batch(buffers):
+    """
+        Parse many received data buffers into numpy columns. Vectors are
+        (N, 3) float32 arrays, one row per tracker of every data packet,
+        packet_index maps each row to its packet. Missing chunks are zero
+        and flagged in the has_* masks. Info packets are skipped.
+
+    Args:
+        buffers (list of bytes): Received PSN data
+
+    Returns:
+        PsnTrackerBatch
+    """
+    try:
+        import numpy as np  # type: ignore
+    except ImportError as e:
+        raise ImportError("parse_psn_packets_batch requires numpy") from e
+
+    view = memoryview(b"".join(buffers))
+    unpack_chunk_header = CHUNK_HEADER_STRUCT.unpack_from
+    field_sizes = {}
+    for chunk_id, (field, _, _, _) in TRACKER_CHUNK_DECODERS.items():
+        dtype, width = BATCH_FIELD_LAYOUTS[field]
+        field_sizes[chunk_id] = (field, np.dtype(dtype).itemsize * width)
+    get_field = field_sizes.get
+
+    # uint16 words of a canonical 104 bytes tracker holding chunk headers
+    canonical_words = [1, 2, 3, 10, 11, 18, 19, 26, 27, 30, 31, 38, 39, 46, 47]
+    canonical_masks = np.array([0x7FFF] + [0xFFFF, 0x7FFF] * 7, dtype=np.uint16)
+    canonical = (100,) + TRACKER_STRUCT_LAYOUT
+    canonical_offsets = {
+        "pos": 8,
+        "speed": 24,
+        "ori": 40,
+        "status": 56,
+        "accel": 64,
+        "trgtpos": 80,
+        "timestamp": 96,
+    }
+
+    packet_frame_ids: List[int] = []
+    packet_timestamps: List[int] = []
+    packet_index: List[int] = []
+    tracker_ids: List[int] = []
+    rows: dict = {field: [] for field in BATCH_FIELD_LAYOUTS}
+    offsets: dict = {field: [] for field in BATCH_FIELD_LAYOUTS}
+
+    packet_offset = 0
+    for buffer in buffers:
+        packet_end = packet_offset + len(buffer)
+        chunk_id, offset, end = parse_chunk_from(view, packet_offset, packet_end)
+        packet_offset = packet_end
+        if chunk_id != PsnV2Chunck.PSN_DATA_PACKET:
+            continue
+
+        header = None
+        tracker_list = None
+        while offset + 4 <= end:
+            chunk_id, start, offset = parse_chunk_from(view, offset, end)
+            if (
+                chunk_id == PsnDataChunk.PSN_DATA_PACKET_HEADER
+                and offset - start >= PACKET_HEADER_STRUCT.size
+            ):
+                header = PACKET_HEADER_STRUCT.unpack_from(view, start)
+            elif chunk_id == PsnDataChunk.PSN_DATA_TRACKER_LIST:
+                tracker_list = (start, offset)
+        if header is None or tracker_list is None:
+            continue
+
+        row_packet = len(packet_frame_ids)
+        packet_timestamps.append(header[0])
+        packet_frame_ids.append(header[3])
+        offset, end = tracker_list
+
+        count = (end - offset) // 104
+        if count and count * 104 == end - offset:
+            # fixed-layout fast path, every tracker in the canonical encoding
+            words = np.frombuffer(view, dtype="<u2", count=count * 52, offset=offset)
+            words = words.reshape(count, 52)
+            headers = words[:, canonical_words] & canonical_masks
+            if np.array_equal(headers, np.broadcast_to(canonical, headers.shape)):
+                row = len(tracker_ids)
+                tracker_ids.extend(words[:, 0].tolist())
+                packet_index.extend([row_packet] * count)
+                for field, field_offset in canonical_offsets.items():
+                    rows[field].extend(range(row, row + count))
+                    start = offset + field_offset
+                    offsets[field].extend(range(start, start + count * 104, 104))
+                continue
+
+        while offset + 4 <= end:
+            tracker_id, data_field = unpack_chunk_header(view, offset)
+            chunk_offset = offset + 4
+            offset = min(chunk_offset + (data_field & 0x7FFF), end)
+            row = len(tracker_ids)
+            tracker_ids.append(tracker_id)
+            packet_index.append(row_packet)
+            while chunk_offset + 4 <= offset:
+                chunk_id, data_field = unpack_chunk_header(view, chunk_offset)
+                field_size = get_field(chunk_id)
+                if field_size is not None and data_field & 0x7FFF >= field_size[1]:
+                    rows[field_size[0]].append(row)
+                    offsets[field_size[0]].append(chunk_offset + 4)
+                chunk_offset += 4 + (data_field & 0x7FFF)
+
+    data = np.frombuffer(view, dtype=np.uint8)
+    count = len(tracker_ids)
+    fields = {}
+    masks = {}
+    for field, (dtype, width) in BATCH_FIELD_LAYOUTS.items():
+        wire_dtype = np.dtype(dtype)
+        shape = (count, width) if width > 1 else (count,)
+        column = np.zeros(shape, dtype=wire_dtype.newbyteorder("="))
+        mask = np.zeros(count, dtype=bool)
+        if offsets[field]:
+            field_rows = np.array(rows[field], dtype=np.intp)
+            gather = np.array(offsets[field], dtype=np.intp)[:, None] + np.arange(
+                wire_dtype.itemsize * width
+            )
+            values = data[gather].view(wire_dtype)
+            column[field_rows] = values if width > 1 else values[:, 0]
+            mask[field_rows] = True
+        fields[field] = column
+        masks[field] = mask
+
+    return PsnTrackerBatch(
+        np.array(packet_frame_ids, dtype=np.uint8),
+        np.array(packet_timestamps, dtype=np.uint64),
+        np.array(packet_index, dtype=np.intp),
+        np.array(tracker_ids, dtype=np.uint16),
+        fields,
+        masks,
+    )
+
+
+# 1500 bytes Ethernet MTU without the IPv4 and UDP headers
+PSN_MAX_PACKET_SIZE = 1472
+
+# tracker field -> (chunk id, struct format), in the canonical encoding order
+TRACKER_FIELD_CHUNKS = {
+    "pos": (PsnTrackerChunk.PSN_DATA_TRACKER_POS, "fff"),
+    "speed": (PsnTrackerChunk.PSN_DATA_TRACKER_SPEED, "fff"),
+    "ori": (PsnTrackerChunk.PSN_DATA_TRACKER_ORI, "fff"),
+    "status": (PsnTrackerChunkInfo.PSN_DATA_TRACKER_STATUS, "f"),
+    "accel": (PsnTrackerChunk.PSN_DATA_TRACKER_ACCEL, "fff"),
+    "trgtpos": (PsnTrackerChunk.PSN_DATA_TRACKER_TRGTPOS, "fff"),
+    "timestamp": (PsnTrackerChunkInfo.PSN_DATA_TRACKER_TIMESTAMP, "Q"),
+}
+# tracker fields -> compiled struct, filled by get_tracker_template
+TRACKER_TEMPLATES: Dict[tuple, Struct] = {}
+
+# data packet chunk, packet header chunk and tracker list chunk header
+DATA_PACKET_HEADER_STRUCT = Struct("<HHHHQBBBBHH")
+# info packet chunk, packet header chunk and system name chunk header
+INFO_PACKET_HEADER_STRUCT = Struct("<HHHHQBBBBHH")
+# tracker chunk and tracker name chunk headers
+INFO_TRACKER_HEADER_STRUCT = Struct("<HHHH")
+# tracker chunk header and the canonical tracker encoding
+DATA_TRACKER_STRUCT = Struct("<HH" + TRACKER_STRUCT.format[1:])
+
+
+def get_psn_data_packet_size(data_packet: PsnDataPacket, sparse=False) -> int:
+    """
+        Get size of the encoded data packet
 
-        if len(chunk_buffer) > 0:
-            while chunk_buffer:
-                chunk_id, data_buffer, chunk_buffer = parse_chunk(chunk_buffer)
-                if chunk_id in iter(PsnTrackerChunk):
-                    vector = PsnVector3(*unpack("<fff", data_buffer))
-                    if chunk_id == PsnTrackerChunk.PSN_DATA_TRACKER_POS:
-                        tracker.pos = vector
-                    elif chunk_id == PsnTrackerChunk.PSN_DATA_TRACKER_ORI:
-                        tracker.ori = vector
-                    elif chunk_id == PsnTrackerChunk.PSN_DATA_TRACKER_ACCEL:
-                        tracker.accel = vector
-                    elif chunk_id == PsnTrackerChunk.PSN_DATA_TRACKER_SPEED:
-                        tracker.speed = vector
-                    elif chunk_id == PsnTrackerChunk.PSN_DATA_TRACKER_TRGTPOS:
-                        tracker.trgtpos = vector
-
-                elif chunk_id == PsnTrackerChunkInfo.PSN_DATA_TRACKER_STATUS:
-                    status = unpack("<f", data_buffer)[0]
-                    tracker.status = status
-                elif chunk_id == PsnTrackerChunkInfo.PSN_DATA_TRACKER_TIMESTAMP:
-                    timestamp = unpack("<Q", data_buffer[:8])[0]
-                    tracker.timestamp = timestamp
-        trackers.append(tracker)
-    return trackers
+    Args:
+        data_packet (PsnDataPacket)
+        sparse (bool, optional): size of the sparse encoding. Default: False
+
+    Returns:
+        size in bytes
+    """
+    if sparse:
+        return DATA_PACKET_HEADER_STRUCT.size + sum(
+            get_tracker_template(get_tracker_fields(tracker)).size
+            for tracker in data_packet.trackers
+        )
+    return DATA_PACKET_HEADER_STRUCT.size + DATA_TRACKER_STRUCT.size * len(
+        data_packet.trackers
+    )
 
 
-def prepare_psn_info_packet_bytes(info_packet: PsnInfoPacket):
+def pack_psn_data_packet_into(
+    data_packet: PsnDataPacket, buffer, offset=0, sparse=False
+) -> int:
     """
-        Converts info variables to bytes
+        Converts data variables to bytes, written into a buffer
 
     Args:
-        info_packet (PsnInfoPacket)
+        data_packet (PsnDataPacket)
+        buffer (bytearray): writable buffer, at least
+            get_psn_data_packet_size() long after offset
+        offset (int, optional): position to write to. Default: 0
+        sparse (bool, optional): only write the tracker fields which are not
+            None, instead of all of them. Default: False
 
     Returns:
-        Pasn data as bytes.
+        number of bytes written
     """
-    trackers_packet_bytes = b""
-    tot_enc_tracker_name_length = 0
+    get_values = get_sparse_tracker_pack_values if sparse else get_tracker_pack_values
+    return pack_psn_data_trackers_into(
+        data_packet.info,
+        [get_values(tracker) for tracker in data_packet.trackers],
+        buffer,
+        offset,
+    )
 
-    for tracker in info_packet.trackers:
-        encoded_tracker_name = tracker.tracker_name.encode("utf-8")
-        tracker_name_len = len(encoded_tracker_name)
 
-        tot_enc_tracker_name_length = tot_enc_tracker_name_length + tracker_name_len + 8
-        trackers_packet_bytes = trackers_packet_bytes + pack(
-            "<HHHH" + str(tracker_name_len) + "s",
-            tracker.tracker_id,
-            tracker_name_len + 4 | (1 << 15),
-            PasnTrackerListChunk.PSN_INFO_TRACKER_NAME,
-            tracker_name_len | (1 << 15),
-            encoded_tracker_name,
+def pack_psn_data_trackers_into(info: PsnInfo, trackers, buffer, offset=0) -> int:
+    """
+        Write data packet of already prepared trackers into a buffer
+
+    Args:
+        info (PsnInfo): packet header
+        trackers (list): (struct, values) of each tracker, as returned by
+            get_tracker_pack_values
+        buffer (bytearray): writable buffer
+        offset (int, optional): position to write to. Default: 0
+
+    Returns:
+        number of bytes written
+    """
+    size = DATA_PACKET_HEADER_STRUCT.size + sum(
+        tracker_struct.size for tracker_struct, _ in trackers
+    )
+    check_psn_packet_size(size, buffer, offset)
+    DATA_PACKET_HEADER_STRUCT.pack_into(
+        buffer,
+        offset,
+        PsnV2Chunck.PSN_DATA_PACKET,
+        (size - 4) | (1 << 15),
+        PsnDataChunk.PSN_DATA_PACKET_HEADER,
+        12 | (1 << 15),
+        info.timestamp,
+        info.version_high,
+        info.version_low,
+        info.frame_id,
+        info.packet_count,
+        PsnDataChunk.PSN_DATA_TRACKER_LIST,
+        (size - DATA_PACKET_HEADER_STRUCT.size) | (1 << 15),
+    )
+
+    offset += DATA_PACKET_HEADER_STRUCT.size
+    for tracker_struct, values in trackers:
+        tracker_struct.pack_into(buffer, offset, *values)
+        offset += tracker_struct.size
+    return size
+
+
+def get_tracker_pack_values(tracker: PsnTracker) -> tuple:
+    """
+        Get struct and values of the canonical tracker encoding
+
+    Args:
+        tracker (PsnTracker)
+
+    Returns:
+        DATA_TRACKER_STRUCT, chunk headers and values
+    """
+    pos = tracker.pos
+    speed = tracker.speed
+    ori = tracker.ori
+    accel = tracker.accel
+    trgtpos = tracker.trgtpos
+    return DATA_TRACKER_STRUCT, (
+        tracker.tracker_id,
+        100 | (1 << 15),  # 28 (H) + 64 (f) + 8 (Q)
+        PsnTrackerChunk.PSN_DATA_TRACKER_POS,
+        12 | (1 << 15),
+        pos.x,
+        pos.y,
+        pos.z,
+        PsnTrackerChunk.PSN_DATA_TRACKER_SPEED,
+        12 | (1 << 15),
+        speed.x,
+        speed.y,
+        speed.z,
+        PsnTrackerChunk.PSN_DATA_TRACKER_ORI,
+        12 | (1 << 15),
+        ori.x,
+        ori.y,
+        ori.z,
+        PsnTrackerChunkInfo.PSN_DATA_TRACKER_STATUS,
+        4 | (1 << 15),
+        tracker.status,
+        PsnTrackerChunk.PSN_DATA_TRACKER_ACCEL,
+        12 | (1 << 15),
+        accel.x,
+        accel.y,
+        accel.z,
+        PsnTrackerChunk.PSN_DATA_TRACKER_TRGTPOS,
+        12 | (1 << 15),
+        trgtpos.x,
+        trgtpos.y,
+        trgtpos.z,
+        PsnTrackerChunkInfo.PSN_DATA_TRACKER_TIMESTAMP,
+        8 | (1 << 15),
+        tracker.timestamp,
+    )
+
+
+def get_tracker_fields(tracker: PsnTracker) -> tuple:
+    """
+        Get names of the tracker fields which are not None
+
+    Args:
+        tracker (PsnTracker)
+
+    Returns:
+        field names, in TRACKER_FIELD_CHUNKS order
+    """
+    return tuple(
+        field for field in TRACKER_FIELD_CHUNKS if getattr(tracker, field) is not None
+    )
+
+
+def get_tracker_template(fields: tuple) -> Struct:
+    """
+        Get compiled struct of a tracker with the given fields, cached per
+        field combination
+
+    Args:
+        fields (tuple): field names, in TRACKER_FIELD_CHUNKS order
+
+    Returns:
+        struct of the tracker chunk header and the field chunks
+    """
+    template = TRACKER_TEMPLATES.get(fields)
+    if template is None:
+        template_format = "<HH" + "".join(
+            "HH" + TRACKER_FIELD_CHUNKS[field][1] for field in fields
         )
-    trackers_packet_bytes = (
-        pack(
-            "<HH",
-            PsnInfoChunk.PSN_INFO_TRACKER_LIST,
-            tot_enc_tracker_name_length | (1 << 15),
+        template = TRACKER_TEMPLATES[fields] = Struct(template_format)
+    return template
+
+
+def get_sparse_tracker_pack_values(tracker: PsnTracker) -> tuple:
+    """
+        Get struct and values of the sparse tracker encoding, holding only
+        the fields which are not None
+
+    Args:
+        tracker (PsnTracker)
+
+    Returns:
+        struct, chunk headers and values
+    """
+    fields = []
+    values = [tracker.tracker_id, 0]
+    for field, (chunk_id, field_format) in TRACKER_FIELD_CHUNKS.items():
+        value = getattr(tracker, field)
+        if value is None:
+            continue
+        fields.append(field)
+        if len(field_format) == 3:
+            values += (chunk_id, 12 | (1 << 15), value.x, value.y, value.z)
+        else:
+            values += (chunk_id, calcsize(field_format) | (1 << 15), value)
+    template = get_tracker_template(tuple(fields))
+    values[1] = (template.size - 4) | (1 << 15)
+    return template, tuple(values)
+
+
+class PsnDataEncoder:
+    """
+    Data packet encoder keeping the last encoded packet. As long as the
+    trackers keep their encoded layout, the next packet only patches the
+    header and re-packs the trackers whose values changed. Callers knowing
+    which trackers changed pass their ids, the other trackers are then not
+    even read. The returned view is valid until the next encode() call.
+    """
+
+    def __init__(self, sparse=False):
+        """
+        Args:
+            sparse (bool, optional): only write the tracker fields which are
+                not None, see pack_psn_data_packet_into. Default: False
+        """
+        self.sparse = sparse
+        self.buffer = bytearray()
+        self.layout: tuple = None
+        self.tracker_values: List[tuple] = []
+        # tracker ids of the last encoded packet, in order
+        self.tracker_ids: tuple = None
+        # tracker id -> index in the last encoded packet
+        self.tracker_index: Dict[int, int] = {}
+        self.tracker_offsets: List[int] = []
+        # trackers packed by the last encode() call
+        self.packed_trackers = 0
+
+    def encode(self, data_packet: PsnDataPacket, changed=None) -> memoryview:
+        """
+            Converts data variables to bytes
+
+        Args:
+            data_packet (PsnDataPacket)
+            changed (set, optional): ids of the trackers changed since the
+                last call, the others are assumed unchanged. Default: every
+                tracker is compared with its last encoded values
+
+        Returns:
+            read-only view of the encoded packet
+        """
+        if self.sparse:
+            get_values = get_sparse_tracker_pack_values
+        else:
+            get_values = get_tracker_pack_values
+        if changed is not None:
+            tracker_ids = tuple(tracker.tracker_id for tracker in data_packet.trackers)
+            if tracker_ids == self.tracker_ids and self.encode_changed(
+                data_packet, changed, get_values
+            ):
+                return memoryview(self.buffer).toreadonly()
+
+        trackers = [get_values(tracker) for tracker in data_packet.trackers]
+        layout = tuple(tracker_struct for tracker_struct, _ in trackers)
+        if layout != self.layout:
+            self.buffer = bytearray(
+                DATA_PACKET_HEADER_STRUCT.size
+                + sum(tracker_struct.size for tracker_struct in layout)
+            )
+            pack_psn_data_trackers_into(data_packet.info, trackers, self.buffer)
+            self.layout = layout
+            self.tracker_values = [values for _, values in trackers]
+            self.tracker_ids = tuple(values[0] for _, values in trackers)
+            self.tracker_index = {
+                tracker_id: index for index, tracker_id in enumerate(self.tracker_ids)
+            }
+            self.tracker_offsets = []
+            offset = DATA_PACKET_HEADER_STRUCT.size
+            for tracker_struct in layout:
+                self.tracker_offsets.append(offset)
+                offset += tracker_struct.size
+            self.packed_trackers = len(trackers)
+            return memoryview(self.buffer).toreadonly()
+
+        self.pack_header(data_packet.info)
+        packed_trackers = 0
+        offset = DATA_PACKET_HEADER_STRUCT.size
+        tracker_values = self.tracker_values
+        for index, (tracker_struct, values) in enumerate(trackers):
+            if values != tracker_values[index]:
+                tracker_struct.pack_into(self.buffer, offset, *values)
+                tracker_values[index] = values
+                packed_trackers += 1
+            offset += tracker_struct.size
+        self.packed_trackers = packed_trackers
+        return memoryview(self.buffer).toreadonly()
+
+    def encode_changed(self, data_packet: PsnDataPacket, changed, get_values) -> bool:
+        """
+            Re-pack only the changed trackers into the last encoded packet,
+            which holds the same trackers
+
+        Args:
+            data_packet (PsnDataPacket)
+            changed (set): ids of the changed trackers
+            get_values (callable): get_tracker_pack_values or its sparse
+                variant
+
+        Returns:
+            False if a changed tracker changed its layout, nothing is written
+        """
+        trackers = data_packet.trackers
+        layout = self.layout
+        updates = []
+        for tracker_id in changed:
+            index = self.tracker_index.get(tracker_id)
+            if index is None:
+                continue
+            tracker_struct, values = get_values(trackers[index])
+            if tracker_struct is not layout[index]:
+                return False
+            updates.append((index, tracker_struct, values))
+
+        self.pack_header(data_packet.info)
+        tracker_values = self.tracker_values
+        tracker_offsets = self.tracker_offsets
+        for index, tracker_struct, values in updates:
+            tracker_struct.pack_into(self.buffer, tracker_offsets[index], *values)
+            tracker_values[index] = values
+        self.packed_trackers = len(updates)
+        return True
+
+    def pack_header(self, info: PsnInfo):
+        """
+            Patch the packet header of the last encoded packet
+
+        Args:
+            info (PsnInfo)
+        """
+        PACKET_HEADER_STRUCT.pack_into(
+            self.buffer,
+            8,
+            info.timestamp,
+            info.version_high,
+            info.version_low,
+            info.frame_id,
+            info.packet_count,
         )
-        + trackers_packet_bytes
+
+
+def encode_tracker_names(info_packet: PsnInfoPacket) -> List[tuple]:
+    """
+        Encode tracker names of info packet
+
+    Args:
+        info_packet (PsnInfoPacket)
+
+    Returns:
+        (tracker id, encoded name) of each tracker
+    """
+    return [
+        (tracker.tracker_id, tracker.tracker_name.encode("utf-8"))
+        for tracker in info_packet.trackers
+    ]
+
+
+def get_psn_info_packet_size(info_packet: PsnInfoPacket, tracker_names=None) -> int:
+    """
+        Get size of the encoded info packet
+
+    Args:
+        info_packet (PsnInfoPacket)
+        tracker_names (list, optional): result of encode_tracker_names
+
+    Returns:
+        size in bytes
+    """
+    if tracker_names is None:
+        tracker_names = encode_tracker_names(info_packet)
+    return (
+        INFO_PACKET_HEADER_STRUCT.size
+        + len(info_packet.name.encode("utf-8"))
+        + 4
+        + sum(INFO_TRACKER_HEADER_STRUCT.size + len(name) for _, name in tracker_names)
     )
 
+
+def pack_psn_info_packet_into(info_packet: PsnInfoPacket, buffer, offset=0) -> int:
+    """
+        Converts info variables to bytes, written into a buffer
+
+    Args:
+        info_packet (PsnInfoPacket)
+        buffer (bytearray): writable buffer, at least
+            get_psn_info_packet_size() long after offset
+        offset (int, optional): position to write to. Default: 0
+
+    Returns:
+        number of bytes written
+    """
+    tracker_names = encode_tracker_names(info_packet)
+    size = get_psn_info_packet_size(info_packet, tracker_names)
+    check_psn_packet_size(size, buffer, offset)
     encoded_system_name = info_packet.name.encode("utf-8")
-    system_name_lenght = len(encoded_system_name)
-    info_packet_bytes = (
-        pack(
-            ("<HHHHQBBBBHH" + str(system_name_lenght) + "s"),
-            PsnV2Chunck.PSN_INFO_PACKET,
-            (24 + system_name_lenght + tot_enc_tracker_name_length) | (1 << 15),
-            PsnInfoChunk.PSN_INFO_PACKET_HEADER,
-            12 | (1 << 15),
-            info_packet.info.timestamp,
-            info_packet.info.version_high,
-            info_packet.info.version_low,
-            info_packet.info.frame_id,
-            info_packet.info.packet_count,
-            PsnInfoChunk.PSN_INFO_SYSTEM_NAME,
-            system_name_lenght | (1 << 15),
-            encoded_system_name,
-        )
-        + trackers_packet_bytes
+    system_name_length = len(encoded_system_name)
+    info = info_packet.info
+    INFO_PACKET_HEADER_STRUCT.pack_into(
+        buffer,
+        offset,
+        PsnV2Chunck.PSN_INFO_PACKET,
+        (size - 4) | (1 << 15),
+        PsnInfoChunk.PSN_INFO_PACKET_HEADER,
+        12 | (1 << 15),
+        info.timestamp,
+        info.version_high,
+        info.version_low,
+        info.frame_id,
+        info.packet_count,
+        PsnInfoChunk.PSN_INFO_SYSTEM_NAME,
+        system_name_length | (1 << 15),
     )
+    offset += INFO_PACKET_HEADER_STRUCT.size
+    buffer[offset : offset + system_name_length] = encoded_system_name
+    offset += system_name_length
+
+    tracker_list_length = size - INFO_PACKET_HEADER_STRUCT.size - system_name_length
+    CHUNK_HEADER_STRUCT.pack_into(
+        buffer,
+        offset,
+        PsnInfoChunk.PSN_INFO_TRACKER_LIST,
+        (tracker_list_length - 4) | (1 << 15),
+    )
+    offset += 4
+
+    pack_tracker = INFO_TRACKER_HEADER_STRUCT.pack_into
+    for tracker_id, name in tracker_names:
+        name_length = len(name)
+        pack_tracker(
+            buffer,
+            offset,
+            tracker_id,
+            (name_length + 4) | (1 << 15),
+            PasnTrackerListChunk.PSN_INFO_TRACKER_NAME,
+            name_length | (1 << 15),
+        )
+        offset += INFO_TRACKER_HEADER_STRUCT.size
+        buffer[offset : offset + name_length] = name
+        offset += name_length
+    return size
+
+
+def check_psn_packet_size(size, buffer, offset):
+    """
+        Check that encoded packet fits into its length field and the buffer
 
-    return info_packet_bytes
+    Args:
+        size (int): size of the encoded packet
+        buffer (bytearray): buffer to write to
+        offset (int): position to write to
+    """
+    if size - 4 > 0x7FFF:
+        raise ValueError(f"PSN packet of {size} bytes is too large, split it")
+    if len(buffer) - offset < size:
+        raise ValueError(
+            f"Buffer too small for PSN packet: {len(buffer) - offset} < {size}"
+        )
+
+
+def prepare_psn_info_packet_bytes(info_packet: PsnInfoPacket):
+    """
+        Converts info variables to bytes
 
+    Args:
+        info_packet (PsnInfoPacket)
+
+    Returns:
+        Pasn data as bytes.
+    """
+    buffer = bytearray(get_psn_info_packet_size(info_packet))
+    pack_psn_info_packet_into(info_packet, buffer)
+    return bytes(buffer)
 
-def prepare_psn_data_packet_bytes(data_packet: PsnDataPacket):
+
+def prepare_psn_data_packet_bytes(data_packet: PsnDataPacket, sparse=False):
     """
         Converts data variables to bytes
 
     Args:
         data_packet (PsnDataPacket)
+        sparse (bool, optional): only write the tracker fields which are not
+            None, instead of all of them. Default: False
 
     Returns:
         Pasn data as bytes.
     """
-    trackers_packet_bytes = b""
-    tot_enc_tracker_length = 0
+    buffer = bytearray(get_psn_data_packet_size(data_packet, sparse))
+    pack_psn_data_packet_into(data_packet, buffer, sparse=sparse)
+    return bytes(buffer)
 
-    for tracker in data_packet.trackers:
-        tot_enc_tracker_length = tot_enc_tracker_length + 104
-        trackers_packet_bytes = trackers_packet_bytes + pack(
-            "<HHHHfffHHfffHHfffHHfHHfffHHfffHHQ",
-            tracker.tracker_id,
-            100 | (1 << 15),  # 28 (H) + 64 (f) + 8 (Q)
-            PsnTrackerChunk.PSN_DATA_TRACKER_POS,
-            12 | (1 << 15),
-            tracker.pos.x,
-            tracker.pos.y,
-            tracker.pos.z,
-            PsnTrackerChunk.PSN_DATA_TRACKER_SPEED,
-            12 | (1 << 15),
-            tracker.speed.x,
-            tracker.speed.y,
-            tracker.speed.z,
-            PsnTrackerChunk.PSN_DATA_TRACKER_ORI,
-            12 | (1 << 15),
-            tracker.ori.x,
-            tracker.ori.y,
-            tracker.ori.z,
-            PsnTrackerChunkInfo.PSN_DATA_TRACKER_STATUS,
-            4 | (1 << 15),
-            tracker.status,
-            PsnTrackerChunk.PSN_DATA_TRACKER_ACCEL,
-            12 | (1 << 15),
-            tracker.accel.x,
-            tracker.accel.y,
-            tracker.accel.z,
-            PsnTrackerChunk.PSN_DATA_TRACKER_TRGTPOS,
-            12 | (1 << 15),
-            tracker.trgtpos.x,
-            tracker.trgtpos.y,
-            tracker.trgtpos.z,
-            PsnTrackerChunkInfo.PSN_DATA_TRACKER_TIMESTAMP,
-            8 | (1 << 15),
-            tracker.timestamp,
-        )
-    trackers_packet_bytes = (
-        pack(
-            "<HH",
-            PsnDataChunk.PSN_DATA_TRACKER_LIST,
-            tot_enc_tracker_length | (1 << 15),
+
+def split_psn_data_packet(
+    data_packet: PsnDataPacket, max_packet_size=PSN_MAX_PACKET_SIZE, sparse=False
+) -> List[PsnDataPacket]:
+    """
+        Split data packet into packets of at most max_packet_size bytes,
+        sharing the frame_id and with the packet_count of the split
+
+    Args:
+        data_packet (PsnDataPacket)
+        max_packet_size (int, optional): max encoded size of one packet.
+            Default: PSN_MAX_PACKET_SIZE
+        sparse (bool, optional): split for the sparse encoding. Default: False
+
+    Returns:
+        list of data packets
+    """
+    trackers = data_packet.trackers
+    if sparse:
+        sizes = [
+            get_tracker_template(get_tracker_fields(tracker)).size
+            for tracker in trackers
+        ]
+    else:
+        sizes = [DATA_TRACKER_STRUCT.size] * len(trackers)
+    parts = split_tracker_sizes(sizes, max_packet_size)
+    info = split_psn_info(data_packet.info, len(parts))
+    return [PsnDataPacket(info, trackers[start:end]) for start, end in parts]
+
+
+def split_tracker_sizes(sizes: List[int], max_packet_size: int) -> List[tuple]:
+    """
+        Split encoded trackers into data packets of at most max_packet_size
+        bytes
+
+    Args:
+        sizes (list): encoded size of each tracker
+        max_packet_size (int): max encoded size of one packet
+
+    Returns:
+        start and end index of the trackers of each packet
+    """
+    max_trackers_size = (
+        min(max_packet_size, 0x7FFF + 4) - DATA_PACKET_HEADER_STRUCT.size
+    )
+    parts = []
+    start = 0
+    packet_size = 0
+    for index, size in enumerate(sizes):
+        if size > max_trackers_size:
+            raise ValueError(f"max_packet_size {max_packet_size} can not fit a tracker")
+        if packet_size + size > max_trackers_size:
+            parts.append((start, index))
+            start = index
+            packet_size = 0
+        packet_size += size
+    parts.append((start, len(sizes)))
+    return parts
+
+
+def split_psn_info_packet(
+    info_packet: PsnInfoPacket, max_packet_size=PSN_MAX_PACKET_SIZE
+) -> List[PsnInfoPacket]:
+    """
+        Split info packet into packets of at most max_packet_size bytes,
+        sharing the frame_id and with the packet_count of the split
+
+    Args:
+        info_packet (PsnInfoPacket)
+        max_packet_size (int, optional): max encoded size of one packet.
+            Default: PSN_MAX_PACKET_SIZE
+
+    Returns:
+        list of info packets
+    """
+    max_packet_size = min(max_packet_size, 0x7FFF + 4)
+    empty_size = get_psn_info_packet_size(
+        PsnInfoPacket(info_packet.info, info_packet.name, [])
+    )
+    parts: List[list] = []
+    part: list = []
+    size = empty_size
+    for tracker, (_, name) in zip(
+        info_packet.trackers, encode_tracker_names(info_packet)
+    ):
+        tracker_size = INFO_TRACKER_HEADER_STRUCT.size + len(name)
+        if empty_size + tracker_size > max_packet_size:
+            raise ValueError(
+                f"max_packet_size {max_packet_size} can not fit tracker "
+                f"{tracker.tracker_id}"
+            )
+        if size + tracker_size > max_packet_size:
+            parts.append(part)
+            part = []
+            size = empty_size
+        part.append(tracker)
+        size += tracker_size
+    parts.append(part)
+    return [
+        PsnInfoPacket(
+            split_psn_info(info_packet.info, len(parts)), info_packet.name, part
         )
-        + trackers_packet_bytes
+        for part in parts
+    ]
+
+
+def split_psn_info(info: PsnInfo, packet_count: int) -> PsnInfo:
+    """
+        Get packet header for the packets of a split frame
+
+    Args:
+        info (PsnInfo): packet header of the frame
+        packet_count (int): number of packets of the frame
+
+    Returns:
+        packet header
+    """
+    if packet_count > 0xFF:
+        raise ValueError(f"Frame needs {packet_count} packets, at most 255 allowed")
+    return PsnInfo(
+        info.timestamp,
+        info.version_high,
+        info.version_low,
+        info.frame_id,
+        max(packet_count, 1),
+    )
+
+
+def prepare_psn_data_packets_bytes(
+    data_packet: PsnDataPacket, max_packet_size=PSN_MAX_PACKET_SIZE, sparse=False
+) -> List[bytes]:
+    """
+        Converts data variables to bytes, split into packets of at most
+        max_packet_size bytes
+
+    Args:
+        data_packet (PsnDataPacket)
+        max_packet_size (int, optional): max size of one packet.
+            Default: PSN_MAX_PACKET_SIZE
+        sparse (bool, optional): only write the tracker fields which are not
+            None, instead of all of them. Default: False
+
+    Returns:
+        list of Pasn data as bytes.
+    """
+    get_values = get_sparse_tracker_pack_values if sparse else get_tracker_pack_values
+    trackers = [get_values(tracker) for tracker in data_packet.trackers]
+    parts = split_tracker_sizes(
+        [tracker_struct.size for tracker_struct, _ in trackers], max_packet_size
     )
+    info = split_psn_info(data_packet.info, len(parts))
+    packets = []
+    for start, end in parts:
+        part = trackers[start:end]
+        buffer = bytearray(
+            DATA_PACKET_HEADER_STRUCT.size
+            + sum(tracker_struct.size for tracker_struct, _ in part)
+        )
+        pack_psn_data_trackers_into(info, part, buffer)
+        packets.append(bytes(buffer))
+    return packets
+
+
+def prepare_psn_info_packets_bytes(
+    info_packet: PsnInfoPacket, max_packet_size=PSN_MAX_PACKET_SIZE
+) -> List[bytes]:
+    """
+        Converts info variables to bytes, split into packets of at most
+        max_packet_size bytes
+
+    Args:
+        info_packet (PsnInfoPacket)
+        max_packet_size (int, optional): max size of one packet.
+            Default: PSN_MAX_PACKET_SIZE
+
+    Returns:
+        list of Pasn data as bytes.
+    """
+    return [
+        prepare_psn_info_packet_bytes(packet)
+        for packet in split_psn_info_packet(info_packet, max_packet_size)
+    ]
+
+
+def encode_data_from_arrays(
+    tracker_ids,
+    pos=None,
+    speed=None,
+    ori=None,
+    status=None,
+    accel=None,
+    trgtpos=None,
+    timestamp=None,
+    info: PsnInfo = None,
+    max_packet_size=PSN_MAX_PACKET_SIZE,
+) -> List[bytes]:
+    """
+        Converts tracker arrays to data packets, without PsnTracker objects.
+        Vector arrays are (N, 3), status and timestamp (N,). Fields left None
+        are not encoded. Trackers are split into packets of at most
+        max_packet_size bytes, sharing the frame_id of info.
+
+    Args:
+        tracker_ids (array): (N,) tracker ids
+        pos, speed, ori, accel, trgtpos (array, optional): (N, 3) vectors
+        status (array, optional): (N,) status
+        timestamp (array, optional): (N,) tracker timestamps
+        info (PsnInfo, optional): packet header, packet_count is set by the
+            split. Default: timestamp 0, version 2.0, frame_id 0
+        max_packet_size (int, optional): max size of one packet.
+            Default: PSN_MAX_PACKET_SIZE
 
-    data_packet_bytes = (
-        pack(
-            ("<HHHHQBBBB"),
+    Returns:
+        list of Pasn data as bytes.
+    """
+    try:
+        import numpy as np  # type: ignore
+    except ImportError as e:
+        raise ImportError("encode_data_from_arrays requires numpy") from e
+
+    columns = {
+        "pos": pos,
+        "speed": speed,
+        "ori": ori,
+        "status": status,
+        "accel": accel,
+        "trgtpos": trgtpos,
+        "timestamp": timestamp,
+    }
+    fields = tuple(
+        field for field in TRACKER_FIELD_CHUNKS if columns[field] is not None
+    )
+    dtype_fields: List[tuple] = [("tracker_id", "<u2"), ("length", "<u2")]
+    for field in fields:
+        field_format = TRACKER_FIELD_CHUNKS[field][1]
+        dtype_fields += [(field + "_id", "<u2"), (field + "_length", "<u2")]
+        if field_format == "fff":
+            dtype_fields.append((field, "<f4", (3,)))
+        elif field_format == "f":
+            dtype_fields.append((field, "<f4"))
+        else:
+            dtype_fields.append((field, "<u8"))
+    # on-wire layout of one tracker, the same as get_tracker_template(fields)
+    dtype = np.dtype(dtype_fields)
+
+    tracker_ids = np.asarray(tracker_ids)
+    records = np.empty(len(tracker_ids), dtype=dtype)
+    records["tracker_id"] = tracker_ids
+    records["length"] = (dtype.itemsize - 4) | (1 << 15)
+    for field in fields:
+        chunk_id, field_format = TRACKER_FIELD_CHUNKS[field]
+        records[field + "_id"] = chunk_id
+        records[field + "_length"] = calcsize(field_format) | (1 << 15)
+        records[field] = columns[field]
+
+    if info is None:
+        info = PsnInfo(0, 2, 0, 0, 1)
+    parts = split_tracker_sizes([dtype.itemsize] * len(records), max_packet_size)
+    info = split_psn_info(info, len(parts))
+    packets = []
+    for start, end in parts:
+        size = DATA_PACKET_HEADER_STRUCT.size + (end - start) * dtype.itemsize
+        buffer = bytearray(size)
+        DATA_PACKET_HEADER_STRUCT.pack_into(
+            buffer,
+            0,
             PsnV2Chunck.PSN_DATA_PACKET,
-            (16 + 4 + tot_enc_tracker_length) | (1 << 15),
+            (size - 4) | (1 << 15),
             PsnDataChunk.PSN_DATA_PACKET_HEADER,
             12 | (1 << 15),
-            data_packet.info.timestamp,
-            data_packet.info.version_high,
-            data_packet.info.version_low,
-            data_packet.info.frame_id,
-            data_packet.info.packet_count,
+            info.timestamp,
+            info.version_high,
+            info.version_low,
+            info.frame_id,
+            info.packet_count,
+            PsnDataChunk.PSN_DATA_TRACKER_LIST,
+            (size - DATA_PACKET_HEADER_STRUCT.size) | (1 << 15),
         )
-        + trackers_packet_bytes
-    )
+        buffer[DATA_PACKET_HEADER_STRUCT.size :] = records[start:end].tobytes()
+        packets.append(bytes(buffer))
+    return packets
+
+
+class PsnSender:
+    """
+        Sends PSN packets over one socket, opened once and kept for the
+        lifetime of the sender. If mcast_ip is specified, it sends via
+        multicast with the help of multicast_expert. If not, it sends via
+        simple unicast to ip_addr, or to each of the destinations.
+        On Linux, several datagrams are sent with one sendmmsg system call.
+
+    Args:
+        mcast_ip (str, optional): multicastip. Default: "236.10.10.10"
+        ip_addr (str, optional): local ip, unicast destination ip if mcast_ip
+            is None. Default: 127.0.0.1
+        port (int, optional): udp port. Default: 56565
+        destinations (list, optional): unicast destinations, as ip or
+            (ip, port), every packet is sent to each of them
+        batch (bool, optional): use sendmmsg where available. Default: True
+    """
+
+    def __init__(
+        self,
+        mcast_ip="236.10.10.10",
+        ip_addr="127.0.0.1",
+        port=56565,
+        destinations=None,
+        batch=True,
+    ):
+        # the socket is closed again if the rest of the setup fails
+        with ExitStack() as exit_stack:
+            if mcast_ip:
+                self.sock = exit_stack.enter_context(
+                    multicast_expert.McastTxSocket(
+                        socket.AF_INET, mcast_ips=[mcast_ip], iface_ip=ip_addr
+                    )
+                )
+                self.addresses = [(mcast_ip, port)]
+            else:
+                self.sock = exit_stack.enter_context(
+                    socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+                )
+                if destinations is None:
+                    destinations = [ip_addr]
+                self.addresses = [
+                    (destination, port) if isinstance(destination, str) else destination
+                    for destination in destinations
+                ]
+            self.sockaddrs = get_sockaddrs_in(self.addresses)
+            self.exit_stack = exit_stack.pop_all()
+        self.batch = batch and SENDMMSG is not None
+
+    def send(self, psn_packet):
+        """
+            Send one packet to all destinations.
+
+        Args:
+            psn_packet (bytes): as bytes
+        """
+        if len(self.addresses) == 1:
+            self.sock.sendto(psn_packet, self.addresses[0])
+        else:
+            self.send_many([psn_packet])
+
+    def send_many(self, psn_packets):
+        """
+            Send packets in order to all destinations, e.g. a frame split
+            by prepare_psn_data_packets_bytes.
+
+        Args:
+            psn_packets (list): list of packets as bytes
+        """
+        if self.batch:
+            sendmmsg(self.sock, psn_packets, self.addresses, self.sockaddrs)
+        else:
+            sendto = self.sock.sendto
+            for address in self.addresses:
+                for psn_packet in psn_packets:
+                    sendto(psn_packet, address)
+
+    def close(self):
+        """
+        Close the socket, closing it again does nothing.
+        """
+        self.exit_stack.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+class PsnServer(Thread):
+    """
+        Sends data frames at data_rate and info packets at info_rate, on
+        monotonic deadlines independent of the time taken by the state
+        provider and the encoding. The frame_id and the packet timestamp
+        (microseconds since start) are set by the server.
+
+    Args:
+        state_provider (callable): returns the list of PsnTracker to send,
+            called once per data frame
+        sender (PsnSender): sends the packets, not closed by the server
+        name (str, optional): system name. Default: "pypsn"
+        tracker_names (dict, optional): tracker id to tracker name, trackers
+            not in it are named by their id
+        data_rate (float, optional): data frames per second. Default: 60
+        info_rate (float, optional): info packets per second. Default: 1
+        policy (PsnSchedulePolicy, optional): what to do with missed data
+            frames. Default: PsnSchedulePolicy.SKIP
+        max_packet_size (int, optional): frames are split into packets of at
+            most max_packet_size bytes. Default: PSN_MAX_PACKET_SIZE
+        sparse (bool, optional): only write the tracker fields which are not
+            None. Default: False
+    """
+
+    def __init__(
+        self,
+        state_provider,
+        sender,
+        name="pypsn",
+        tracker_names=None,
+        data_rate=60,
+        info_rate=1,
+        policy=PsnSchedulePolicy.SKIP,
+        max_packet_size=PSN_MAX_PACKET_SIZE,
+        sparse=False,
+    ):
+        Thread.__init__(self)
+        self.state_provider = state_provider
+        self.sender = sender
+        self.system_name = name
+        self.tracker_names = {} if tracker_names is None else tracker_names
+        self.data_period = 1 / data_rate
+        self.info_period = 1 / info_rate
+        self.policy = policy
+        self.max_packet_size = max_packet_size
+        self.sparse = sparse
+        self.data_encoder = PsnDataEncoder(sparse)
+        self.frame_id = 0
+        self.trackers: Sequence[PsnTracker] = []
+        self.stopped = Event()
+        # statistics
+        self.data_frames = 0
+        self.info_frames = 0
+        self.missed_deadlines = 0
+        self.max_lateness = 0.0
+
+    def stop(self):
+        """
+        Stop sending.
+        """
+        self.stopped.set()
+        self.join()
+
+    def schedule(self, deadline, now):
+        """
+            Get the deadline of the next data frame after sending the frame
+            of deadline at now, counting the missed deadlines.
 
-    return data_packet_bytes
+        Args:
+            deadline (float): deadline of the frame just sent
+            now (float): monotonic time after sending it
+
+        Returns:
+            next deadline
+        """
+        self.max_lateness = max(self.max_lateness, now - deadline)
+        deadline += self.data_period
+        if now < deadline:
+            return deadline
+        missed = int((now - deadline) / self.data_period) + 1
+        # catching up is limited to one second, to not send stale frames
+        if self.policy == PsnSchedulePolicy.CATCH_UP and missed * self.data_period <= 1:
+            self.missed_deadlines += 1
+            return deadline
+        self.missed_deadlines += missed
+        return deadline + missed * self.data_period
+
+    def send_data(self, timestamp):
+        """
+            Send the data frame of the current state.
+
+        Args:
+            timestamp (int): packet timestamp in microseconds
+        """
+        self.trackers = self.state_provider()
+        data_packet = PsnDataPacket(
+            PsnInfo(timestamp, 2, 0, self.frame_id, 1), self.trackers
+        )
+        if get_psn_data_packet_size(data_packet, self.sparse) <= self.max_packet_size:
+            self.sender.send(self.data_encoder.encode(data_packet))
+        else:
+            self.sender.send_many(
+                prepare_psn_data_packets_bytes(
+                    data_packet, self.max_packet_size, self.sparse
+                )
+            )
+        self.frame_id = (self.frame_id + 1) & 0xFF
+        self.data_frames += 1
+
+    def send_info(self, timestamp):
+        """
+            Send the info packets of the trackers of the last data frame.
+
+        Args:
+            timestamp (int): packet timestamp in microseconds
+        """
+        info_packet = PsnInfoPacket(
+            PsnInfo(timestamp, 2, 0, self.frame_id, 1),
+            self.system_name,
+            [
+                PsnTrackerInfo(
+                    tracker.tracker_id,
+                    self.tracker_names.get(tracker.tracker_id, str(tracker.tracker_id)),
+                )
+                for tracker in self.trackers
+            ],
+        )
+        self.sender.send_many(
+            prepare_psn_info_packets_bytes(info_packet, self.max_packet_size)
+        )
+        self.info_frames += 1
+
+    def run(self):
+        """
+        Start sending.
+        """
+        start = next_data = next_info = time.monotonic()
+        while not self.stopped.is_set():
+            now = time.monotonic()
+            if now < next_data and now < next_info:
+                self.stopped.wait(min(next_data, next_info) - now)
+                continue
+            if now >= next_data:
+                try:
+                    self.send_data(int((now - start) * 1000000))
+                except Exception as e:
+                    print("PSN server error:", e)
+                next_data = self.schedule(next_data, time.monotonic())
+            if now >= next_info:
+                try:
+                    self.send_info(int((now - start) * 1000000))
+                except Exception as e:
+                    print("PSN server error:", e)
+                next_info += self.info_period
+                if next_info <= now:
+                    next_info = now + self.info_period
 
 
 def send_psn_packet(
     psn_packet, mcast_ip="236.10.10.10", ip_addr="127.0.0.1", port=56565
 ):
     """Send psn packet.
-        If mcast_ip is specified, it does via multicast with the help
-        of multicast_expert. If not, it does via simple unicast.
+        Opens a PsnSender for one packet, keep a PsnSender to send
+        repeatedly.
 
     Args:
         psn_packet (_type_): as bytes
@@ -667,11 +4315,5 @@ def send_psn_packet(
         ip_addr (str, optional): local ip. Default: 127.0.0.1
         port (int, optional): udp port. Default: 56565
     """
-    if mcast_ip:
-        with multicast_expert.McastTxSocket(
-            socket.AF_INET, mcast_ips=[mcast_ip], iface_ip=ip_addr
-        ) as mcast_tx_sock:
-            mcast_tx_sock.sendto(psn_packet, (mcast_ip, port))
-    else:
-        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-        sock.sendto(psn_packet, (ip_addr, port))
+    with PsnSender(mcast_ip, ip_addr, port) as sender:
+        sender.send(psn_packet)
@@ -0,0 +1,72 @@
+#!/bin/env python3
+"""
+Test the asyncio receiver.
+"""
+
+import asyncio
+import socket
+
+import pytest
+
+import pypsn
+from test_own_pack_unpack import get_test_data, get_test_info
+
+
+async def receive(receiver, packets):
+    """
+        Send packets to the receiver over localhost and collect them.
+
+    Args:
+        receiver (AsyncReceiver): receiver to start
+        packets (list): packets as bytes
+
+    Returns:
+        list of parsed packets
+    """
+    rx_sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    rx_sock.bind(("127.0.0.1", 0))
+    await receiver.start(rx_sock)
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as tx_sock:
+        for packet in packets:
+            tx_sock.sendto(packet, rx_sock.getsockname())
+    # let the loop read all datagrams before iterating
+    while receiver.queue.qsize() + receiver.dropped_packets < len(packets):
+        await asyncio.sleep(0.01)
+    receiver.stop()
+    return [psn_data async for psn_data in receiver]
+
+
+def test_async_receiver():
+    """Test iterating over received packets"""
+
+    receiver = pypsn.AsyncReceiver()
+    received = asyncio.run(receive(receiver, [get_test_info(), get_test_data()]))
+    assert isinstance(received[0], pypsn.PsnInfoPacket)
+    assert isinstance(received[1], pypsn.PsnDataPacket)
+    assert 7 == len(received[1].trackers)
+
+
+def test_async_receiver_overflow():
+    """Test dropping packets when the queue is full"""
+
+    packets = [get_test_info()] * 3 + [get_test_data()] * 2
+    receiver = pypsn.AsyncReceiver(maxsize=2)
+    received = asyncio.run(receive(receiver, packets))
+    assert [pypsn.PsnDataPacket] * 2 == [type(p) for p in received]
+    assert 3 == receiver.dropped_packets
+
+    receiver = pypsn.AsyncReceiver(
+        maxsize=2, overflow=pypsn.PsnOverflowPolicy.DROP_NEWEST
+    )
+    received = asyncio.run(receive(receiver, packets))
+    assert [pypsn.PsnInfoPacket] * 2 == [type(p) for p in received]
+    assert 3 == receiver.dropped_packets
+
+
+def test_async_receiver_no_socket(monkeypatch):
+    """Test failing to open the multicast socket"""
+
+    monkeypatch.setattr(pypsn, "get_socket", lambda ip_addr, mcast_port: None)
+    receiver = pypsn.AsyncReceiver("192.168.1.2")
+    with pytest.raises(OSError):
+        asyncio.run(receiver.start())
@@ -0,0 +1,90 @@
+#!/bin/env python3
+"""
+Test merging frames split over several packets.
+"""
+
+import pypsn
+
+
+def make_part(frame_id, packet_count, tracker_ids):
+    """
+        Make one part of a split data frame.
+
+    Args:
+        frame_id (int): frame id
+        packet_count (int): number of parts of the frame
+        tracker_ids (list): tracker ids of this part
+
+    Returns:
+        psn data packet
+    """
+    return pypsn.PsnDataPacket(
+        info=pypsn.PsnInfo(1312, 2, 0, frame_id, packet_count),
+        trackers=[pypsn.PsnTracker(tracker_id) for tracker_id in tracker_ids],
+    )
+
+
+def test_complete_frame(pypsn_module):
+    """Test merging all parts of a frame"""
+
+    assembler = pypsn_module.PsnFrameAssembler()
+    assert assembler.add(make_part(7, 3, [0, 1]), "server_a") is None
+    assert assembler.add(make_part(7, 3, [2]), "server_a") is None
+    # same frame id from another server is a different frame
+    assert assembler.add(make_part(7, 3, [0]), "server_b") is None
+    frame = assembler.add(make_part(7, 3, [3, 4]), "server_a")
+    assert isinstance(frame, pypsn_module.PsnDataPacket)
+    assert 7 == frame.info.frame_id
+    assert [0, 1, 2, 3, 4] == [tracker.tracker_id for tracker in frame.trackers]
+    assert 1 == len(assembler.frames)
+
+    single = make_part(8, 1, [0])
+    assert single is assembler.add(single, "server_a")
+
+
+def test_info_frame(pypsn_module):
+    """Test merging parts of an info packet"""
+
+    assembler = pypsn_module.PsnFrameAssembler()
+    info = pypsn_module.PsnInfo(1312, 2, 0, 3, 2)
+    first = pypsn_module.PsnInfoPacket(
+        info, b"server", [pypsn_module.PsnTrackerInfo(0, b"zero")]
+    )
+    second = pypsn_module.PsnInfoPacket(
+        info, b"server", [pypsn_module.PsnTrackerInfo(1, b"one")]
+    )
+    assert assembler.add(first) is None
+    frame = assembler.add(second)
+    assert isinstance(frame, pypsn_module.PsnInfoPacket)
+    assert b"server" == frame.name
+    assert [b"zero", b"one"] == [tracker.tracker_name for tracker in frame.trackers]
+
+
+def test_expired_frames(pypsn_module):
+    """Test emitting incomplete frames after the deadline"""
+
+    assembler = pypsn_module.PsnFrameAssembler(timeout=0.05, max_frames=2)
+    assembler.add(make_part(1, 2, [0]))
+    assembler.add(make_part(2, 2, [0]))
+    assembler.add(make_part(3, 2, [0, 1]))
+    assert 1 == assembler.dropped_frames
+    assert [] == assembler.expire(now=0)
+
+    expired = assembler.expire(now=float("inf"))
+    assert [2, 3] == [frame.info.frame_id for frame in expired]
+    assert [0, 1] == [tracker.tracker_id for tracker in expired[1].trackers]
+    assert 0 == len(assembler.frames)
+
+
+def test_duplicate_parts(pypsn_module):
+    """Test a resent part does not complete the frame"""
+
+    assembler = pypsn_module.PsnFrameAssembler()
+    assert assembler.add(make_part(5, 3, [0, 1])) is None
+    assert assembler.add(make_part(5, 3, [0, 1])) is None
+    assert assembler.add(make_part(5, 3, [2])) is None
+    assert 1 == assembler.duplicate_parts
+
+    frame = assembler.add(make_part(5, 3, [3]))
+    assert [0, 1, 2, 3] == [tracker.tracker_id for tracker in frame.trackers]
+    assert 0 == len(assembler.frames)
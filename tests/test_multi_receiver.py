@@ -0,0 +1,65 @@
+#!/bin/env python3
+"""
+Test receiving on several ports from one thread.
+"""
+
+import socket
+import time
+
+import pytest
+
+import pypsn
+from test_own_pack_unpack import get_test_data, get_test_info
+
+
+def test_multi_receiver():
+    """Test counting the packets of each socket"""
+
+    received = []
+    interfaces = [("127.0.0.1", 56571), ("127.0.0.1", 56572)]
+    receiver = pypsn.MultiReceiver(received.append, interfaces, timeout=0.1)
+    receiver.start()
+    try:
+        with pypsn.PsnSender("236.10.10.10", "127.0.0.1", 56571) as sender:
+            sender.send(get_test_info())
+        with pypsn.PsnSender("236.10.10.10", "127.0.0.1", 56572) as sender:
+            sender.send_many([get_test_data(), get_test_data()])
+        deadline = time.monotonic() + 2
+        while len(received) < 3 and time.monotonic() < deadline:
+            time.sleep(0.01)
+    finally:
+        receiver.stop()
+
+    assert [pypsn.PsnInfoPacket, pypsn.PsnDataPacket, pypsn.PsnDataPacket] == [
+        type(psn_data) for psn_data in received
+    ]
+    stats = receiver.stats[("127.0.0.1", 56572)]
+    assert 2 == stats.packets
+    assert 2 * len(get_test_data()) == stats.bytes
+    assert 1 == receiver.stats[("127.0.0.1", 56571)].packets
+
+
+def test_multi_receiver_open_failure(monkeypatch):
+    """Test closing the opened sockets when an interface fails"""
+
+    opened = []
+
+    def get_socket(ip_addr, mcast_port):
+        if mcast_port == 56574:
+            return None
+        opened.append(socket.socket(socket.AF_INET, socket.SOCK_DGRAM))
+        return opened[-1]
+
+    monkeypatch.setattr(pypsn, "get_socket", get_socket)
+    interfaces = ["127.0.0.1", ("127.0.0.1", 56573), ("127.0.0.1", 56573)]
+    receiver = pypsn.MultiReceiver(None, interfaces, mcast_port=56573)
+    assert [("127.0.0.1", 56573)] == receiver.interfaces
+    assert 1 == len(opened)
+    receiver.close_sockets()
+    assert -1 == opened[0].fileno()
+
+    interfaces.append(("127.0.0.1", 56574))
+    with pytest.raises(OSError):
+        pypsn.MultiReceiver(None, interfaces, mcast_port=56573)
+    assert 2 == len(opened)
+    assert -1 == opened[1].fileno()
@@ -3,6 +3,8 @@
 Test packing and parsing our own data.
 """
 
+import pytest
+
 import pypsn
 
 
@@ -66,6 +68,36 @@ psn_data = pypsn.PsnDataPacket(
 )
 
 
+def make_data_packet(frame_id=56):
+    """
+        Make a data packet like psn_data, which tests can modify.
+
+    Args:
+        frame_id (int, optional): frame id. Default: 56
+
+    Returns:
+        psn data packet
+    """
+    info = pypsn.PsnInfo(1312, 2, 0, frame_id, 1)
+    return pypsn.PsnDataPacket(
+        info=info,
+        trackers=[
+            pypsn.PsnTracker(
+                tracker_id=tracker.tracker_id,
+                info=info,
+                pos=pypsn.PsnVector3(1.0, 1.0, 1.0),
+                speed=pypsn.PsnVector3(1.0, 1.0, 1.0),
+                ori=pypsn.PsnVector3(1.0, 1.0, 1.0),
+                accel=pypsn.PsnVector3(1.0, 1.0, 1.0),
+                trgtpos=pypsn.PsnVector3(1.0, 1.0, 1.0),
+                status=0.5,
+                timestamp=info.timestamp,
+            )
+            for tracker in psn_info.trackers
+        ],
+    )
+
+
 def get_test_data():
     """
         Get test data.
@@ -141,3 +173,392 @@ def test_info_data(pypsn_module):
             assert ("tracker_" + str(tracker_id)).encode("UTF-8") == data.trackers[
                 tracker_id
             ].tracker_name
+
+
+def test_data_from_bytearray(pypsn_module):
+    """Test parsing from a mutable buffer and a memoryview"""
+
+    hexdata = get_test_data()
+    for buffer in (bytearray(hexdata), memoryview(hexdata)):
+        data = pypsn_module.parse_psn_packet(buffer)
+        assert isinstance(data, pypsn_module.PsnDataPacket)
+        assert 7 == len(data.trackers)
+        assert pypsn_module.PsnVector3(1.0, 1.0, 1.0) == data.trackers[6].trgtpos
+        assert 1312 == data.trackers[6].timestamp
+
+    info = pypsn_module.parse_psn_packet(bytearray(get_test_info()))
+    assert b"system_name_001" == info.name
+    assert b"tracker_6" == info.trackers[6].tracker_name
+
+
+def test_tracker_chunk_decoders(pypsn_module):
+    """Test the decoder table covers every tracker chunk"""
+
+    chunk_ids = set(pypsn_module.PsnTrackerChunk) | set(
+        pypsn_module.PsnTrackerChunkInfo
+    )
+    assert chunk_ids == set(pypsn_module.TRACKER_CHUNK_DECODERS)
+
+    data = pypsn_module.parse_psn_packet(get_test_data(), zero_copy=False)
+    assert pypsn_module.PsnVector3(1.0, 1.0, 1.0) == data.trackers[3].accel
+    assert 0.5 == data.trackers[3].status
+
+
+def test_lazy_data(pypsn_module):
+    """Test lazily decoded trackers"""
+
+    data = pypsn_module.parse_psn_packet(bytearray(get_test_data()), lazy=True)
+    assert isinstance(data, pypsn_module.PsnLazyDataPacket)
+    assert isinstance(data, pypsn_module.PsnDataPacket)
+    assert 56 == data.info.frame_id
+    assert 7 == len(data.trackers)
+    assert list(range(7)) == data.trackers.tracker_ids
+    assert data.trackers.decoded == [None] * 7
+
+    assert pypsn_module.PsnVector3(1.0, 1.0, 1.0) == data.trackers[4].pos
+    assert data.trackers[4] is data.trackers.get(4)
+    assert data.trackers.decoded[3] is None
+    assert [0, 1, 2, 3, 4, 5, 6] == [t.tracker_id for t in data.trackers]
+    assert 1312 == data.trackers[-1].timestamp
+    assert data.trackers.get(42) is None
+
+    info = pypsn_module.parse_psn_packet(get_test_info(), lazy=True)
+    assert isinstance(info, pypsn_module.PsnInfoPacket)
+
+
+def test_batch_data(pypsn_module):
+    """Test columnar decoding of many packets"""
+
+    np = pytest.importorskip("numpy")
+    batch = pypsn_module.parse_psn_packets_batch(
+        [get_test_data(), get_test_info(), get_test_data()]
+    )
+    assert 14 == len(batch)
+    assert [56, 56] == batch.packet_frame_id.tolist()
+    assert [1312, 1312] == batch.packet_timestamp.tolist()
+    assert [0] * 7 + [1] * 7 == batch.packet_index.tolist()
+    assert list(range(7)) * 2 == batch.tracker_id.tolist()
+    assert (14, 3) == batch.pos.shape
+    assert np.float32 == batch.trgtpos.dtype
+    assert np.all(batch.accel == 1.0)
+    assert np.all(batch.status == 0.5)
+    assert np.all(batch.timestamp == 1312)
+    assert np.all(batch.has_pos)
+    assert np.all(batch.has_timestamp)
+
+    # not in the canonical layout, decoded by the generic chunk walker
+    unknown = bytearray(get_test_data())
+    unknown[24 + 104 * 6 + 4] = 0x7F
+    batch = pypsn_module.parse_psn_packets_batch([bytes(unknown)])
+    assert [True] * 6 + [False] == batch.has_pos.tolist()
+    assert np.all(batch.speed == 1.0)
+
+
+def test_fixed_layout_fallback(pypsn_module):
+    """Test canonical tracker layout against the generic chunk walker"""
+
+    canonical = get_test_data()
+    # clear the has-subchunks bit of one pos length, valid but not canonical
+    generic = bytearray(canonical)
+    generic[24 + 7] &= 0x7F
+    # pos of the last tracker as a sub-chunk this parser does not know
+    unknown = bytearray(canonical)
+    unknown[24 + 104 * 6 + 4] = 0x7F
+
+    fast = pypsn_module.parse_psn_packet(canonical)
+    walked = pypsn_module.parse_psn_packet(generic)
+    for tracker, walked_tracker in zip(fast.trackers, walked.trackers):
+        for field in ("pos", "speed", "ori", "accel", "trgtpos"):
+            assert getattr(tracker, field) == getattr(walked_tracker, field)
+        assert tracker.status == walked_tracker.status
+        assert tracker.timestamp == walked_tracker.timestamp
+
+    tracker = pypsn_module.parse_psn_packet(unknown).trackers[6]
+    assert tracker.pos is None
+    assert pypsn_module.PsnVector3(1.0, 1.0, 1.0) == tracker.speed
+
+
+def test_info_cache(pypsn_module):
+    """Test reusing info packets whose content did not change"""
+
+    cache = pypsn_module.PsnInfoCache(maxsize=1)
+    first = pypsn_module.parse_psn_packet(get_test_info(), info_cache=cache)
+    # same content in the next frame
+    next_info = pypsn_module.PsnInfoPacket(
+        pypsn_module.PsnInfo(1312, 2, 0, 57, 1), psn_info.name, psn_info.trackers
+    )
+    second = pypsn_module.parse_psn_packet(
+        pypsn_module.prepare_psn_info_packet_bytes(next_info), info_cache=cache
+    )
+    assert (1, 1) == (cache.hits, cache.misses)
+    assert 56 == first.info.frame_id
+    assert 57 == second.info.frame_id
+    assert b"system_name_001" == second.name
+    assert first.trackers is second.trackers
+    assert b"tracker_3" == second.trackers[3].tracker_name
+    assert "tracker_3" == second.get_tracker_names()[3]
+    assert first.get_tracker_names() is second.get_tracker_names()
+
+    other = pypsn_module.PsnInfoPacket(
+        psn_info.info, "other", [pypsn_module.PsnTrackerInfo(0, "zero")]
+    )
+    assert {0: "zero"} == other.get_tracker_names()
+    pypsn_module.parse_psn_packet(
+        pypsn_module.prepare_psn_info_packet_bytes(other), info_cache=cache
+    )
+    assert 1 == len(cache.entries)
+    assert 2 == cache.misses
+
+
+def test_compact_classes(pypsn_module):
+    """Test slotted classes and the frozen vector"""
+
+    data = pypsn_module.parse_psn_packet(get_test_data())
+    tracker = data.trackers[0]
+    for instance in (data, data.info, tracker, tracker.pos, psn_info.trackers[0]):
+        assert not hasattr(instance, "__dict__")
+
+    vector = pypsn_module.PsnVector3(1.0, 2.0, 3.0)
+    frozen = vector.freeze()
+    assert isinstance(frozen, pypsn_module.PsnFrozenVector3)
+    assert frozen == vector
+    assert vector == frozen
+    assert vector != (1.0, 2.0, 3.0)
+    assert [1.0, 2.0, 3.0] == list(frozen)
+    assert "1.0, 2.0, 3.0" == str(frozen)
+    assert {frozen: "tracker"}[pypsn_module.PsnFrozenVector3(1.0, 2.0, 3.0)]
+
+
+def test_tracker_pool(pypsn_module):
+    """Test reusing tracker instances between packets"""
+
+    pool = pypsn_module.PsnTrackerPool()
+    first = pypsn_module.parse_psn_packet(
+        get_test_data(), tracker_pool=pool, source="server_a"
+    )
+    kept = first.trackers[2].copy()
+    tracker = first.trackers[2]
+    pos = tracker.pos
+
+    data_packet = make_data_packet()
+    data_packet.trackers[2].pos.x = 2.0
+    second = pypsn_module.parse_psn_packet(
+        pypsn_module.prepare_psn_data_packet_bytes(data_packet),
+        tracker_pool=pool,
+        source="server_a",
+    )
+    assert second.trackers[2] is tracker
+    assert second.trackers[2].pos is pos
+    assert pypsn_module.PsnVector3(2.0, 1.0, 1.0) == pos
+    assert pypsn_module.PsnVector3(1.0, 1.0, 1.0) == kept.pos
+    assert kept.pos is not pos
+
+    other = pypsn_module.parse_psn_packet(
+        get_test_data(), tracker_pool=pool, source="server_b"
+    )
+    assert other.trackers[2] is not tracker
+    assert pypsn_module.PsnVector3(2.0, 1.0, 1.0) == tracker.pos
+
+    # fields missing from the next packet are cleared, not left stale
+    sparse = bytearray(get_test_data())
+    sparse[24 + 104 * 2 + 4] = 0x7F
+    pypsn_module.parse_psn_packet(bytes(sparse), tracker_pool=pool, source="server_a")
+    assert tracker.pos is None
+    assert pypsn_module.PsnVector3(1.0, 1.0, 1.0) == tracker.speed
+
+
+def test_pack_into(pypsn_module):
+    """Test encoding into a caller supplied buffer"""
+
+    size = pypsn_module.get_psn_data_packet_size(psn_data)
+    assert 24 + 7 * 104 == size
+    buffer = bytearray(size + 10)
+    assert size == pypsn_module.pack_psn_data_packet_into(psn_data, buffer, 10)
+    assert get_test_data() == buffer[10:]
+
+    size = pypsn_module.get_psn_info_packet_size(psn_info)
+    buffer = bytearray(size)
+    assert size == pypsn_module.pack_psn_info_packet_into(psn_info, buffer)
+    assert get_test_info() == buffer
+
+    with pytest.raises(ValueError):
+        pypsn_module.pack_psn_info_packet_into(psn_info, bytearray(size - 1))
+    too_large = pypsn_module.PsnDataPacket(psn_data.info, psn_data.trackers * 50)
+    with pytest.raises(ValueError):
+        pypsn_module.prepare_psn_data_packet_bytes(too_large)
+
+
+def test_incremental_encoder(pypsn_module):
+    """Test re-packing only the changed trackers"""
+
+    data_packet = make_data_packet()
+    encoder = pypsn_module.PsnDataEncoder()
+    assert get_test_data() == encoder.encode(data_packet)
+    assert 7 == encoder.packed_trackers
+
+    data_packet.info.frame_id = 57
+    packet = encoder.encode(data_packet)
+    assert 0 == encoder.packed_trackers
+    assert pypsn_module.prepare_psn_data_packet_bytes(data_packet) == packet
+
+    data_packet.trackers[5].pos.y = 2.0
+    packet = encoder.encode(data_packet)
+    assert 1 == encoder.packed_trackers
+    assert pypsn_module.prepare_psn_data_packet_bytes(data_packet) == packet
+    data = pypsn_module.parse_psn_packet(packet)
+    assert 57 == data.info.frame_id
+    assert pypsn_module.PsnVector3(1.0, 2.0, 1.0) == data.trackers[5].pos
+
+    data_packet.trackers = data_packet.trackers[:3]
+    assert pypsn_module.prepare_psn_data_packet_bytes(data_packet) == encoder.encode(
+        data_packet
+    )
+    assert 3 == encoder.packed_trackers
+
+
+def test_encode_changed_trackers(pypsn_module):
+    """Test re-packing only the trackers the caller marked as changed"""
+
+    data_packet = make_data_packet()
+    encoder = pypsn_module.PsnDataEncoder()
+    assert get_test_data() == encoder.encode(data_packet, changed=set())
+    assert 7 == encoder.packed_trackers
+
+    data_packet.info.frame_id = 57
+    data_packet.trackers[5].pos.y = 2.0
+    # a change not passed in changed is not seen
+    data_packet.trackers[6].pos.y = 3.0
+    packet = encoder.encode(data_packet, changed={5, 42})
+    assert 1 == encoder.packed_trackers
+    data = pypsn_module.parse_psn_packet(packet)
+    assert 57 == data.info.frame_id
+    assert pypsn_module.PsnVector3(1.0, 2.0, 1.0) == data.trackers[5].pos
+    assert pypsn_module.PsnVector3(1.0, 1.0, 1.0) == data.trackers[6].pos
+
+    # other trackers or layouts are encoded again
+    data_packet.trackers[2].speed = None
+    sparse = pypsn_module.PsnDataEncoder(sparse=True)
+    sparse.encode(make_data_packet(), changed=set())
+    assert pypsn_module.prepare_psn_data_packet_bytes(
+        data_packet, sparse=True
+    ) == sparse.encode(data_packet, changed={2})
+    assert 7 == sparse.packed_trackers
+    data_packet.trackers = data_packet.trackers[:3]
+    assert pypsn_module.prepare_psn_data_packet_bytes(
+        data_packet, sparse=True
+    ) == sparse.encode(data_packet, changed=set())
+    assert 3 == sparse.packed_trackers
+
+
+def test_split_packets(pypsn_module):
+    """Test splitting frames into packets fitting the MTU"""
+
+    data_packet = pypsn_module.PsnDataPacket(psn_data.info, psn_data.trackers * 5)
+    packets = pypsn_module.prepare_psn_data_packets_bytes(data_packet)
+    assert [13 * 104 + 24] * 2 + [9 * 104 + 24] == [len(p) for p in packets]
+    assembler = pypsn_module.PsnFrameAssembler()
+    for packet in packets:
+        data = pypsn_module.parse_psn_packet(packet)
+        assert 56 == data.info.frame_id
+        assert 3 == data.info.packet_count
+        frame = assembler.add(data)
+    assert list(range(7)) * 5 == [tracker.tracker_id for tracker in frame.trackers]
+    assert 1 == psn_data.info.packet_count
+
+    assert [get_test_data()] == pypsn_module.prepare_psn_data_packets_bytes(psn_data)
+    packets = pypsn_module.prepare_psn_data_packets_bytes(psn_data, 24 + 3 * 104)
+    assert 3 == len(packets)
+    with pytest.raises(ValueError):
+        pypsn_module.prepare_psn_data_packets_bytes(psn_data, 100)
+
+    packets = pypsn_module.prepare_psn_info_packets_bytes(psn_info, 100)
+    assert all(len(packet) <= 100 for packet in packets)
+    infos = [pypsn_module.parse_psn_packet(packet) for packet in packets]
+    assert all(len(packets) == info.info.packet_count for info in infos)
+    assert [b"system_name_001"] * len(packets) == [info.name for info in infos]
+    assert [("tracker_" + str(i)).encode() for i in range(7)] == [
+        tracker.tracker_name for info in infos for tracker in info.trackers
+    ]
+    assert [get_test_info()] == pypsn_module.prepare_psn_info_packets_bytes(psn_info)
+
+
+def test_sparse_encoding(pypsn_module):
+    """Test encoding only the tracker fields which are set"""
+
+    data_packet = pypsn_module.PsnDataPacket(
+        psn_info.info,
+        [
+            pypsn_module.PsnTracker(
+                tracker_id=i,
+                pos=pypsn_module.PsnVector3(1.0, 2.0, 3.0),
+                status=None,
+                timestamp=1312 + i,
+            )
+            for i in range(3)
+        ]
+        + [psn_data.trackers[3]],
+    )
+    hexdata = pypsn_module.prepare_psn_data_packet_bytes(data_packet, sparse=True)
+    assert 24 + 3 * (4 + 16 + 12) + 104 == len(hexdata)
+    assert len(hexdata) == pypsn_module.get_psn_data_packet_size(data_packet, True)
+    assert ("pos", "timestamp") in pypsn_module.TRACKER_TEMPLATES
+
+    data = pypsn_module.parse_psn_packet(hexdata)
+    assert pypsn_module.PsnVector3(1.0, 2.0, 3.0) == data.trackers[2].pos
+    assert data.trackers[2].speed is None
+    assert 1314 == data.trackers[2].timestamp
+    assert pypsn_module.PsnVector3(1.0, 1.0, 1.0) == data.trackers[3].trgtpos
+
+    packets = pypsn_module.prepare_psn_data_packets_bytes(
+        data_packet, 24 + 104, sparse=True
+    )
+    assert [24 + 3 * 32, 24 + 104] == [len(p) for p in packets]
+    packets = pypsn_module.split_psn_data_packet(data_packet, 24 + 104, True)
+    assert [3, 1] == [len(packet.trackers) for packet in packets]
+
+    encoder = pypsn_module.PsnDataEncoder(sparse=True)
+    assert hexdata == encoder.encode(data_packet)
+    data_packet.trackers[1].pos.x = 4.0
+    assert len(hexdata) == len(encoder.encode(data_packet))
+    assert 1 == encoder.packed_trackers
+    data_packet.trackers[1].speed = pypsn_module.PsnVector3(1.0, 1.0, 1.0)
+    assert 24 + 2 * 32 + 48 + 104 == len(encoder.encode(data_packet))
+    assert 4 == encoder.packed_trackers
+
+
+def test_encode_data_from_arrays(pypsn_module):
+    """Test encoding trackers from numpy arrays"""
+    np = pytest.importorskip("numpy")
+
+    pos = np.arange(60, dtype=np.float32).reshape(20, 3)
+    status = np.full(20, 0.5)
+    timestamp = np.arange(20, dtype=np.uint64)
+    info = pypsn_module.PsnInfo(1312, 2, 0, 7, 1)
+    packets = pypsn_module.encode_data_from_arrays(
+        np.arange(20), pos=pos, status=status, timestamp=timestamp, info=info
+    )
+
+    data_packet = pypsn_module.PsnDataPacket(
+        info,
+        [
+            pypsn_module.PsnTracker(
+                tracker_id=i,
+                pos=pypsn_module.PsnVector3(*(float(v) for v in pos[i])),
+                status=0.5,
+                timestamp=i,
+            )
+            for i in range(20)
+        ],
+    )
+    assert packets == pypsn_module.prepare_psn_data_packets_bytes(
+        data_packet, sparse=True
+    )
+
+    packets = pypsn_module.encode_data_from_arrays(
+        np.arange(20), pos, pos, pos, status, pos, pos, timestamp, info
+    )
+    assert [1376, 24 + 7 * 104] == [len(p) for p in packets]
+    batch = pypsn_module.parse_psn_packets_batch(packets)
+    assert (batch.trgtpos == pos).all()
+    assert (batch.timestamp == timestamp).all()
+    assert (batch.packet_frame_id == 7).all()
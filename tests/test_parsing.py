@@ -4,8 +4,11 @@ Test parsing on some real world data.
 """
 
 import binascii
+import struct
 from pathlib import Path
 
+import pytest
+
 
 def test_data_data(pypsn_module):
     """Test position"""
@@ -73,3 +76,140 @@ def test_info_data(pypsn_module):
             data = pypsn_module.parse_psn_packet(hexdata)
             if isinstance(data, pypsn_module.PsnInfoPacket):
                 assert data.trackers[0].tracker_name == b"RoboCamera"
+
+
+def test_zero_copy_matches_slicing(pypsn_module):
+    """Test zero copy parser against the slicing parser"""
+
+    test_data_file_path = Path(Path(__file__).parents[0], "data.log")
+
+    with open(test_data_file_path, encoding="UTF-8") as psn_data:
+        for psn_line in psn_data.readlines():
+            hexdata = binascii.unhexlify(psn_line.strip())
+            data = pypsn_module.parse_psn_packet(hexdata, zero_copy=True)
+            legacy = pypsn_module.parse_psn_packet(hexdata, zero_copy=False)
+            assert type(data) is type(legacy)
+            assert data.info.timestamp == legacy.info.timestamp
+            assert data.info.frame_id == legacy.info.frame_id
+            if isinstance(data, pypsn_module.PsnDataPacket):
+                for tracker, legacy_tracker in zip(data.trackers, legacy.trackers):
+                    assert tracker.tracker_id == legacy_tracker.tracker_id
+                    assert tracker.pos == legacy_tracker.pos
+                    assert tracker.ori == legacy_tracker.ori
+                    assert tracker.status == legacy_tracker.status
+            if isinstance(data, pypsn_module.PsnInfoPacket):
+                assert data.name == legacy.name
+                assert data.trackers[0].tracker_name == legacy.trackers[0].tracker_name
+
+
+def test_batch_data(pypsn_module):
+    """Test columnar decoding of real world data"""
+
+    pytest.importorskip("numpy")
+    test_data_file_path = Path(Path(__file__).parents[0], "data.log")
+
+    with open(test_data_file_path, encoding="UTF-8") as psn_data:
+        buffers = [binascii.unhexlify(line.strip()) for line in psn_data]
+    batch = pypsn_module.parse_psn_packets_batch(buffers)
+    assert 1 == len(batch)
+    assert [56] == batch.packet_frame_id.tolist()
+    assert [288058234] == batch.packet_timestamp.tolist()
+    assert pypsn_module.PsnVector3(
+        0.20273426175117493, 6.0, -9.693662643432617
+    ) == pypsn_module.PsnVector3(*batch.pos[0].tolist())
+    assert batch.has_ori[0]
+    assert not batch.has_accel[0]
+    assert not batch.has_timestamp[0]
+
+
+def test_tracker_filter(pypsn_module):
+    """Test only parsing some trackers and fields"""
+
+    trackers = [
+        pypsn_module.PsnTracker(
+            i,
+            pos=pypsn_module.PsnVector3(i, 0.0, 0.0),
+            speed=pypsn_module.PsnVector3(0.0, i, 0.0),
+            ori=pypsn_module.PsnVector3(0.0, 0.0, i),
+            status=0.5,
+            accel=pypsn_module.PsnVector3(1.0, 1.0, 1.0),
+            trgtpos=pypsn_module.PsnVector3(2.0, 2.0, 2.0),
+            timestamp=i,
+        )
+        for i in range(10)
+    ]
+    data = pypsn_module.prepare_psn_data_packet_bytes(
+        pypsn_module.PsnDataPacket(pypsn_module.PsnInfo(0, 2, 0, 1, 1), trackers)
+    )
+
+    packet = pypsn_module.parse_psn_packet(data, tracker_ids={3, 7, 42})
+    assert [3, 7] == [tracker.tracker_id for tracker in packet.trackers]
+    assert pypsn_module.PsnVector3(0.0, 7.0, 0.0) == packet.trackers[1].speed
+
+    packet = pypsn_module.parse_psn_packet(
+        data, tracker_ids={3}, fields={"pos", "timestamp"}
+    )
+    tracker = packet.trackers[0]
+    assert pypsn_module.PsnVector3(3.0, 0.0, 0.0) == tracker.pos
+    assert 3 == tracker.timestamp
+    assert tracker.speed is None
+    assert tracker.trgtpos is None
+
+    pool = pypsn_module.PsnTrackerPool()
+    packet = pypsn_module.parse_psn_packet(
+        data, tracker_pool=pool, tracker_ids={3}, fields={"pos", "timestamp"}
+    )
+    tracker = packet.trackers[0]
+    assert pypsn_module.PsnVector3(3.0, 0.0, 0.0) == tracker.pos
+    assert 3 == tracker.timestamp
+    assert tracker.speed is None
+    assert tracker is pool.entries[(None, 3)][0]
+
+    packet = pypsn_module.parse_psn_packet(data, tracker_ids={42})
+    assert 1 == packet.info.frame_id
+    assert [] == list(packet.trackers)
+
+    packet = pypsn_module.parse_psn_packet(data, lazy=True, tracker_ids={3, 7})
+    assert [3, 7] == packet.trackers.tracker_ids
+    assert pypsn_module.PsnVector3(0.0, 0.0, 7.0) == packet.trackers[1].ori
+
+    packet = pypsn_module.parse_psn_packet(data, zero_copy=False, tracker_ids={5})
+    assert [5] == [tracker.tracker_id for tracker in packet.trackers]
+
+
+def test_short_field_chunk(pypsn_module):
+    """Test field chunks shorter than their struct are skipped"""
+
+    tracker = (
+        # pos chunk only carrying 4 of its 12 bytes
+        struct.pack("<HHf", pypsn_module.PsnTrackerChunk.PSN_DATA_TRACKER_POS, 4, 1.0)
+        + struct.pack(
+            "<HHf", pypsn_module.PsnTrackerChunkInfo.PSN_DATA_TRACKER_STATUS, 4, 0.5
+        )
+    )
+    tracker_list = struct.pack("<HH", 3, len(tracker) | (1 << 15)) + tracker
+    header = struct.pack("<HHQBBBB", 0, 12, 1000, 2, 0, 5, 1)
+    body = header + struct.pack("<HH", 1, len(tracker_list) | (1 << 15)) + tracker_list
+    data = struct.pack("<HH", 0x6755, len(body) | (1 << 15)) + body
+
+    for packet in (
+        pypsn_module.parse_psn_packet(data),
+        pypsn_module.parse_psn_packet(data, zero_copy=False),
+        pypsn_module.parse_psn_packet(data, fields={"pos", "status"}),
+        pypsn_module.parse_psn_packet(data, tracker_pool=pypsn_module.PsnTrackerPool()),
+    ):
+        assert 5 == packet.info.frame_id
+        assert packet.trackers[0].pos is None
+        assert 0.5 == packet.trackers[0].status
+
+    table = pypsn_module.TrackerTable(max_trackers=5)
+    assert 1 == table.update_from_buffer(data)
+    assert table.get(3).pos is None
+    assert 0.5 == table.get(3).status
+
+    # a truncated packet header drops the packet instead of raising
+    short = struct.pack("<HH", 0, 4) + bytes(4)
+    body = short + struct.pack("<HH", 1, len(tracker_list) | (1 << 15)) + tracker_list
+    data = struct.pack("<HH", 0x6755, len(body) | (1 << 15)) + body
+    assert pypsn_module.parse_psn_packet(data) is None
+    assert pypsn_module.parse_psn_packet(data, zero_copy=False) is None
@@ -0,0 +1,110 @@
+#!/bin/env python3
+"""
+Test the queues and threads of the pipelined receiver.
+"""
+
+import threading
+import time
+
+import pypsn
+from test_own_pack_unpack import get_test_info
+
+
+def make_data(frame_id, tracker_ids):
+    """
+        Make a data packet with x of the positions set to the frame id.
+
+    Args:
+        frame_id (int): frame id
+        tracker_ids (list): tracker ids
+
+    Returns:
+        psn data packet
+    """
+    return pypsn.PsnDataPacket(
+        pypsn.PsnInfo(0, 2, 0, frame_id, 1),
+        [
+            pypsn.PsnTracker(i, pos=pypsn.PsnVector3(frame_id, 0.0, 0.0))
+            for i in tracker_ids
+        ],
+    )
+
+
+def test_queue_latest():
+    """Test merging queued data packets per source"""
+
+    queue = pypsn.PsnPacketQueue(4, pypsn.PsnOverflowPolicy.LATEST)
+    queue.put(make_data(1, [1, 2]), "a")
+    queue.put(make_data(1, [1]), "b")
+    queue.put(make_data(2, [2, 3]), "a")
+    queue.put(make_data(3, [1]), "a")
+    assert 2 == len(queue)
+    assert 2 == queue.coalesced
+
+    packet = queue.get()
+    assert 3 == packet.info.frame_id
+    assert [(1, 3), (2, 2), (3, 2)] == [
+        (t.tracker_id, t.pos.x) for t in packet.trackers
+    ]
+    assert [1] == [t.tracker_id for t in queue.get().trackers]
+    queue.put(make_data(4, [1]), "a")
+    assert 4 == queue.get().info.frame_id
+    queue.close()
+    assert queue.get() is None
+
+
+def test_queue_drop():
+    """Test dropping items of a full queue"""
+
+    queue = pypsn.PsnPacketQueue(2, pypsn.PsnOverflowPolicy.DROP_OLDEST)
+    for item in range(4):
+        queue.put(item)
+    assert [2, 3] == [queue.get(), queue.get()]
+    assert 2 == queue.dropped
+
+    queue = pypsn.PsnPacketQueue(2, pypsn.PsnOverflowPolicy.DROP_NEWEST)
+    for item in range(4):
+        queue.put(item)
+    assert [0, 1] == [queue.get(), queue.get()]
+    assert 2 == queue.dropped
+
+
+def test_queue_block():
+    """Test waiting for room in a full queue"""
+
+    queue = pypsn.PsnPacketQueue(2, pypsn.PsnOverflowPolicy.BLOCK)
+    putter = threading.Thread(target=lambda: [queue.put(item) for item in range(4)])
+    putter.start()
+    time.sleep(0.05)
+    assert 2 == len(queue)
+    assert [0, 1, 2, 3] == [queue.get() for _ in range(4)]
+    putter.join()
+    assert 0 == queue.dropped
+
+
+def test_pipelined_receiver():
+    """Test a slow callback getting the latest state of the trackers"""
+
+    received = []
+
+    def callback(psn_data):
+        received.append(psn_data)
+        time.sleep(0.05)
+
+    receiver = pypsn.PipelinedReceiver(callback, "127.0.0.1", timeout=0.1)
+    receiver.start()
+    try:
+        receiver.handle(get_test_info(), ("192.168.1.2", 56565))
+        for frame_id in range(20):
+            data = pypsn.prepare_psn_data_packet_bytes(
+                make_data(frame_id, [1, 2]), sparse=True
+            )
+            receiver.handle(memoryview(data), ("192.168.1.2", 56565))
+        time.sleep(0.1)
+    finally:
+        receiver.stop()
+
+    assert isinstance(received[0], pypsn.PsnInfoPacket)
+    assert len(received) < 21
+    assert 19 == received[-1].info.frame_id
+    assert [19.0, 19.0] == [tracker.pos.x for tracker in received[-1].trackers]
@@ -0,0 +1,38 @@
+#!/bin/env python3
+"""
+Test receiving bursts of datagrams into preallocated buffers.
+"""
+
+import socket
+
+import pytest
+
+import pypsn
+from test_own_pack_unpack import get_test_data
+
+
+@pytest.mark.parametrize("batch", [True, False])
+def test_receive_ring(batch):
+    """Test draining a burst of datagrams"""
+
+    ring = pypsn.PsnReceiveRing(8, batch=batch)
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as rx_sock:
+        rx_sock.bind(("127.0.0.1", 0))
+        rx_sock.settimeout(2)
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as tx_sock:
+            tx_sock.bind(("127.0.0.1", 0))
+            packets = [get_test_data()] + [bytes([i]) * (i + 1) for i in range(9)]
+            for packet in packets:
+                tx_sock.sendto(packet, rx_sock.getsockname())
+
+            burst = ring.receive(rx_sock)
+            data = pypsn.parse_psn_packet(burst[0][0])
+            assert 7 == len(data.trackers)
+            received = []
+            while len(received) < len(packets):
+                if received:
+                    burst = ring.receive(rx_sock)
+                if batch and pypsn.RECVMMSG is not None:
+                    assert len(burst) == min(8, len(packets) - len(received))
+                received += [(bytes(data), address) for data, address in burst]
+            assert [(p, tx_sock.getsockname()) for p in packets] == received
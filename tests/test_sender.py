@@ -0,0 +1,87 @@
+#!/bin/env python3
+"""
+Test sending packets over a persistent socket.
+"""
+
+import socket
+
+import pytest
+
+import pypsn
+
+
+def make_receiving_socket():
+    """
+        Open a unicast socket on localhost.
+
+    Returns:
+        socket and its port
+    """
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.bind(("127.0.0.1", 0))
+    sock.settimeout(2)
+    return sock, sock.getsockname()[1]
+
+
+def test_sender():
+    """Test sending one and many packets over one socket"""
+
+    sock, port = make_receiving_socket()
+    with sock, pypsn.PsnSender(None, "127.0.0.1", port) as sender:
+        sender.send(b"first")
+        sender.send_many([b"second", b"third"])
+        assert [b"first", b"second", b"third"] == [sock.recv(16) for _ in range(3)]
+
+        pypsn.send_psn_packet(b"fourth", None, "127.0.0.1", port)
+        assert b"fourth" == sock.recv(16)
+
+
+@pytest.mark.parametrize("batch", [True, False])
+def test_sender_destinations(batch):
+    """Test sending a split frame to several destinations"""
+
+    receivers = [make_receiving_socket() for _ in range(3)]
+    destinations = [("127.0.0.1", port) for _, port in receivers]
+    packets = [b"first", bytearray(b"second"), memoryview(b"third")]
+    with pypsn.PsnSender(None, destinations=destinations, batch=batch) as sender:
+        sender.send_many(packets)
+        sender.send(b"fourth")
+    for sock, _ in receivers:
+        with sock:
+            assert [b"first", b"second", b"third", b"fourth"] == [
+                sock.recv(16) for _ in range(4)
+            ]
+
+
+def test_sendmmsg():
+    """Test sending datagrams in one batch"""
+
+    sock, port = make_receiving_socket()
+    with sock, socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as tx_sock:
+        packets = [bytes([i]) * 100 for i in range(20)]
+        addresses = [("127.0.0.1", port)] * 2
+        assert 40 == pypsn.sendmmsg(tx_sock, packets, addresses)
+        assert packets * 2 == [sock.recv(200) for _ in range(40)]
+
+
+def test_sender_close(monkeypatch):
+    """Test closing the socket, also when the setup fails"""
+
+    sender = pypsn.PsnSender("236.10.10.10", "127.0.0.1", 56599)
+    sender.send_many([b"first", b"second"])
+    sender.close()
+    sender.close()
+    assert not sender.sock.is_opened
+
+    sender = pypsn.PsnSender(None, "127.0.0.1", 56599)
+    sender.close()
+    assert -1 == sender.sock.fileno()
+
+    opened = []
+    tx_socket = socket.socket
+    monkeypatch.setattr(
+        socket, "socket", lambda *args: opened.append(tx_socket(*args)) or opened[-1]
+    )
+    with pytest.raises(OSError):
+        pypsn.PsnSender(None, destinations=["host.invalid"])
+    assert -1 == opened[0].fileno()
@@ -0,0 +1,89 @@
+#!/bin/env python3
+"""
+Test the scheduled PSN server.
+"""
+
+import time
+
+import pypsn
+
+
+class CollectingSender:
+    """
+    Sender keeping the packets instead of sending them
+    """
+
+    def __init__(self):
+        self.packets = []
+
+    def send(self, psn_packet):
+        self.packets.append(bytes(psn_packet))
+
+    def send_many(self, psn_packets):
+        self.packets.extend(bytes(psn_packet) for psn_packet in psn_packets)
+
+
+def get_trackers():
+    return [pypsn.PsnTracker(i, pos=pypsn.PsnVector3(1.0, 2.0, 3.0)) for i in range(20)]
+
+
+def test_server():
+    """Test sending data and info at their own rates"""
+
+    sender = CollectingSender()
+    server = pypsn.PsnServer(
+        get_trackers,
+        sender,
+        "test",
+        {1: "one"},
+        data_rate=100,
+        info_rate=10,
+        sparse=True,
+    )
+    server.frame_id = 250
+    server.start()
+    time.sleep(0.3)
+    server.stop()
+
+    packets = [pypsn.parse_psn_packet(packet) for packet in sender.packets]
+    data = [p for p in packets if isinstance(p, pypsn.PsnDataPacket)]
+    infos = [p for p in packets if isinstance(p, pypsn.PsnInfoPacket)]
+    assert 20 <= server.data_frames == len(data) <= 31
+    assert 2 <= server.info_frames == len(infos) <= 4
+    assert [(250 + i) & 0xFF for i in range(len(data))] == [
+        p.info.frame_id for p in data
+    ]
+    timestamps = [p.info.timestamp for p in data]
+    assert timestamps == sorted(timestamps)
+    assert b"test" == infos[0].name
+    assert [b"0", b"one", b"2"] == [t.tracker_name for t in infos[-1].trackers[:3]]
+
+
+def test_server_schedule():
+    """Test the deadlines after missing frames"""
+
+    server = pypsn.PsnServer(get_trackers, CollectingSender(), data_rate=10)
+    assert 0.1 == server.schedule(0.0, 0.05)
+    assert 0 == server.missed_deadlines
+    assert 0.4 == round(server.schedule(0.1, 0.35), 6)
+    assert 2 == server.missed_deadlines
+    assert 0.25 == round(server.max_lateness, 6)
+
+    server = pypsn.PsnServer(
+        get_trackers,
+        CollectingSender(),
+        data_rate=10,
+        policy=pypsn.PsnSchedulePolicy.CATCH_UP,
+    )
+    assert 0.2 == round(server.schedule(0.1, 0.35), 6)
+    assert 1 == server.missed_deadlines
+    assert 3.1 == round(server.schedule(0.1, 3.05), 6)
+
+
+def test_server_system_name():
+    """Test the system name not being the thread name"""
+
+    server = pypsn.PsnServer(get_trackers, CollectingSender(), name="test")
+    assert "test" == server.system_name
+    server.name = "sender thread"
+    assert "test" == server.system_name
@@ -0,0 +1,95 @@
+#!/bin/env python3
+"""
+Test sharing the latest tracker state between processes.
+"""
+
+import struct
+import time
+
+import pytest
+
+import pypsn
+from test_own_pack_unpack import get_test_data
+
+
+def test_shared_table():
+    """Test writing and reading the shared rows"""
+
+    with pypsn.SharedTrackerTable(max_trackers=16, create=True) as table:
+        with pypsn.SharedTrackerTable(table.name) as reader:
+            assert 16 == reader.max_trackers
+            assert reader.get(1) is None
+
+            packet = pypsn.PsnDataPacket(
+                pypsn.PsnInfo(1312, 2, 0, 9, 1),
+                [
+                    pypsn.PsnTracker(1, pos=pypsn.PsnVector3(1.0, 2.0, 3.0)),
+                    pypsn.PsnTracker(3, status=0.5, timestamp=42),
+                    pypsn.PsnTracker(20, status=0.5),
+                ],
+            )
+            assert 2 == table.update(packet)
+            assert 1 == table.overflow_count
+
+            tracker = reader.get(1)
+            assert pypsn.PsnVector3(1.0, 2.0, 3.0) == tracker.pos
+            assert tracker.speed is None
+            snapshot = reader.snapshot()
+            assert (9, 1312) == (snapshot.info.frame_id, snapshot.info.timestamp)
+            assert [1, 3] == [tracker.tracker_id for tracker in snapshot.trackers]
+            assert (0.5, 42) == (
+                snapshot.trackers[1].status,
+                snapshot.trackers[1].timestamp,
+            )
+            assert 2 == table.sequence
+            assert 4 == table.row_count
+
+            # snapshots only scan the rows up to the highest tracker id
+            table.update(pypsn.PsnDataPacket(packet.info, [pypsn.PsnTracker(10)]))
+            assert 11 == pypsn.SHARED_TABLE_HEADER_STRUCT.unpack_from(reader.read())[5]
+            assert [1, 3, 10] == [
+                tracker.tracker_id for tracker in reader.snapshot().trackers
+            ]
+
+
+def test_shared_table_failed_update():
+    """Test readers after a writer failed in the middle of a packet"""
+
+    with pypsn.SharedTrackerTable(max_trackers=16, create=True) as table:
+        with pypsn.SharedTrackerTable(table.name, read_timeout=0.05) as reader:
+            packet = pypsn.PsnDataPacket(
+                pypsn.PsnInfo(1312, 2, 0, 9, 1),
+                [
+                    pypsn.PsnTracker(1, status=0.5, timestamp=1),
+                    pypsn.PsnTracker(2, status=0.5, timestamp=-1),
+                ],
+            )
+            with pytest.raises(struct.error):
+                table.update(packet)
+            assert 2 == table.sequence
+            assert 1 == reader.get(1).timestamp
+            assert reader.get(2) is None
+
+            # a writer process killed in the middle of a packet
+            pypsn.SHARED_TABLE_SEQUENCE_STRUCT.pack_into(
+                table.buffer, pypsn.SHARED_TABLE_SEQUENCE_OFFSET, 3
+            )
+            with pytest.raises(TimeoutError):
+                reader.snapshot()
+
+
+def test_ingest_process():
+    """Test a process receiving into the shared table"""
+
+    with pypsn.SharedTrackerTable(max_trackers=16, create=True) as table:
+        ingest = pypsn.PsnIngestProcess(table.name, "127.0.0.1", 56573, timeout=0.1)
+        ingest.start()
+        try:
+            deadline = time.monotonic() + 5
+            with pypsn.PsnSender("236.10.10.10", "127.0.0.1", 56573) as sender:
+                while not table.snapshot().trackers and time.monotonic() < deadline:
+                    sender.send(get_test_data())
+                    time.sleep(0.05)
+        finally:
+            ingest.stop()
+        assert 7 == len(table.snapshot().trackers)
@@ -0,0 +1,94 @@
+#!/bin/env python3
+"""
+Test keeping the state of each PSN server.
+"""
+
+import pypsn
+from test_own_pack_unpack import get_test_data, get_test_info
+
+SERVER_A = ("192.168.1.2", 56565)
+SERVER_B = ("192.168.1.3", 56565)
+
+
+def make_data(frame_id, source):
+    """
+        Parse a data packet with a frame id.
+
+    Args:
+        frame_id (int): frame id
+        source (tuple): sender address
+
+    Returns:
+        psn data packet
+    """
+    data = bytearray(get_test_data())
+    # frame id of the data packet header chunk
+    data[18] = frame_id
+    return pypsn.parse_psn_packet(data, source=source)
+
+
+def test_source_tagging():
+    """Test packets keeping their sender"""
+
+    assert SERVER_A == pypsn.parse_psn_packet(get_test_data(), source=SERVER_A).source
+    info_cache = pypsn.PsnInfoCache()
+    for source in (SERVER_A, SERVER_B):
+        info = pypsn.parse_psn_packet(
+            get_test_info(), info_cache=info_cache, source=source
+        )
+        assert source == info.source
+    lazy = pypsn.parse_psn_packet(get_test_data(), lazy=True, source=SERVER_B)
+    assert SERVER_B == lazy.source
+    assert pypsn.parse_psn_packet(get_test_data()).source is None
+
+
+def test_source_registry():
+    """Test the state and the subscribers of each source"""
+
+    registry = pypsn.PsnSourceRegistry()
+    received_a = []
+    received_b = []
+    registry.subscribe(received_a.append, address=SERVER_A)
+    info = pypsn.parse_psn_packet(get_test_info(), source=SERVER_B)
+    registry.subscribe(received_b.append, name=info.name.decode())
+
+    for frame_id in (250, 251, 254, 255, 0, 3):
+        registry.update(make_data(frame_id, SERVER_A))
+    registry.update(make_data(7, SERVER_B))
+    registry.update(info)
+    registry.update(make_data(8, SERVER_B))
+
+    source_a = registry.get(SERVER_A)
+    assert 6 == source_a.data_packets
+    assert 3 == source_a.frame_id
+    assert 4 == source_a.lost_frames
+    assert source_a.name is None
+    assert 6 == len(received_a)
+
+    source_b = registry.get(SERVER_B)
+    assert info is source_b.info_packet
+    assert info.get_tracker_names() == source_b.tracker_names
+    assert [source_b] == registry.find(source_b.name)
+    assert [info, 8] == [received_b[0], received_b[1].info.frame_id]
+
+    registry.unsubscribe(received_a.append)
+    registry.update(make_data(4, SERVER_A))
+    assert 6 == len(received_a)
+
+
+def test_reordered_frames():
+    """Test late packets are not counted as lost frames"""
+
+    registry = pypsn.PsnSourceRegistry()
+    for frame_id in (10, 12, 11, 13):
+        registry.update(make_data(frame_id, SERVER_A))
+    source = registry.get(SERVER_A)
+    assert 13 == source.frame_id
+    assert 0 == source.lost_frames
+
+    # a repeated late packet is not subtracted twice
+    for frame_id in (16, 14, 14, 17):
+        registry.update(make_data(frame_id, SERVER_A))
+    assert 17 == source.frame_id
+    assert 1 == source.lost_frames
+    assert {15} == source.missing_frames
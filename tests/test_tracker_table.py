@@ -0,0 +1,106 @@
+#!/bin/env python3
+"""
+Test writing trackers into the array backed table.
+"""
+
+import binascii
+from pathlib import Path
+
+import pytest
+
+from test_own_pack_unpack import get_test_data
+
+
+def test_table_from_buffer(pypsn_module):
+    """Test writing our own data"""
+
+    table = pypsn_module.TrackerTable(max_trackers=5)
+    assert [] == table.tracker_ids()
+    assert 5 == table.update_from_buffer(get_test_data(), now=1.0)
+    assert 2 == table.overflow_count
+    assert [0, 1, 2, 3, 4] == table.tracker_ids()
+    assert 56 == table.frame_id
+    assert 1312 == table.packet_timestamp
+
+    tracker = table.get(4)
+    assert pypsn_module.PsnVector3(1.0, 1.0, 1.0) == tracker.trgtpos
+    assert 0.5 == tracker.status
+    assert 1312 == tracker.timestamp
+    assert table.get(5) is None
+    assert 1.0 == table.view("updated")[4]
+    assert 0 == table.update_from_buffer(
+        pypsn_module.prepare_psn_info_packet_bytes(
+            pypsn_module.PsnInfoPacket(
+                pypsn_module.PsnInfo(1, 2, 0, 1, 1),
+                "server",
+                [pypsn_module.PsnTrackerInfo(0, "zero")],
+            )
+        )
+    )
+
+
+def test_table_filter(pypsn_module):
+    """Test writing only some trackers and fields"""
+
+    table = pypsn_module.TrackerTable(max_trackers=5)
+    assert 2 == table.update_from_buffer(
+        get_test_data(), tracker_ids={1, 3, 6}, fields={"pos", "timestamp"}
+    )
+    # tracker 5 is filtered out before it overflows, tracker 6 is not
+    assert 1 == table.overflow_count
+    assert [1, 3] == table.tracker_ids()
+    tracker = table.get(3)
+    assert pypsn_module.PsnVector3(1.0, 1.0, 1.0) == tracker.pos
+    assert 1312 == tracker.timestamp
+    assert tracker.speed is None
+    assert 0 == table.update_from_buffer(get_test_data(), tracker_ids={42})
+    assert [1, 3] == table.tracker_ids()
+
+
+def test_table_sparse_data(pypsn_module):
+    """Test writing real world data with some chunks missing"""
+
+    test_data_file_path = Path(Path(__file__).parents[0], "data.log")
+    table = pypsn_module.TrackerTable()
+    with open(test_data_file_path, encoding="UTF-8") as psn_data:
+        for psn_line in psn_data:
+            table.update_from_buffer(binascii.unhexlify(psn_line.strip()))
+
+    tracker = table.get(0)
+    assert (
+        pypsn_module.PsnVector3(0.20273426175117493, 6.0, -9.693662643432617)
+        == tracker.pos
+    )
+    assert tracker.accel is None
+    assert 0 == tracker.timestamp
+    assert not table.view("present")[0] & pypsn_module.TRACKER_TABLE_BITS["timestamp"]
+
+
+def test_table_from_packet(pypsn_module):
+    """Test writing a parsed packet, snapshots and views"""
+
+    table = pypsn_module.TrackerTable(max_trackers=8)
+    packet = pypsn_module.PsnDataPacket(
+        pypsn_module.PsnInfo(1312, 2, 0, 3, 1),
+        [
+            pypsn_module.PsnTracker(
+                tracker_id=2, pos=pypsn_module.PsnVector3(1.0, 2.0, 3.0), status=None
+            )
+        ],
+    )
+    assert 1 == table.update(packet)
+    snapshot = table.snapshot()
+    assert [1.0, 2.0, 3.0] == list(table.view("pos")[6:9])
+    assert [1.0, 2.0, 3.0] == list(snapshot["pos"][6:9])
+    tracker = table.get(2)
+    assert tracker.speed is None
+    assert 0 == tracker.timestamp
+
+    packet.trackers[0].pos.x = 4.0
+    table.update(packet)
+    assert 1.0 == snapshot["pos"][6]
+
+    np = pytest.importorskip("numpy")
+    pos = table.as_numpy("pos")
+    assert (8, 3) == pos.shape
+    assert np.array_equal([4.0, 2.0, 3.0], pos[2])